@@ -7,6 +7,27 @@ from typing import Optional, List
 router = APIRouter()
 file_service = FileService()
 
+# 遅延描画モード（ANNOTATION_MODE=lazy）のAI検知結果画像
+LAZY_ANNOTATION_SUFFIX = "_detected.jpg"
+
+
+async def _download(file_id: str):
+    """ファイルを取得（未描画のAI検知結果画像は初回取得時に描画する）"""
+    try:
+        return await file_service.download_file(file_id)
+    except FileNotFoundError:
+        if not file_id.endswith(LAZY_ANNOTATION_SUFFIX):
+            raise
+        from app.services.grpc_pipeline_executor import get_grpc_pipeline_executor
+
+        execution_id = file_id[: -len(LAZY_ANNOTATION_SUFFIX)]
+        rendered = await get_grpc_pipeline_executor().render_annotations(
+            execution_id, file_service.bucket_name
+        )
+        if not rendered:
+            raise
+        return await file_service.download_file(file_id)
+
 
 @router.post("/")
 async def upload_file(file: UploadFile = File(...), user=Depends(get_current_user)):
@@ -26,7 +47,7 @@ async def upload_file(file: UploadFile = File(...), user=Depends(get_current_use
 async def download_file_direct(file_id: str, user=Depends(get_current_user)):
     """ファイルを直接ダウンロード（ブラウザ表示用）"""
     try:
-        file_stream, filename, content_type = await file_service.download_file(file_id)
+        file_stream, filename, content_type = await _download(file_id)
         return StreamingResponse(
             file_stream,
             media_type=content_type,
@@ -42,7 +63,7 @@ async def download_file_direct(file_id: str, user=Depends(get_current_user)):
 async def download_file(file_id: str, user=Depends(get_current_user)):
     """ファイルをダウンロード"""
     try:
-        file_stream, filename, content_type = await file_service.download_file(file_id)
+        file_stream, filename, content_type = await _download(file_id)
         return StreamingResponse(
             file_stream,
             media_type=content_type,
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    HTTPException,
+    Depends,
+    Request,
+    Response,
+)
 from typing import List
+import hashlib
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.pipeline import Pipeline, PipelineCreateRequest, PipelineUpdateRequest
 from app.services.pipeline_service import PipelineService
 from app.services.auth_service import get_current_user
+from app.services.camera_stream_notifier import camera_stream_notifier
 from app.database import get_db
 import logging
 
@@ -14,6 +23,12 @@ router = APIRouter()
 pipeline_service = PipelineService()
 
 
+def _pipeline_etag(pipeline: Pipeline) -> str:
+    """更新日時から作るETag（カメラストリームの条件付きGET用）"""
+    version = f"{pipeline.id}:{pipeline.updated_at.isoformat()}"
+    return '"' + hashlib.sha1(version.encode()).hexdigest()[:16] + '"'
+
+
 @router.get("/", response_model=List[Pipeline])
 async def get_pipelines(
     user=Depends(get_current_user), db: AsyncSession = Depends(get_db)
@@ -34,9 +49,16 @@ async def create_pipeline(
 
 @router.get("/{pipeline_id}", response_model=Pipeline)
 async def get_pipeline(
-    pipeline_id: str, user=Depends(get_current_user), db: AsyncSession = Depends(get_db)
+    pipeline_id: str,
+    request: Request,
+    response: Response,
+    user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    """特定のパイプラインを取得"""
+    """特定のパイプラインを取得
+
+    If-None-Match が現在のETagと一致する場合は本文なしの304を返す。
+    """
     logger.debug(f"=== Pipeline API Request ===")
     logger.debug(f"Pipeline ID: {pipeline_id}")
     logger.debug(f"User: {user}")
@@ -48,6 +70,12 @@ async def get_pipeline(
         logger.warning(f"Pipeline not found: {pipeline_id}")
         raise HTTPException(status_code=404, detail="Pipeline not found")
 
+    etag = _pipeline_etag(pipeline)
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
     logger.info(f"Pipeline retrieved successfully: {pipeline_id}")
     return pipeline
 
@@ -56,22 +84,37 @@ async def get_pipeline(
 async def update_pipeline(
     pipeline_id: str,
     pipeline_request: PipelineUpdateRequest,
+    background_tasks: BackgroundTasks,
     user=Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """パイプラインを更新"""
+    previous = await pipeline_service.get_pipeline(pipeline_id, db)
     pipeline = await pipeline_service.update_pipeline(pipeline_id, pipeline_request, db)
     if not pipeline:
         raise HTTPException(status_code=404, detail="Pipeline not found")
+    # カメラストリームはIDまたは名前でキャッシュしているため両方を無効化
+    background_tasks.add_task(
+        camera_stream_notifier.pipeline_saved,
+        [pipeline.id, pipeline.name, previous.name if previous else None],
+    )
     return pipeline
 
 
 @router.delete("/{pipeline_id}")
 async def delete_pipeline(
-    pipeline_id: str, user=Depends(get_current_user), db: AsyncSession = Depends(get_db)
+    pipeline_id: str,
+    background_tasks: BackgroundTasks,
+    user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """パイプラインを削除"""
+    previous = await pipeline_service.get_pipeline(pipeline_id, db)
     success = await pipeline_service.delete_pipeline(pipeline_id, db)
     if not success:
         raise HTTPException(status_code=404, detail="Pipeline not found")
+    background_tasks.add_task(
+        camera_stream_notifier.pipeline_saved,
+        [pipeline_id, previous.name if previous else None],
+    )
     return {"message": "Pipeline deleted successfully"}
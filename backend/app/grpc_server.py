@@ -1,6 +1,8 @@
 import asyncio
 import logging
 import os
+import time
+from collections import OrderedDict
 from typing import AsyncIterator, Optional
 
 import grpc
@@ -32,6 +34,41 @@ from app.models.inspection import (
 logger = logging.getLogger(__name__)
 
 
+class _PendingFrames:
+    """Metadata of frames sent upstream, keyed by bridge sequence number.
+
+    Upstream echoes VideoFrame.sequence_number in its responses, so a
+    response finds its metadata directly even when upstream skipped or
+    reordered frames. Entries never answered are evicted once there are
+    more than capacity of them or they are older than max_age seconds.
+    """
+
+    def __init__(self, capacity: int, max_age: float):
+        self.capacity = max(1, capacity)
+        self.max_age = max_age
+        self._entries: "OrderedDict[int, tuple[float, dict]]" = OrderedDict()
+        self.orphaned = 0
+
+    def add(self, sequence: int, meta: dict) -> None:
+        now = time.monotonic()
+        self._entries[sequence] = (now, meta)
+        # Oldest entries first: evict while over capacity or expired
+        while self._entries:
+            oldest, (sent_at, _) = next(iter(self._entries.items()))
+            if len(self._entries) <= self.capacity and now - sent_at <= self.max_age:
+                break
+            del self._entries[oldest]
+            self.orphaned += 1
+            logger.debug(f"[gRPC] Evicted metadata of unanswered frame #{oldest}")
+
+    def pop(self, sequence: int) -> Optional[dict]:
+        entry = self._entries.pop(sequence, None)
+        return entry[1] if entry else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class BackendCameraStreamProcessor(
     camera_stream_pb2_grpc.CameraStreamProcessorServicer
 ):
@@ -70,6 +107,25 @@ class BackendCameraStreamProcessor(
         self._jwt_algo = os.getenv("JWT_ALGORITHM", "HS256")
         # Use in-process judgment queue for offloading aggregation
 
+        # Inspection evaluator: one shared keep-alive channel for all streams.
+        # Up to BRIDGE_EVALUATION_WINDOW frames per stream are evaluated
+        # concurrently; a frame whose evaluation exceeds EVALUATOR_TIMEOUT_MS
+        # is relayed without judgment so the evaluator cannot stall the video.
+        self._evaluator_endpoint = os.getenv(
+            "EVALUATOR_GRPC_ENDPOINT", "127.0.0.1:50052"
+        )
+        self._evaluator_channel: Optional[grpc_aio.Channel] = None
+        self._evaluator_stub = None
+        self._evaluator_timeout = (
+            float(os.getenv("EVALUATOR_TIMEOUT_MS", "500")) / 1000.0
+        )
+        self._evaluation_window = max(
+            1, int(os.getenv("BRIDGE_EVALUATION_WINDOW", "8"))
+        )
+        # Frames sent upstream whose response is still outstanding
+        self._max_pending_frames = int(os.getenv("BRIDGE_MAX_PENDING_FRAMES", "64"))
+        self._pending_frame_ttl = float(os.getenv("BRIDGE_PENDING_FRAME_TTL", "30"))
+
     def _verify_auth(self, context: grpc.ServicerContext) -> str:
         """Verify Authorization: Bearer <token> from gRPC metadata. Returns username (sub)."""
         try:
@@ -111,6 +167,39 @@ class BackendCameraStreamProcessor(
             self._upstream_channel = None
             self._upstream_stub = None
 
+    def _ensure_evaluator(self):
+        """Return the evaluator stub, creating the shared channel on first use."""
+        if self._evaluator_stub is None:
+            from imageflow.v1 import evaluator_pb2_grpc
+
+            self._evaluator_channel = grpc_aio.insecure_channel(
+                self._evaluator_endpoint,
+                options=[
+                    ("grpc.keepalive_time_ms", 30000),
+                    ("grpc.keepalive_timeout_ms", 5000),
+                    ("grpc.keepalive_permit_without_calls", True),
+                    ("grpc.http2.min_time_between_pings_ms", 10000),
+                ],
+            )
+            self._evaluator_stub = evaluator_pb2_grpc.InspectionEvaluatorStub(
+                self._evaluator_channel
+            )
+            logger.info(
+                f"Inspection evaluator gRPC (aio) initialized: {self._evaluator_endpoint}"
+            )
+        return self._evaluator_stub
+
+    async def close(self):
+        """Close the upstream and evaluator channels."""
+        if self._evaluator_channel is not None:
+            await self._evaluator_channel.close()
+            self._evaluator_channel = None
+            self._evaluator_stub = None
+        if self._upstream_channel is not None:
+            await self._upstream_channel.close()
+            self._upstream_channel = None
+            self._upstream_stub = None
+
     async def ProcessVideoStream(
         self,
         request_iterator: AsyncIterator[camera_stream_pb2.VideoFrame],
@@ -128,40 +217,94 @@ class BackendCameraStreamProcessor(
             logger.error("[gRPC] Upstream service unavailable after init attempt")
             context.abort(grpc.StatusCode.UNAVAILABLE, "Upstream service unavailable")
 
-        # Wrap request iterator to pair each outgoing frame with its metadata
-        meta_queue: asyncio.Queue = asyncio.Queue()
+        # Number each outgoing frame and keep its metadata until upstream
+        # answers; the response carries the number back
+        pending = _PendingFrames(self._max_pending_frames, self._pending_frame_ttl)
 
         async def wrapped_iterator():
+            sequence = 0
             async for frame in request_iterator:
+                sequence += 1
                 meta = {
                     "source_id": frame.metadata.source_id,
                     "pipeline_id": frame.metadata.pipeline_id,
                     "width": frame.metadata.width,
                     "height": frame.metadata.height,
                     "processing_params": dict(frame.metadata.processing_params),
+                    # Restored in the response; unnumbered frames get their
+                    # 0-based stream position like upstream would give them
+                    "sequence_number": frame.sequence_number or sequence - 1,
                 }
-                await meta_queue.put(meta)
+                pending.add(sequence, meta)
+                frame.sequence_number = sequence
                 yield frame
 
-        # Pass-through streaming with enrichment via evaluator service
+        # Pass-through streaming with enrichment via evaluator service.
+        # The relay task keeps reading upstream while earlier frames are still
+        # being evaluated; evaluations are queued in arrival order, so frames
+        # (and their judgments) are yielded in order. The semaphore caps the
+        # evaluations in flight, counting from task creation until the loop
+        # below has taken the result.
+        evaluations: asyncio.Queue = asyncio.Queue()
+        window = asyncio.Semaphore(self._evaluation_window)
+        upstream_call = self._upstream_stub.ProcessVideoStream(wrapped_iterator())
+
+        async def relay_upstream():
+            try:
+                frame_count = 0
+                async for processed in upstream_call:
+                    received_at = time.perf_counter()
+                    frame_count += 1
+                    if frame_count % 30 == 1:
+                        logger.debug(
+                            f"[gRPC] Relaying processed frame #{frame_count} from upstream"
+                        )
+                    # Pair with original metadata
+                    meta = pending.pop(processed.sequence_number)
+                    if meta is None:
+                        logger.debug(
+                            f"[gRPC] No metadata for upstream frame #{processed.sequence_number}"
+                        )
+                        meta = {"processing_params": {}}
+                    else:
+                        processed.sequence_number = meta["sequence_number"]
+
+                    # Compute judgment based on inspection criteria via evaluator
+                    await window.acquire()
+                    evaluation = asyncio.create_task(
+                        self._evaluate_via_service(processed, meta)
+                    )
+                    evaluations.put_nowait((received_at, evaluation))
+            finally:
+                evaluations.put_nowait(None)
+
+        relay = asyncio.create_task(relay_upstream())
+        frame_count = 0
+        overhead_ms_total = 0.0
         try:
-            upstream_call = self._upstream_stub.ProcessVideoStream(wrapped_iterator())
-            frame_count = 0
-            async for processed in upstream_call:
+            while True:
+                item = await evaluations.get()
+                if item is None:
+                    break
+                received_at, evaluation = item
+                try:
+                    enriched, judgment_event = await evaluation
+                finally:
+                    window.release()
+                if judgment_event:
+                    await self._publish_judgment(judgment_event)
+                overhead_ms = (time.perf_counter() - received_at) * 1000
+                enriched.bridge_overhead_ms = overhead_ms
                 frame_count += 1
-                if frame_count % 30 == 1:
-                    logger.debug(
-                        f"[gRPC] Relaying processed frame #{frame_count} from upstream"
+                overhead_ms_total += overhead_ms
+                if frame_count % 300 == 0:
+                    logger.info(
+                        f"[gRPC] Bridge overhead: {overhead_ms_total / frame_count:.1f} ms "
+                        f"average over {frame_count} frames"
                     )
-                # Pair with original metadata
-                try:
-                    meta = await asyncio.wait_for(meta_queue.get(), timeout=1.0)
-                except asyncio.TimeoutError:
-                    meta = {"processing_params": {}}
-
-                # Compute judgment based on inspection criteria via evaluator
-                enriched = await self._evaluate_via_service(processed, meta)
                 yield enriched
+            # Surface upstream errors raised in the relay task
+            await relay
         except grpc.RpcError as e:
             # Attempt one reconnection for transient errors
             logger.warning(
@@ -174,6 +317,18 @@ class BackendCameraStreamProcessor(
         except Exception as e:
             logger.exception(f"[gRPC] Bridge processing error: {e}")
             context.abort(grpc.StatusCode.INTERNAL, f"Bridge processing error: {e}")
+        finally:
+            relay.cancel()
+            while not evaluations.empty():
+                item = evaluations.get_nowait()
+                if item is not None:
+                    item[1].cancel()
+            if frame_count:
+                logger.info(
+                    f"[gRPC] ProcessVideoStream end: {frame_count} frames, "
+                    f"bridge overhead {overhead_ms_total / frame_count:.1f} ms average, "
+                    f"{pending.orphaned} unanswered"
+                )
 
     async def _evaluate_and_enrich(
         self, processed: camera_stream_pb2.ProcessedFrame, meta: dict
@@ -376,10 +531,13 @@ class BackendCameraStreamProcessor(
 
     async def _evaluate_via_service(
         self, processed: camera_stream_pb2.ProcessedFrame, meta: dict
-    ) -> camera_stream_pb2.ProcessedFrame:
-        """Call inspection-evaluator-grpc; fallback to local if stubs/endpoint unavailable."""
+    ) -> tuple[camera_stream_pb2.ProcessedFrame, Optional[dict]]:
+        """Call inspection-evaluator-grpc; returns the enriched frame and its judgment event.
+
+        On failure the original frame is returned without judgment (and no event).
+        """
         try:
-            from imageflow.v1 import evaluator_pb2, evaluator_pb2_grpc
+            from imageflow.v1 import evaluator_pb2
 
             # Prepare request
             pp = meta.get("processing_params", {}) or {}
@@ -402,29 +560,13 @@ class BackendCameraStreamProcessor(
                 ],
             )
 
-            endpoint = os.getenv("EVALUATOR_GRPC_ENDPOINT", "127.0.0.1:50052")
-            async with grpc_aio.insecure_channel(endpoint) as ch:
-                stub = evaluator_pb2_grpc.InspectionEvaluatorStub(ch)
-                resp = await stub.EvaluateDetections(req)
+            resp = await self._ensure_evaluator().EvaluateDetections(
+                req, timeout=self._evaluator_timeout
+            )
 
             # Build enriched ProcessedFrame with evaluator response
             enriched = camera_stream_pb2.ProcessedFrame()
-            enriched.processed_data = processed.processed_data
-            enriched.source_id = processed.source_id
-            enriched.processing_time_ms = processed.processing_time_ms
-            enriched.status = processed.status
-            if processed.error_message:
-                enriched.error_message = processed.error_message
-            if processed.HasField("processed_at"):
-                enriched.processed_at.CopyFrom(processed.processed_at)
-            for d in processed.detections:
-                nd = enriched.detections.add()
-                nd.class_name = d.class_name
-                nd.confidence = d.confidence
-                nd.bbox.x1 = d.bbox.x1
-                nd.bbox.y1 = d.bbox.y1
-                nd.bbox.x2 = d.bbox.x2
-                nd.bbox.y2 = d.bbox.y2
+            enriched.CopyFrom(processed)
             # Set new fields
             if resp.judgment:
                 try:
@@ -446,30 +588,46 @@ class BackendCameraStreamProcessor(
                     enriched.pipeline_id = resp.pipeline_id
                 except Exception:
                     pass
-            # Offload aggregation & DB reflection to Backend Worker via in-process queue
-            try:
-                pp = meta.get("processing_params", {}) or {}
-                exec_id = pp.get("execution_id")
-                item_exec_id = pp.get("item_execution_id")
-                if resp.judgment and exec_id and item_exec_id:
-                    await judgment_queue.publish(
-                        {
-                            "execution_id": exec_id,
-                            "item_execution_id": item_exec_id,
-                            "judgment": resp.judgment,
-                            "criteria_id": resp.criteria_id,
-                            "item_id": resp.item_id,
-                            "pipeline_id": resp.pipeline_id,
-                            "metrics": dict(resp.metrics),
-                        }
-                    )
-            except Exception as pe:
-                logger.warning(f"[gRPC] Emit judgment event failed: {pe}")
-            return enriched
+            # Aggregation & DB reflection is offloaded to Backend Worker via the
+            # in-process queue; the caller publishes the event in frame order
+            event = None
+            pp = meta.get("processing_params", {}) or {}
+            exec_id = pp.get("execution_id")
+            item_exec_id = pp.get("item_execution_id")
+            if resp.judgment and exec_id and item_exec_id:
+                event = {
+                    "execution_id": exec_id,
+                    "item_execution_id": item_exec_id,
+                    "judgment": resp.judgment,
+                    "criteria_id": resp.criteria_id,
+                    "item_id": resp.item_id,
+                    "pipeline_id": resp.pipeline_id,
+                    "metrics": dict(resp.metrics),
+                }
+            return enriched, event
+        except grpc_aio.AioRpcError as e:
+            if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                # Over the evaluation budget: relay the frame without judgment
+                logger.debug("[gRPC] Evaluator timed out; frame relayed unjudged")
+            else:
+                logger.error(
+                    f"[gRPC] Evaluator call failed: code={e.code()} details={e.details()}"
+                )
+            return processed, None
         except Exception as e:
             logger.error(f"[gRPC] Evaluator call failed: {e}")
             # No fallback; return original processed frame without judgment
-            return processed
+            return processed, None
+
+    async def _publish_judgment(self, event: dict) -> None:
+        """Hand a judgment to the Backend Worker, waiting at most the evaluation budget"""
+        try:
+            if not await judgment_queue.publish(event, timeout=self._evaluator_timeout):
+                logger.warning(
+                    f"[gRPC] Judgment queue full; dropped judgment for {event['item_execution_id']}"
+                )
+        except Exception as pe:
+            logger.warning(f"[gRPC] Emit judgment event failed: {pe}")
 
 
 class DesktopGrpcServer:
@@ -478,6 +636,7 @@ class DesktopGrpcServer:
             "DESKTOP_GRPC_BIND_ADDR", "0.0.0.0:50051"
         )
         self._server: grpc.aio.Server | None = None
+        self._processor: BackendCameraStreamProcessor | None = None
 
     async def start(self):
         self._server = grpc_aio.server(
@@ -487,8 +646,9 @@ class DesktopGrpcServer:
                 ("grpc.keepalive_permit_without_calls", True),
             ]
         )
+        self._processor = BackendCameraStreamProcessor()
         camera_stream_pb2_grpc.add_CameraStreamProcessorServicer_to_server(
-            BackendCameraStreamProcessor(), self._server
+            self._processor, self._server
         )
         # Optional TLS: provide cert/key via env to enable secure port
         cert_path = os.getenv("DESKTOP_GRPC_TLS_CERT")
@@ -517,6 +677,9 @@ class DesktopGrpcServer:
         if self._server:
             await self._server.stop(grace)
             logger.info("Desktop gRPC server stopped")
+        if self._processor:
+            await self._processor.close()
+            self._processor = None
 
 
 # Singleton helpers
@@ -158,6 +158,13 @@ async def shutdown_event():
         await get_evaluator_server().stop()
     except Exception as e:
         logger.warning(f"Error stopping evaluator gRPC server: {e}")
+    # Release Triton shared memory regions (otherwise left in /dev/shm and on the server)
+    try:
+        from app.services.triton_client import close_all_clients
+
+        await close_all_clients()
+    except Exception as e:
+        logger.warning(f"Error closing Triton clients: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+import grpc.aio as grpc_aio
+
+# Ensure generated protobufs are importable
+generated_path = Path(__file__).resolve().parents[2] / "generated" / "python"
+if str(generated_path) not in sys.path:
+    sys.path.insert(0, str(generated_path))
+
+from imageflow.v1 import camera_stream_pb2, camera_stream_pb2_grpc  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+def _camera_stream_endpoint() -> str:
+    # Same resolution as CameraStreamManager in app/api/camera_stream.py
+    if os.getenv("NOMAD_ALLOC_ID"):
+        return os.getenv("CAMERA_STREAM_GRPC_ENDPOINT", "192.168.5.15:9094")
+    if os.getenv("COMPOSE_PROJECT_NAME") or os.getenv("DOCKER_BUILDKIT"):
+        return os.getenv("CAMERA_STREAM_GRPC_ENDPOINT", "camera-stream-grpc:9090")
+    return os.getenv(
+        "CAMERA_STREAM_GRPC_ENDPOINT",
+        "camera-stream-grpc-service.image-processing.svc.cluster.local:9090",
+    )
+
+
+class CameraStreamNotifier:
+    """Tells the camera stream service to refetch saved pipelines.
+
+    The camera stream service revalidates its pipeline definitions on a TTL
+    anyway; this push only makes saved changes apply to running streams
+    right away, so failures are logged and otherwise ignored.
+    """
+
+    def __init__(self, timeout: float = 2.0):
+        self.timeout = float(os.getenv("PIPELINE_INVALIDATION_TIMEOUT", timeout))
+        self._channel: Optional[grpc_aio.Channel] = None
+        self._stub: Optional[camera_stream_pb2_grpc.CameraStreamProcessorStub] = None
+
+    def _ensure_stub(self) -> camera_stream_pb2_grpc.CameraStreamProcessorStub:
+        if self._stub is None:
+            self._channel = grpc_aio.insecure_channel(_camera_stream_endpoint())
+            self._stub = camera_stream_pb2_grpc.CameraStreamProcessorStub(self._channel)
+        return self._stub
+
+    async def pipeline_saved(self, pipeline_ids: Iterable[str]) -> None:
+        """Invalidate the cached definitions of a pipeline by id and name"""
+        ids = sorted({pipeline_id for pipeline_id in pipeline_ids if pipeline_id})
+        if not ids:
+            return
+        try:
+            response = await self._ensure_stub().InvalidatePipelineCache(
+                camera_stream_pb2.PipelineCacheInvalidationRequest(pipeline_ids=ids),
+                timeout=self.timeout,
+            )
+            logger.info(
+                f"Camera stream pipeline cache invalidated for {ids} "
+                f"({response.invalidated_entries} cached)"
+            )
+        except (grpc_aio.AioRpcError, asyncio.TimeoutError) as e:
+            logger.warning(f"Camera stream pipeline cache invalidation failed: {e}")
+
+
+camera_stream_notifier = CameraStreamNotifier()
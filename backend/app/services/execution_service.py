@@ -7,6 +7,8 @@ from app.models.execution import (
     ExecutionRequest,
     ExecutionStatus,
     ExecutionProgress,
+    ExecutionStep,
+    StepStatus,
 )
 from app.services.file_service import FileService
 from app.services.kafka_service import KafkaService
@@ -159,26 +161,12 @@ class ExecutionService:
                 execution.completed_at = datetime.now(timezone.utc)
 
                 # Add execution steps based on pipeline config
-                from app.models.execution import ExecutionStep, OutputFile, StepStatus
+                from app.models.execution import OutputFile
                 import os
 
-                pipeline_config = await self._build_pipeline_config(
-                    execution_request, input_files
+                execution.steps = self._build_direct_steps(
+                    execution, pipeline_config, result.get("results", {})
                 )
-                execution.steps = []
-
-                for step_config in pipeline_config.get("steps", []):
-                    step = ExecutionStep(
-                        step_id=step_config["stepId"],
-                        name=step_config.get("componentName", step_config["stepId"]),
-                        component_name=step_config.get(
-                            "componentName", step_config["stepId"]
-                        ),
-                        status=StepStatus.COMPLETED,
-                        started_at=execution.started_at,
-                        completed_at=execution.completed_at,
-                    )
-                    execution.steps.append(step)
 
                 # Add output files from all processing steps
                 output_files = []
@@ -274,6 +262,11 @@ class ExecutionService:
             else:
                 execution.status = ExecutionStatus.FAILED
                 execution.error_message = result.get("error", "Unknown error")
+                execution.completed_at = datetime.now(timezone.utc)
+                if "results" in result:
+                    execution.steps = self._build_direct_steps(
+                        execution, pipeline_config, result["results"]
+                    )
                 logger.error(
                     f"Direct gRPC pipeline execution failed for {execution_id}: {execution.error_message}"
                 )
@@ -288,6 +281,40 @@ class ExecutionService:
                 execution.error_message = str(e)
                 await self._notify_execution_update(execution)
 
+    # Step result status reported by the gRPC executor -> execution step status
+    _DIRECT_STEP_STATUS = {
+        "success": StepStatus.COMPLETED,
+        "failed": StepStatus.FAILED,
+        "skipped": StepStatus.SKIPPED,
+    }
+
+    def _build_direct_steps(
+        self,
+        execution: Execution,
+        pipeline_config: Dict[str, Any],
+        results: Dict[str, Any],
+    ) -> List[ExecutionStep]:
+        """Execution steps of a direct gRPC run, with each step's own outcome"""
+        steps = []
+        for step_config in pipeline_config.get("steps", []):
+            step_result = results.get(step_config["stepId"], {})
+            steps.append(
+                ExecutionStep(
+                    step_id=step_config["stepId"],
+                    name=step_config.get("componentName", step_config["stepId"]),
+                    component_name=step_config.get(
+                        "componentName", step_config["stepId"]
+                    ),
+                    status=self._DIRECT_STEP_STATUS.get(
+                        step_result.get("status"), StepStatus.PENDING
+                    ),
+                    started_at=execution.started_at,
+                    completed_at=execution.completed_at,
+                    error_message=step_result.get("error"),
+                )
+            )
+        return steps
+
     async def _build_pipeline_config(
         self, execution_request: ExecutionRequest, input_files: List[str]
     ) -> Dict[str, Any]:
@@ -315,6 +342,20 @@ class ExecutionService:
                 )
 
             # Build steps from pipeline components in the defined order
+            step_ids = {}
+            for i, component in enumerate(pipeline.components):
+                step_id = f"{component.component_type}-step-{i}"
+                step_ids[component.id] = step_id
+                step_ids.setdefault(component.name, step_id)
+
+            # Components declare the components they wait for (by id or name)
+            # and may name the one whose output they consume in an "input"
+            # parameter. Pipelines that declare no dependencies at all run as
+            # a chain in component order, as before.
+            declares_graph = any(
+                component.dependencies for component in pipeline.components
+            )
+
             steps = []
             for i, component in enumerate(pipeline.components):
                 step_id = f"{component.component_type}-step-{i}"
@@ -323,18 +364,34 @@ class ExecutionService:
                 merged_parameters = component.parameters.copy()
                 merged_parameters.update(execution_request.parameters)
 
-                # Set up dependencies based on component order
-                dependencies = []
-                if i > 0:
+                input_step = None
+                if declares_graph:
+                    dependencies = []
+                    for dep in component.dependencies:
+                        if dep in step_ids:
+                            dependencies.append(step_ids[dep])
+                        else:
+                            logger.warning(
+                                f"Component {component.name} depends on unknown component {dep}, ignoring"
+                            )
+                    input_name = component.parameters.get("input")
+                    if input_name in step_ids:
+                        input_step = step_ids[input_name]
+                        if input_step not in dependencies:
+                            dependencies.append(input_step)
+                elif i > 0:
                     # Each component depends on the previous one (simple sequential execution)
                     previous_component = pipeline.components[i - 1]
                     dependencies = [f"{previous_component.component_type}-step-{i-1}"]
+                else:
+                    dependencies = []
 
                 step = {
                     "stepId": step_id,
                     "componentName": component.component_type,
                     "parameters": merged_parameters,
                     "dependencies": dependencies,
+                    "input": input_step,
                 }
                 steps.append(step)
 
@@ -1,5 +1,6 @@
 import asyncio
 import json
+import os
 import time
 from datetime import datetime, timezone
 from typing import Dict, Any, List
@@ -116,56 +117,120 @@ class ExecutionWorker:
             logger.error(f"Error processing Kafka pipeline requests: {e}")
 
     async def start_judgment_queue_consumer(self):
-        """Consume judgments from in-process queue and apply aggregation/DB reflection"""
+        """Consume judgments from in-process queue and apply aggregation/DB reflection
+
+        Events are taken in batches (JUDGMENT_BATCH_SIZE, waiting up to
+        JUDGMENT_BATCH_LINGER_MS for more) and applied in one transaction;
+        several judgments for the same item execution collapse into the last.
+        """
         from app.services import judgment_queue
+
+        batch_size = int(os.getenv("JUDGMENT_BATCH_SIZE", "200"))
+        linger = float(os.getenv("JUDGMENT_BATCH_LINGER_MS", "50")) / 1000.0
         logger.info("Starting judgment queue consumer")
-        async for payload in judgment_queue.subscribe():
-            try:
-                execution_id = payload.get("execution_id")
+        last_report = time.monotonic()
+        while True:
+            batch = await judgment_queue.next_batch(batch_size, linger)
+            judgments: Dict[str, str] = {}
+            for payload in batch:
                 item_execution_id = payload.get("item_execution_id")
                 judgment = payload.get("judgment")
-                await self._apply_judgment_and_aggregate(execution_id, item_execution_id, judgment)
+                if item_execution_id and judgment:
+                    # Later events win; re-insert to keep arrival order
+                    judgments.pop(item_execution_id, None)
+                    judgments[item_execution_id] = judgment
+            try:
+                if judgments:
+                    await self._apply_judgments_and_aggregate(judgments)
             except Exception as e:
-                logger.error(f"Judgment queue handler error: {e}")
-
-    async def _apply_judgment_and_aggregate(self, execution_id: str, item_execution_id: str, judgment: str):
-        from sqlalchemy import select
+                logger.error(
+                    f"Judgment queue handler error ({len(judgments)} judgments): {e}"
+                )
+            if time.monotonic() - last_report >= 60:
+                last_report = time.monotonic()
+                logger.info(f"Judgment queue: {judgment_queue.stats()}")
+
+    async def _apply_judgments_and_aggregate(self, judgments: Dict[str, str]):
+        """Store final results {item_execution_id: judgment} and complete executions
+
+        One UPDATE writes all judgments; one aggregate query then counts the
+        items of every touched execution, and executions whose items all have
+        a result become COMPLETED, or FAILED if any item is NG.
+        """
+        import uuid
+        from sqlalchemy import case, func, select, update
         from app.database import AsyncSessionLocal
         from app.models.inspection import InspectionItemExecution, InspectionExecution
         from datetime import datetime
 
+        results = {}
+        for item_execution_id, judgment in judgments.items():
+            try:
+                results[uuid.UUID(str(item_execution_id))] = judgment
+            except ValueError:
+                logger.warning(f"Invalid item execution id: {item_execution_id}")
+        if not results:
+            return
+
+        now = datetime.utcnow()
         async with AsyncSessionLocal() as session:
-            # Update item execution
-            item_exec = (
+            # Update item executions
+            updated = (
                 await session.execute(
-                    select(InspectionItemExecution).where(InspectionItemExecution.id == item_execution_id)
+                    update(InspectionItemExecution)
+                    .where(InspectionItemExecution.id.in_(results))
+                    .values(
+                        final_result=case(results, value=InspectionItemExecution.id),
+                        completed_at=now,
+                    )
+                    .returning(
+                        InspectionItemExecution.id,
+                        InspectionItemExecution.execution_id,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            ).all()
+            if len(updated) < len(results):
+                missing = set(results) - {row.id for row in updated}
+                logger.warning(
+                    f"Item executions not found: {sorted(map(str, missing))}"
                 )
-            ).scalars().first()
-            if not item_exec:
-                logger.warning(f"Item execution not found: {item_execution_id}")
+            execution_ids = {row.execution_id for row in updated}
+            if not execution_ids:
+                await session.commit()
                 return
-            item_exec.final_result = judgment
-            item_exec.completed_at = datetime.utcnow()
-            await session.commit()
 
             # Aggregate: if all items completed, set execution completed (fail-fast: if any NG on required)
-            exec_row = (
-                await session.execute(
-                    select(InspectionExecution).where(InspectionExecution.id == execution_id)
+            counts = await session.execute(
+                select(
+                    InspectionItemExecution.execution_id,
+                    func.count(InspectionItemExecution.id).label("total"),
+                    func.count(InspectionItemExecution.final_result).label("completed"),
+                    func.count(
+                        case((InspectionItemExecution.final_result == "NG", 1))
+                    ).label("ng"),
                 )
-            ).scalars().first()
-            if not exec_row:
-                logger.warning(f"Execution not found: {execution_id}")
-                return
-
-            total = len(exec_row.item_executions)
-            completed = len([ie for ie in exec_row.item_executions if ie.final_result])
-            any_ng = any((ie.final_result == "NG") for ie in exec_row.item_executions)
-
-            if total > 0 and completed >= total:
-                exec_row.status = "COMPLETED" if not any_ng else "FAILED"
-                exec_row.completed_at = datetime.utcnow()
-                await session.commit()
+                .where(InspectionItemExecution.execution_id.in_(execution_ids))
+                .group_by(InspectionItemExecution.execution_id)
+            )
+            finished = {"COMPLETED": [], "FAILED": []}
+            for row in counts:
+                if row.total > 0 and row.completed >= row.total:
+                    finished["FAILED" if row.ng else "COMPLETED"].append(
+                        row.execution_id
+                    )
+            for status, ids in finished.items():
+                if ids:
+                    await session.execute(
+                        update(InspectionExecution)
+                        .where(
+                            InspectionExecution.id.in_(ids),
+                            InspectionExecution.status != status,
+                        )
+                        .values(status=status, completed_at=now)
+                        .execution_options(synchronize_session=False)
+                    )
+            await session.commit()
 
     async def retry_stale_execution(self, execution):
         """Retry executions that have been pending too long"""
@@ -211,6 +211,8 @@ class FileService:
 
             return BytesIO(data), filename, content_type
 
+        except FileNotFoundError:
+            raise
         except Exception as e:
             if hasattr(e, "code") and e.code == "NoSuchKey":
                 raise FileNotFoundError(f"File with ID {file_id} not found")
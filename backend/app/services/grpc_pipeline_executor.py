@@ -8,6 +8,7 @@ import grpc
 import logging
 import time
 import uuid
+from collections import Counter
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 
@@ -175,71 +176,68 @@ class GRPCPipelineExecutor:
         try:
             logger.info(f"Starting direct gRPC pipeline execution: {execution_id}")
 
-            # Parse pipeline steps and resolve dependencies
+            # Parse pipeline steps into a dataflow graph
             steps = pipeline_config.get("steps", [])
             global_params = pipeline_config.get("globalParameters", {})
 
-            execution_order = self._resolve_step_dependencies(steps)
+            graph = self._collapse_filter_chains(self._resolve_step_dependencies(steps))
+            input_path = global_params.get("inputPath")
 
-            results = {}
-            current_image_path = global_params.get("inputPath")
-
-            # Execute pipeline steps in optimized order
-            for step_group in execution_order:
-                if len(step_group) == 1:
-                    # Single step execution
-                    step = step_group[0]
-                    result = await self._execute_step(
-                        step, current_image_path, execution_id
-                    )
-                    results[step["stepId"]] = result
-                    current_image_path = result["output_path"]
+            # Services name outputs after the execution id, so steps of the
+            # same kind get their own name instead of overwriting each other
+            kinds = Counter(self._output_kind(step) for step in graph)
 
-                    # Send progress notification
-                    await self._send_progress_notification(
-                        execution_id, step["stepId"], "completed", result
+            # One task per step, created in topological order: each waits only
+            # for its own dependencies, so independent branches run concurrently
+            results = {}
+            tasks = {}
+            for step in graph:
+                output_id = (
+                    execution_id
+                    if kinds[self._output_kind(step)] == 1
+                    else f"{execution_id}_{step['stepId'].replace('+', '_')}"
+                )
+                tasks[step["stepId"]] = asyncio.create_task(
+                    self._run_dataflow_step(
+                        step, tasks, results, input_path, execution_id, output_id
                     )
+                )
+            await asyncio.gather(*tasks.values())
 
-                else:
-                    # Parallel step execution
-                    tasks = []
-                    for step in step_group:
-                        task = asyncio.create_task(
-                            self._execute_step(step, current_image_path, execution_id)
-                        )
-                        tasks.append((step, task))
-
-                    # Wait for all parallel tasks to complete
-                    for step, task in tasks:
-                        try:
-                            result = await task
-                            results[step["stepId"]] = result
-                            await self._send_progress_notification(
-                                execution_id, step["stepId"], "completed", result
-                            )
-                        except Exception as e:
-                            logger.error(
-                                f"Failed to execute step {step['stepId']}: {e}"
-                            )
-                            results[step["stepId"]] = {
-                                "status": "failed",
-                                "error": str(e),
-                            }
-                            await self._send_progress_notification(
-                                execution_id,
-                                step["stepId"],
-                                "failed",
-                                {"error": str(e)},
-                            )
+            # The last step (in pipeline order) that produced an image
+            final_output_path = input_path
+            for step in graph:
+                output_path = tasks[step["stepId"]].result().get("output_path")
+                if output_path:
+                    final_output_path = output_path
 
             execution_time = time.time() - start_time
 
+            # A failed step fails the run; its dependents were skipped, but
+            # the results of the branches that did run are kept. Steps are in
+            # topological order, so the first unsuccessful one is a failure
+            failed = [
+                tasks[step["stepId"]].result()
+                for step in graph
+                if tasks[step["stepId"]].result()["status"] != "success"
+            ]
+            if failed:
+                return {
+                    "execution_id": execution_id,
+                    "status": "failed",
+                    "error": f"Step {failed[0]['step_id']} failed: "
+                    f"{failed[0].get('error', 'Unknown error')}",
+                    "execution_time_ms": execution_time * 1000,
+                    "results": results,
+                    "final_output_path": final_output_path,
+                }
+
             return {
                 "execution_id": execution_id,
                 "status": "completed",
                 "execution_time_ms": execution_time * 1000,
                 "results": results,
-                "final_output_path": current_image_path,
+                "final_output_path": final_output_path,
             }
 
         except Exception as e:
@@ -251,11 +249,58 @@ class GRPCPipelineExecutor:
                 "execution_time_ms": (time.time() - start_time) * 1000,
             }
 
+    async def _run_dataflow_step(
+        self,
+        step: Dict[str, Any],
+        tasks: Dict[str, "asyncio.Task"],
+        results: Dict[str, Any],
+        pipeline_input: str,
+        execution_id: str,
+        output_id: str,
+    ) -> Dict[str, Any]:
+        """Wait for the dependencies of a step, then run it on its input"""
+        upstream = {dep: await tasks[dep] for dep in step["dependencies"]}
+        failed = [
+            dep for dep, result in upstream.items() if result["status"] != "success"
+        ]
+
+        if failed:
+            result = {
+                "step_id": step["stepId"],
+                "component_name": step.get("componentName"),
+                "status": "skipped",
+                "error": f"Upstream step failed: {', '.join(failed)}",
+            }
+        else:
+            input_path = (
+                upstream[step["input"]].get("output_path")
+                if step["input"]
+                else pipeline_input
+            )
+            result = await self._execute_step(step, input_path, execution_id, output_id)
+
+        status = "completed" if result["status"] == "success" else result["status"]
+        for step_id, step_result in self._step_results(step, result):
+            results[step_id] = step_result
+            await self._send_progress_notification(
+                execution_id, step_id, status, step_result
+            )
+        return result
+
     async def _execute_step(
-        self, step: Dict[str, Any], input_path: str, execution_id: str
+        self,
+        step: Dict[str, Any],
+        input_path: str,
+        execution_id: str,
+        output_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Execute individual pipeline step via direct gRPC call"""
+        """Execute individual pipeline step via direct gRPC call
+
+        output_id replaces execution_id in the service request, which names
+        the stored output after it.
+        """
         step_start_time = time.time()
+        output_id = output_id or execution_id
         component_name = step.get("componentName")
         step_id = step.get("stepId")
 
@@ -263,18 +308,25 @@ class GRPCPipelineExecutor:
             f"Executing step {step_id} ({component_name}) for execution {execution_id}"
         )
 
-        # Send start notification
-        await self._send_progress_notification(execution_id, step_id, "running", {})
+        # Send start notification (for every step fused into a filter chain)
+        for chained_step in step.get("steps", [step]):
+            await self._send_progress_notification(
+                execution_id, chained_step["stepId"], "running", {}
+            )
 
         try:
             if component_name == "resize":
-                result = await self._execute_resize_step(step, input_path, execution_id)
+                result = await self._execute_resize_step(step, input_path, output_id)
             elif component_name == "ai_detection":
                 result = await self._execute_ai_detection_step(
-                    step, input_path, execution_id
+                    step, input_path, output_id
                 )
             elif component_name == "filter":
-                result = await self._execute_filter_step(step, input_path, execution_id)
+                result = await self._execute_filter_step(step, input_path, output_id)
+            elif component_name == "filter_chain":
+                result = await self._execute_filter_chain_step(
+                    step, input_path, output_id
+                )
             else:
                 raise ValueError(f"Unknown component: {component_name}")
 
@@ -431,6 +483,176 @@ class GRPCPipelineExecutor:
             },
         }
 
+    async def _execute_filter_chain_step(
+        self, step: Dict[str, Any], input_path: str, execution_id: str
+    ) -> Dict[str, Any]:
+        """Execute consecutive filter steps as one ApplyFilterChain call"""
+        chained_steps = step["steps"]
+        filter_steps = []
+        for chained_step in chained_steps:
+            parameters = chained_step.get("parameters", {})
+            filter_steps.append(
+                filter_pb2.FilterStep(
+                    filter_type=self._get_filter_type_enum(
+                        parameters.get("filter_type", "gaussian")
+                    ),
+                    intensity=float(parameters.get("intensity", 1.0)),
+                )
+            )
+
+        # Create gRPC request
+        request = filter_pb2.FilterChainRequest(
+            input_image=common_pb2.ImageData(
+                bucket="imageflow-files",
+                object_key=input_path,
+                content_type="image/jpeg",
+            ),
+            steps=filter_steps,
+            execution_id=execution_id,
+        )
+
+        # Execute direct gRPC call
+        client = self.clients.get("filter")
+        if not client:
+            raise RuntimeError("Filter gRPC client not available")
+
+        timeout = self.grpc_services["filter"]["timeout"]
+        response = await client.ApplyFilterChain(request, timeout=timeout)
+        if response.result.status != common_pb2.PROCESSING_STATUS_COMPLETED:
+            raise RuntimeError(response.result.message)
+
+        return {
+            "output_path": response.result.output_image.object_key,
+            "metadata": {
+                "fused_steps": [s["stepId"] for s in chained_steps],
+                "steps": [
+                    {
+                        "filter_applied": s.get("parameters", {}).get(
+                            "filter_type", "gaussian"
+                        ),
+                        "intensity": s.get("parameters", {}).get("intensity", 1.0),
+                        "processing_time_ms": applied.processing_time_ms,
+                    }
+                    for s, applied in zip(chained_steps, response.steps)
+                ],
+                "processing_time_ms": response.result.processing_time_seconds * 1000,
+            },
+        }
+
+    def _collapse_filter_chains(
+        self, steps: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge chains of filter steps into one filter chain step, so the image
+        is decoded, encoded and stored once per chain. A filter joins the
+        chain of the filter before it when that is its only dependency and
+        input, and nothing else depends on the earlier filter.
+        """
+        dependents = {step["stepId"]: [] for step in steps}
+        for step in steps:
+            for dep in step["dependencies"]:
+                dependents[dep].append(step["stepId"])
+
+        def chains_onto(step):
+            if step.get("componentName") != "filter":
+                return None
+            if step["dependencies"] != [step["input"]] or step["input"] is None:
+                return None
+            previous = step_map[step["input"]]
+            if previous.get("componentName") != "filter":
+                return None
+            return previous if len(dependents[previous["stepId"]]) == 1 else None
+
+        step_map = {step["stepId"]: step for step in steps}
+        chain_of = {}  # stepId of a fused filter -> its chain (list of steps)
+        for step in steps:
+            previous = chains_onto(step)
+            chain = chain_of.get(previous["stepId"]) if previous else None
+            if chain is None:
+                chain = [step]
+            else:
+                chain.append(step)
+            chain_of[step["stepId"]] = chain
+
+        collapsed = []
+        renamed = {}  # stepId of the last filter of a chain -> chain stepId
+        for step in steps:
+            chain = chain_of.get(step["stepId"])
+            if chain is None or len(chain) == 1:
+                collapsed.append(step)
+            elif step is chain[-1]:
+                chain_id = "+".join(s["stepId"] for s in chain)
+                renamed[step["stepId"]] = chain_id
+                collapsed.append(
+                    {
+                        "stepId": chain_id,
+                        "componentName": "filter_chain",
+                        "steps": list(chain),
+                        "dependencies": chain[0]["dependencies"],
+                        "input": chain[0]["input"],
+                    }
+                )
+
+        # Steps downstream of a chain wait for, and read, the chain
+        for step in collapsed:
+            step["dependencies"] = [
+                renamed.get(dep, dep) for dep in step["dependencies"]
+            ]
+            step["input"] = renamed.get(step["input"], step["input"])
+        return collapsed
+
+    def _output_kind(self, step: Dict[str, Any]) -> str:
+        """Service output a step writes ({execution_id}_resized.jpg, ...)"""
+        component_name = step.get("componentName")
+        return "filter" if component_name == "filter_chain" else component_name
+
+    def _step_results(self, step: Dict[str, Any], result: Dict[str, Any]):
+        """Yield (step_id, result) per pipeline step, splitting filter chains"""
+        if step.get("componentName") != "filter_chain":
+            yield step["stepId"], result
+            return
+
+        metadata = result.get("metadata", {})
+        step_metadata = metadata.get("steps", [])
+        for index, chained_step in enumerate(step["steps"]):
+            step_result = {
+                **result,
+                "step_id": chained_step["stepId"],
+                "component_name": "filter",
+            }
+            if index < len(step_metadata):
+                step_result["metadata"] = {
+                    **step_metadata[index],
+                    "fused_steps": metadata.get("fused_steps", []),
+                }
+            yield chained_step["stepId"], step_result
+
+    async def render_annotations(
+        self, execution_id: str, bucket: str = "imageflow-files"
+    ) -> Optional[str]:
+        """Render the annotated image of a lazily annotated detection run.
+
+        Returns the object key of the annotated image, or None if it could
+        not be rendered.
+        """
+        client = self.clients.get("ai_detection")
+        if not client:
+            raise RuntimeError("AI detection gRPC client not available")
+
+        timeout = self.grpc_services["ai_detection"]["timeout"]
+        response = await client.RenderAnnotations(
+            ai_detection_pb2.AnnotationRequest(
+                bucket=bucket, execution_id=execution_id
+            ),
+            timeout=timeout,
+        )
+        if response.result.status != common_pb2.PROCESSING_STATUS_COMPLETED:
+            logger.warning(
+                f"Annotation rendering failed for {execution_id}: {response.result.message}"
+            )
+            return None
+        return response.result.output_image.object_key
+
     def _get_filter_type_enum(self, filter_type_str: str):
         """Convert string filter type to protobuf enum"""
         filter_map = {
@@ -440,6 +662,7 @@ class GRPCPipelineExecutor:
             "brightness": filter_pb2.FilterType.FILTER_TYPE_BRIGHTNESS,
             "contrast": filter_pb2.FilterType.FILTER_TYPE_CONTRAST,
             "saturation": filter_pb2.FilterType.FILTER_TYPE_SATURATION,
+            "gamma": filter_pb2.FilterType.FILTER_TYPE_GAMMA,
         }
         return filter_map.get(
             filter_type_str.lower(), filter_pb2.FilterType.FILTER_TYPE_GAUSSIAN
@@ -447,46 +670,58 @@ class GRPCPipelineExecutor:
 
     def _resolve_step_dependencies(
         self, steps: List[Dict[str, Any]]
-    ) -> List[List[Dict[str, Any]]]:
+    ) -> List[Dict[str, Any]]:
         """
-        Resolve step dependencies and return execution order
-        Groups parallel-executable steps together for optimization
+        Validate the dataflow graph of the pipeline steps and return copies of
+        the steps in topological order (ties keep the pipeline order).
+
+        Each step waits for all of its "dependencies" and consumes the output
+        of its "input" step, which must be one of them (default: the first
+        dependency; no dependencies means the pipeline input).
         """
-        # Build dependency graph
         step_map = {step["stepId"]: step for step in steps}
-        dependencies = {}
-
+        resolved = {}
         for step in steps:
             step_id = step["stepId"]
-            step_deps = step.get("dependencies", [])
-            dependencies[step_id] = step_deps
-
-        # Topological sort with parallel grouping
-        executed = set()
-        execution_order = []
-
-        while len(executed) < len(steps):
-            # Find steps with no unexecuted dependencies
-            ready_steps = []
-            for step_id, deps in dependencies.items():
-                if step_id not in executed:
-                    if all(dep in executed for dep in deps):
-                        ready_steps.append(step_map[step_id])
-
-            if not ready_steps:
-                # Circular dependency or error
-                remaining_steps = [
-                    step_map[step_id]
-                    for step_id in dependencies.keys()
-                    if step_id not in executed
-                ]
-                execution_order.append(remaining_steps)
-                break
-
-            execution_order.append(ready_steps)
-            executed.update(step["stepId"] for step in ready_steps)
-
-        return execution_order
+            dependencies = []
+            for dep in step.get("dependencies", []):
+                if dep not in step_map:
+                    raise ValueError(f"Step {step_id} depends on unknown step {dep}")
+                if dep not in dependencies:
+                    dependencies.append(dep)
+            input_step = step.get("input") or (
+                dependencies[0] if dependencies else None
+            )
+            if input_step is not None and input_step not in dependencies:
+                raise ValueError(
+                    f"Step {step_id} reads {input_step}, which is not one of its dependencies"
+                )
+            resolved[step_id] = {
+                **step,
+                "dependencies": dependencies,
+                "input": input_step,
+            }
+
+        # Kahn's algorithm
+        order = []
+        done = set()
+        pending = list(resolved.values())
+        while pending:
+            ready = [
+                step
+                for step in pending
+                if all(dep in done for dep in step["dependencies"])
+            ]
+            if not ready:
+                raise ValueError(
+                    "Circular step dependencies: "
+                    + ", ".join(step["stepId"] for step in pending)
+                )
+            order.extend(ready)
+            done.update(step["stepId"] for step in ready)
+            pending = [step for step in pending if step["stepId"] not in done]
+
+        return order
 
     async def _send_progress_notification(
         self, execution_id: str, step_id: str, status: str, data: Dict[str, Any]
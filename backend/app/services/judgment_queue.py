@@ -1,19 +1,51 @@
 import asyncio
-from typing import Any, Dict
+import os
+import time
+from typing import Any, Dict, List
+
+# Bounded so a stalled consumer shows up as backpressure on the publishers
+# (counted in stats()) instead of unbounded memory growth
+MAXSIZE = int(os.getenv("JUDGMENT_QUEUE_MAXSIZE", "1000"))
+# How long publish() waits for room before dropping the event
+PUT_TIMEOUT = float(os.getenv("JUDGMENT_QUEUE_PUT_TIMEOUT", "1.0"))
 
 _queue: asyncio.Queue | None = None
+_stats = {
+    "published": 0,
+    "dropped": 0,
+    "blocked_puts": 0,
+    "put_wait_ms": 0.0,
+    "max_depth": 0,
+}
 
 
 def get_queue() -> asyncio.Queue:
     global _queue
     if _queue is None:
-        _queue = asyncio.Queue()
+        _queue = asyncio.Queue(maxsize=MAXSIZE)
     return _queue
 
 
-async def publish(event: Dict[str, Any]):
+async def publish(event: Dict[str, Any], timeout: float | None = None) -> bool:
+    """Enqueue an event, waiting up to timeout for room; False if it was dropped."""
     q = get_queue()
-    await q.put(event)
+    try:
+        q.put_nowait(event)
+    except asyncio.QueueFull:
+        _stats["blocked_puts"] += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                q.put(event), PUT_TIMEOUT if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            _stats["dropped"] += 1
+            return False
+        finally:
+            _stats["put_wait_ms"] += (time.perf_counter() - started) * 1000
+    _stats["published"] += 1
+    _stats["max_depth"] = max(_stats["max_depth"], q.qsize())
+    return True
 
 
 async def subscribe():
@@ -26,3 +58,27 @@ async def subscribe():
         finally:
             q.task_done()
 
+
+async def next_batch(max_items: int, linger: float = 0.0) -> List[Dict[str, Any]]:
+    """Wait for an event, then take whatever else is queued (up to max_items).
+
+    With linger > 0 the batch stays open that long for more events to arrive
+    (unless it is already full).
+    """
+    q = get_queue()
+    batch = [await q.get()]
+    if linger > 0 and q.qsize() < max_items - 1:
+        await asyncio.sleep(linger)
+    while len(batch) < max_items:
+        try:
+            batch.append(q.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    for _ in batch:
+        q.task_done()
+    return batch
+
+
+def stats() -> Dict[str, Any]:
+    q = get_queue()
+    return dict(_stats, depth=q.qsize(), maxsize=q.maxsize)
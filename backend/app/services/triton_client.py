@@ -1,36 +1,214 @@
+import asyncio
 import numpy as np
 import cv2
 import logging
-from typing import List, Dict, Any, Tuple
-import tempfile
+from typing import List, Dict, Any, Tuple, Optional
 import os
+import re
+import uuid
+import socket
+import threading
+import weakref
 
 logger = logging.getLogger(__name__)
 
 try:
-    import tritonclient.http as httpclient
+    import tritonclient.grpc.aio as grpcclient
     TRITON_AVAILABLE = True
 except ImportError:
     TRITON_AVAILABLE = False
     logger.warning("Triton client not available, using mock detection")
 
+try:
+    import tritonclient.http.aio as httpclient
+    TRITON_HTTP_AVAILABLE = True
+except ImportError:
+    TRITON_HTTP_AVAILABLE = False
+
+try:
+    import tritonclient.utils.shared_memory as shm
+    SHARED_MEMORY_AVAILABLE = True
+except ImportError:
+    SHARED_MEMORY_AVAILABLE = False
+
+# models/yolo/config.pbtxt の入出力定義
+INPUT_NAME = "images"
+OUTPUT_NAME = "output0"
+INPUT_SHAPE = [1, 3, 640, 640]
+OUTPUT_SHAPE = [1, 84, 8400]
+INPUT_BYTE_SIZE = int(np.prod(INPUT_SHAPE)) * 4
+OUTPUT_BYTE_SIZE = int(np.prod(OUTPUT_SHAPE)) * 4
+
+LETTERBOX_PAD_VALUE = 114  # YOLOの学習時と同じパディング色
+
+PROTOCOL_GRPC = "grpc"
+PROTOCOL_HTTP = "http"
+
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1", "[::1]")
+
+# 共有メモリ領域名: imageflow_{ホスト名}_{PID}-{プロセス開始時刻}_{乱数}_{input|output}_{番号}
+# ホスト名・PID・開始時刻から、作成したプロセスが既に終了しているか判定できる
+SHM_REGION_PREFIX = "imageflow"
+SHM_REGION_PATTERN = re.compile(
+    rf"^{SHM_REGION_PREFIX}_(?P<host>[A-Za-z0-9.-]+)_(?P<process>\d+-\d+)_[0-9a-f]+_(input|output)_\d+$")
+SHM_DIR = "/dev/shm"
+
+
+def _host_tag() -> str:
+    return re.sub(r"[^A-Za-z0-9.-]", "-", socket.gethostname())
+
+
+def _process_tag(pid: Optional[int] = None) -> Optional[str]:
+    """PIDと開始時刻（PIDが再利用されても同一プロセスを識別できる）。/procが無ければNone"""
+    pid = pid or os.getpid()
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            start_time = f.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return None
+    return f"{pid}-{start_time}"
+
+
+def _is_stale_region(name: str) -> bool:
+    """このホストで終了済みのプロセスが作成した共有メモリ領域か"""
+    match = SHM_REGION_PATTERN.match(name)
+    if not match or match.group("host") != _host_tag():
+        return False
+    pid = int(match.group("process").split("-", 1)[0])
+    return _process_tag(pid) != match.group("process")
+
+
+# 共有メモリを登録中のクライアント（シャットダウン時に解放する）
+_open_clients: "weakref.WeakSet[TritonYOLOClient]" = weakref.WeakSet()
+
+
+async def close_all_clients():
+    """登録中の共有メモリ領域をすべて解放してクライアントを閉じる（アプリ終了時）"""
+    for client in list(_open_clients):
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Triton client: {e}")
+
+
+class _SharedMemorySlot:
+    """入力・出力1組のシステム共有メモリ領域"""
+
+    def __init__(self, prefix: str, index: int):
+        self.input_name = f"{prefix}_input_{index}"
+        self.output_name = f"{prefix}_output_{index}"
+        self.input_handle = shm.create_shared_memory_region(
+            self.input_name, f"/{self.input_name}", INPUT_BYTE_SIZE)
+        self.output_handle = shm.create_shared_memory_region(
+            self.output_name, f"/{self.output_name}", OUTPUT_BYTE_SIZE)
+        # 共有メモリを直接参照するビュー（前処理結果をここへ書き込む）
+        self.input_view = shm.get_contents_as_numpy(self.input_handle, np.float32, INPUT_SHAPE)
+        self.output_view = shm.get_contents_as_numpy(self.output_handle, np.float32, OUTPUT_SHAPE)
+
+    def destroy(self):
+        for handle in (self.input_handle, self.output_handle):
+            try:
+                shm.destroy_shared_memory_region(handle)
+            except Exception as e:
+                logger.warning(f"Could not destroy shared memory region: {e}")
+
+
+class LetterboxPreprocessor:
+    """YOLO入力テンソルへのレターボックス前処理
+
+    スレッドごとにパディング済みキャンバス・チャンネル面（uint8）と入力テンソル
+    （float32）を事前確保し、リサイズ結果をキャンバスのレターボックス領域へ直接
+    書き込む。BGR→RGB・HWC→CHWはチャンネル抽出で行い、正規化はテンソルへの
+    1回の書き込みで済むため、フレームごとのフルサイズ確保は発生しない。
+    パディング領域は画像サイズが変わった時のみ塗り直す。
+    """
+
+    def __init__(self, size: int = INPUT_SHAPE[2]):
+        self.size = size
+        self._local = threading.local()
+    
+    def _buffers(self):
+        local = self._local
+        if not hasattr(local, "canvas"):
+            local.canvas = np.full((self.size, self.size, 3), LETTERBOX_PAD_VALUE, dtype=np.uint8)
+            local.planes = np.empty((3, self.size, self.size), dtype=np.uint8)
+            local.tensor = np.empty((1, 3, self.size, self.size), dtype=np.float32)
+            local.geometry = None
+        return local
+    
+    def __call__(self,
+                 image: np.ndarray,
+                 out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Tuple[float, int, int]]:
+        """画像を[1, 3, size, size]テンソルへ変換
+
+        戻り値は (テンソル, (scale, pad_x, pad_y))。元画像座標は
+        (モデル座標 - pad) / scale で求まる。out未指定時のテンソルは
+        呼び出しスレッドのバッファで、同じスレッドの次の呼び出しで上書きされる。
+        """
+        buffers = self._buffers()
+        h, w = image.shape[:2]
+        scale = min(self.size / w, self.size / h)
+        new_w, new_h = int(round(w * scale)), int(round(h * scale))
+        pad_x, pad_y = (self.size - new_w) // 2, (self.size - new_h) // 2
+        
+        canvas = buffers.canvas
+        geometry = (new_w, new_h)
+        if buffers.geometry != geometry:
+            # 前回と配置が異なる場合のみパディング領域を塗り直す
+            canvas[...] = LETTERBOX_PAD_VALUE
+            buffers.geometry = geometry
+        
+        cv2.resize(image, geometry,
+                   dst=canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w],
+                   interpolation=cv2.INTER_LINEAR)
+        
+        # BGR->RGB・HWC->CHW（連続したチャンネル面へ抽出する方が
+        # 転置ビューへの一括書き込みより高速）
+        planes = buffers.planes
+        for channel in range(3):
+            cv2.extractChannel(canvas, 2 - channel, dst=planes[channel])
+        
+        tensor = buffers.tensor if out is None else out
+        np.multiply(planes, np.float32(1.0 / 255.0), out=tensor[0])
+        return tensor, (scale, pad_x, pad_y)
+
+
 class TritonYOLOClient:
+    """Triton上のYOLOモデルを呼び出す非同期クライアント
+
+    gRPC (tritonclient.grpc.aio) の永続チャネルを使い、イベントループを
+    ブロックしない。Tritonと同一ノードで動作する場合は入出力テンソルを
+    システム共有メモリ経由で受け渡し、それ以外はバイナリgRPCで送信する。
+    protocol="http" は非同期HTTPクライアント（比較用）。
+    """
+
     def __init__(self, 
-                 triton_url: str = "localhost:8000", 
+                 triton_url: Optional[str] = None, 
                  model_name: str = "yolo",
-                 model_version: str = "1"):
+                 model_version: str = "1",
+                 protocol: Optional[str] = None,
+                 shared_memory: Optional[str] = None,
+                 shared_memory_slots: Optional[int] = None):
+        self.protocol = (protocol or os.getenv("TRITON_PROTOCOL", PROTOCOL_GRPC)).lower()
+        if triton_url is None:
+            if self.protocol == PROTOCOL_HTTP:
+                triton_url = os.getenv("TRITON_HTTP_URL", "localhost:8000")
+            else:
+                triton_url = os.getenv("TRITON_GRPC_URL", "localhost:8001")
         self.triton_url = triton_url
         self.model_name = model_name
         self.model_version = model_version
-        self.triton_available = TRITON_AVAILABLE
-        
-        if self.triton_available:
-            try:
-                self.triton_client = httpclient.InferenceServerClient(url=triton_url)
-                self._check_model_ready()
-            except Exception as e:
-                logger.warning(f"Could not connect to Triton server: {e}")
-                self.triton_available = False
+        self.triton_available = TRITON_HTTP_AVAILABLE if self.protocol == PROTOCOL_HTTP else TRITON_AVAILABLE
+
+        # auto: Tritonが同一ノード（localhost または TRITON_SAME_NODE=true）の場合のみ共有メモリ
+        self.shared_memory_mode = (shared_memory or os.getenv("TRITON_SHARED_MEMORY", "auto")).lower()
+        self.shared_memory_slots = shared_memory_slots or int(os.getenv("TRITON_SHARED_MEMORY_SLOTS", "2"))
+
+        self.triton_client = None
+        self._connect_lock = None
+        self._slots: List[_SharedMemorySlot] = []
+        self._free_slots: Optional[asyncio.Queue] = None
+        self.preprocessor = LetterboxPreprocessor()
         
         # COCO クラス名（YOLO用）
         self.class_names = [
@@ -48,25 +226,127 @@ class TritonYOLOClient:
             'toothbrush'
         ]
     
-    def _check_model_ready(self):
-        """モデルの準備状況を確認"""
-        if not self.triton_available:
+    @property
+    def uses_shared_memory(self) -> bool:
+        return bool(self._slots)
+    
+    def _shared_memory_wanted(self) -> bool:
+        """共有メモリを使うかどうか（gRPCかつ同一ノードの場合）"""
+        if self.protocol != PROTOCOL_GRPC or not SHARED_MEMORY_AVAILABLE:
+            return False
+        if self.shared_memory_mode == "system":
+            return True
+        if self.shared_memory_mode != "auto":
             return False
+        host = self.triton_url.rsplit(":", 1)[0]
+        return host in LOCAL_HOSTS or os.getenv("TRITON_SAME_NODE", "false").lower() == "true"
+    
+    async def connect(self) -> bool:
+        """永続接続を確立し、モデルの準備状況を確認（初回のみ）"""
+        if self.triton_client is not None:
+            return True
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
         
-        try:
-            model_ready = self.triton_client.is_model_ready(
-                model_name=self.model_name,
-                model_version=self.model_version
-            )
-            if not model_ready:
+        async with self._connect_lock:
+            if self.triton_client is not None:
+                return True
+            
+            if self.protocol == PROTOCOL_HTTP:
+                client = httpclient.InferenceServerClient(url=self.triton_url)
+            else:
+                client = grpcclient.InferenceServerClient(url=self.triton_url)
+            ready = await client.is_model_ready(self.model_name, self.model_version)
+            
+            if not ready:
                 logger.warning(f"Model {self.model_name} version {self.model_version} is not ready")
+                await self._close_client(client)
                 return False
             
-            logger.info(f"Triton model {self.model_name} is ready")
+            if self._shared_memory_wanted():
+                await self._register_shared_memory(client)
+            
+            self.triton_client = client
+            transport = "system shared memory" if self._slots else f"binary {self.protocol}"
+            logger.info(f"Triton model {self.model_name} is ready at {self.triton_url} ({transport})")
             return True
+    
+    async def _register_shared_memory(self, client):
+        """入出力用の共有メモリ領域を作成してTritonに登録（失敗時はバイナリgRPC）"""
+        process = _process_tag()
+        if process is None:
+            logger.warning("Cannot identify this process (/proc unavailable), using binary gRPC")
+            return
+        await self._unregister_stale_regions(client)
+        prefix = f"{SHM_REGION_PREFIX}_{_host_tag()}_{process}_{uuid.uuid4().hex[:8]}"
+        slots = []
+        try:
+            for index in range(self.shared_memory_slots):
+                slot = _SharedMemorySlot(prefix, index)
+                slots.append(slot)
+                await client.register_system_shared_memory(
+                    slot.input_name, f"/{slot.input_name}", INPUT_BYTE_SIZE)
+                await client.register_system_shared_memory(
+                    slot.output_name, f"/{slot.output_name}", OUTPUT_BYTE_SIZE)
         except Exception as e:
-            logger.warning(f"Could not check model readiness: {e}")
-            return False
+            logger.warning(f"System shared memory unavailable, using binary gRPC: {e}")
+            await self._release_slots(client, slots)
+            return
+        
+        self._slots = slots
+        self._free_slots = asyncio.Queue()
+        for slot in slots:
+            self._free_slots.put_nowait(slot)
+        _open_clients.add(self)
+    
+    async def _unregister_stale_regions(self, client):
+        """終了済みプロセス（再起動前など）が残した共有メモリ領域を登録解除・削除"""
+        names = set()
+        try:
+            status = await client.get_system_shared_memory_status(as_json=True)
+            names.update(status.get("regions", {}))
+        except Exception as e:
+            logger.warning(f"Could not list Triton shared memory regions: {e}")
+        try:
+            names.update(os.listdir(SHM_DIR))
+        except OSError:
+            pass
+        
+        stale = sorted(name for name in names if _is_stale_region(name))
+        for name in stale:
+            try:
+                await client.unregister_system_shared_memory(name)
+            except Exception:
+                pass
+            try:
+                os.unlink(os.path.join(SHM_DIR, name))
+            except OSError:
+                pass
+        if stale:
+            logger.info(f"Released {len(stale)} stale shared memory regions")
+    
+    async def _release_slots(self, client, slots: List[_SharedMemorySlot]):
+        for slot in slots:
+            for name in (slot.input_name, slot.output_name):
+                try:
+                    await client.unregister_system_shared_memory(name)
+                except Exception:
+                    pass
+            slot.destroy()
+    
+    async def _close_client(self, client):
+        await client.close()
+    
+    async def close(self):
+        """共有メモリ領域の登録解除とチャネルのクローズ"""
+        if self.triton_client is None:
+            return
+        client, self.triton_client = self.triton_client, None
+        _open_clients.discard(self)
+        await self._release_slots(client, self._slots)
+        self._slots = []
+        self._free_slots = None
+        await self._close_client(client)
     
     async def detect_objects(self, 
                            image_path: str, 
@@ -77,6 +357,8 @@ class TritonYOLOClient:
             return await self._mock_detect_objects(image_path, confidence_threshold)
         
         try:
+            if not await self.connect():
+                raise RuntimeError(f"Triton model {self.model_name} is not ready")
             return await self._triton_detect_objects(image_path, confidence_threshold, iou_threshold)
         except Exception as e:
             logger.error(f"Triton detection failed, falling back to mock: {e}")
@@ -86,84 +368,96 @@ class TritonYOLOClient:
                                    image_path: str, 
                                    confidence_threshold: float,
                                    iou_threshold: float) -> List[Dict[str, Any]]:
-        """Tritonサーバーを使用した物体検出"""
-        # 画像の前処理
-        image = cv2.imread(image_path)
+        """Tritonサーバーを使用した物体検出（CPU処理はスレッドで実行）"""
+        # 画像の読み込み
+        image = await asyncio.to_thread(cv2.imread, image_path)
         if image is None:
             raise Exception(f"Could not read image: {image_path}")
         
         original_height, original_width = image.shape[:2]
         
-        # YOLOの入力形式に変換（640x640）
-        input_image = self._preprocess_image(image, (640, 640))
-        
-        # Triton推論リクエストを作成
-        inputs = []
-        outputs = []
-        
-        # 入力テンソル
-        inputs.append(httpclient.InferInput('images', input_image.shape, "FP32"))
-        inputs[0].set_data_from_numpy(input_image)
-        
-        # 出力テンソル
-        outputs.append(httpclient.InferRequestedOutput('output0'))
-        
-        # 推論実行
-        results = self.triton_client.infer(
-            model_name=self.model_name,
-            model_version=self.model_version,
-            inputs=inputs,
-            outputs=outputs
-        )
-        
-        # 結果を取得
-        output_data = results.as_numpy('output0')
+        if self._slots:
+            output_data, transform = await self._infer_shared_memory(image)
+        else:
+            output_data, transform = await self._infer_binary(image)
         
         # 後処理
-        detections = self._postprocess_detections(
+        return await asyncio.to_thread(
+            self._postprocess_detections,
             output_data, 
             original_width, 
             original_height,
             confidence_threshold,
-            iou_threshold
+            iou_threshold,
+            transform
         )
-        
-        return detections
     
-    def _preprocess_image(self, image: np.ndarray, target_size: Tuple[int, int]) -> np.ndarray:
-        """YOLOの入力形式に画像を前処理"""
-        # リサイズ（アスペクト比保持）
-        h, w = image.shape[:2]
-        target_w, target_h = target_size
-        
-        # アスペクト比を保持してリサイズ
-        scale = min(target_w / w, target_h / h)
-        new_w = int(w * scale)
-        new_h = int(h * scale)
-        
-        resized_image = cv2.resize(image, (new_w, new_h))
-        
-        # パディングを追加
-        pad_w = (target_w - new_w) // 2
-        pad_h = (target_h - new_h) // 2
-        
-        padded_image = np.zeros((target_h, target_w, 3), dtype=np.uint8)
-        padded_image[pad_h:pad_h + new_h, pad_w:pad_w + new_w] = resized_image
-        
-        # 正規化とチャンネル順序変更
-        input_image = padded_image.astype(np.float32) / 255.0
-        input_image = np.transpose(input_image, (2, 0, 1))  # HWC -> CHW
-        input_image = np.expand_dims(input_image, axis=0)  # バッチ次元追加
-        
-        return input_image
+    async def _infer_shared_memory(self, image: np.ndarray) -> Tuple[np.ndarray, Tuple[float, int, int]]:
+        """共有メモリ経由で推論（入力は共有メモリへ直接前処理）"""
+        slot = await self._free_slots.get()
+        try:
+            _, transform = await asyncio.to_thread(self._preprocess_image, image, slot.input_view)
+            
+            infer_input = grpcclient.InferInput(INPUT_NAME, INPUT_SHAPE, "FP32")
+            infer_input.set_shared_memory(slot.input_name, INPUT_BYTE_SIZE)
+            infer_output = grpcclient.InferRequestedOutput(OUTPUT_NAME)
+            infer_output.set_shared_memory(slot.output_name, OUTPUT_BYTE_SIZE)
+            
+            await self.triton_client.infer(
+                model_name=self.model_name,
+                model_version=self.model_version,
+                inputs=[infer_input],
+                outputs=[infer_output]
+            )
+            # スロットは再利用されるため結果をコピーして返す
+            return slot.output_view.copy(), transform
+        finally:
+            self._free_slots.put_nowait(slot)
+    
+    def _build_binary_input(self, image: np.ndarray):
+        """前処理してリクエスト用の入力を作成
+
+        前処理バッファはスレッドごとに再利用されるため、同じスレッド内で
+        テンソルをリクエストへシリアライズしてから返す。
+        """
+        input_image, transform = self._preprocess_image(image)
+        if self.protocol == PROTOCOL_HTTP:
+            infer_input = httpclient.InferInput(INPUT_NAME, list(input_image.shape), "FP32")
+            infer_input.set_data_from_numpy(input_image, binary_data=True)
+        else:
+            infer_input = grpcclient.InferInput(INPUT_NAME, list(input_image.shape), "FP32")
+            infer_input.set_data_from_numpy(input_image)
+        return infer_input, transform
+    
+    async def _infer_binary(self, image: np.ndarray) -> Tuple[np.ndarray, Tuple[float, int, int]]:
+        """テンソルをリクエストに含めて推論（バイナリgRPC / HTTP）"""
+        infer_input, transform = await asyncio.to_thread(self._build_binary_input, image)
+        if self.protocol == PROTOCOL_HTTP:
+            infer_output = httpclient.InferRequestedOutput(OUTPUT_NAME, binary_data=True)
+        else:
+            infer_output = grpcclient.InferRequestedOutput(OUTPUT_NAME)
+        results = await self.triton_client.infer(
+            model_name=self.model_name,
+            model_version=self.model_version,
+            inputs=[infer_input],
+            outputs=[infer_output]
+        )
+        return results.as_numpy(OUTPUT_NAME), transform
+    
+    def _preprocess_image(self,
+                          image: np.ndarray,
+                          out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Tuple[float, int, int]]:
+        """YOLOの入力形式に画像を前処理（テンソルと (scale, pad_x, pad_y) を返す）"""
+        return self.preprocessor(image, out)
     
     def _postprocess_detections(self, 
                               output_data: np.ndarray,
                               original_width: int,
                               original_height: int,
                               confidence_threshold: float,
-                              iou_threshold: float) -> List[Dict[str, Any]]:
-        """YOLO出力の後処理"""
+                              iou_threshold: float,
+                              transform: Tuple[float, int, int]) -> List[Dict[str, Any]]:
+        """YOLO出力の後処理（transformは前処理のレターボックス情報）"""
         detections = []
         
         # YOLOv8の出力形式を想定
@@ -190,61 +484,65 @@ class TritonYOLOClient:
         class_ids = np.argmax(valid_detections[:, 4:], axis=1)
         
         # バウンディングボックスの変換（中心座標+幅高さ -> 左上右下）
-        boxes = self._convert_boxes(valid_detections[:, :4], original_width, original_height)
+        boxes = self._convert_boxes(valid_detections[:, :4], original_width, original_height, transform)
         
-        # NMS適用
-        indices = cv2.dnn.NMSBoxes(
-            boxes.tolist(), 
-            valid_scores.tolist(), 
-            confidence_threshold, 
-            iou_threshold
-        )
+        # NMS適用（クラス別、配列のまま一括処理）
+        keep = self._non_max_suppression(boxes, valid_scores, class_ids, iou_threshold)
         
-        if len(indices) > 0:
-            for i in indices.flatten():
-                x1, y1, x2, y2 = boxes[i]
-                confidence = valid_scores[i]
-                class_id = class_ids[i]
-                class_name = self.class_names[class_id] if class_id < len(self.class_names) else f"class_{class_id}"
-                
-                detection = {
-                    "class": class_name,
-                    "confidence": float(confidence),
-                    "bbox": {
-                        "x1": float(x1),
-                        "y1": float(y1),
-                        "x2": float(x2),
-                        "y2": float(y2)
-                    }
-                }
-                detections.append(detection)
+        for (x1, y1, x2, y2), confidence, class_id in zip(
+            boxes[keep].tolist(), valid_scores[keep].tolist(), class_ids[keep].tolist()
+        ):
+            class_name = self.class_names[class_id] if class_id < len(self.class_names) else f"class_{class_id}"
+            detections.append({
+                "class": class_name,
+                "confidence": confidence,
+                "bbox": {"x1": x1, "y1": y1, "x2": x2, "y2": y2}
+            })
         
         return detections
     
-    def _convert_boxes(self, boxes: np.ndarray, img_width: int, img_height: int) -> np.ndarray:
+    def _non_max_suppression(self,
+                             boxes: np.ndarray,
+                             scores: np.ndarray,
+                             class_ids: np.ndarray,
+                             iou_threshold: float,
+                             max_detections: int = 300) -> np.ndarray:
+        """クラス別NMS（配列のままOpenCVへ渡し、リスト変換を行わない）"""
+        if len(boxes) == 0:
+            return np.empty(0, dtype=np.int64)
+        
+        xywh = boxes.astype(np.float32)
+        xywh[:, 2:] -= xywh[:, :2]
+        keep = cv2.dnn.NMSBoxesBatched(
+            xywh, scores.astype(np.float32), class_ids.astype(np.int32), 0.0, iou_threshold, top_k=max_detections
+        )
+        return np.asarray(keep, dtype=np.int64).reshape(-1)
+    
+    def _convert_boxes(self,
+                       boxes: np.ndarray,
+                       img_width: int,
+                       img_height: int,
+                       transform: Tuple[float, int, int]) -> np.ndarray:
         """YOLOボックス形式を変換"""
-        # 中心座標+幅高さ -> 左上右下
-        converted_boxes = np.zeros_like(boxes)
+        scale, pad_x, pad_y = transform
         
-        # 640x640の座標を元画像サイズにスケール
-        scale_x = img_width / 640
-        scale_y = img_height / 640
-        
-        center_x = boxes[:, 0] * scale_x
-        center_y = boxes[:, 1] * scale_y
-        width = boxes[:, 2] * scale_x
-        height = boxes[:, 3] * scale_y
-        
-        converted_boxes[:, 0] = center_x - width / 2  # x1
-        converted_boxes[:, 1] = center_y - height / 2  # y1
-        converted_boxes[:, 2] = center_x + width / 2   # x2
-        converted_boxes[:, 3] = center_y + height / 2  # y2
+        # 中心座標+幅高さ -> 左上右下
+        half_w = boxes[:, 2] / 2
+        half_h = boxes[:, 3] / 2
+        converted_boxes = np.stack([
+            boxes[:, 0] - half_w,  # x1
+            boxes[:, 1] - half_h,  # y1
+            boxes[:, 0] + half_w,  # x2
+            boxes[:, 1] + half_h   # y2
+        ], axis=1)
+        
+        # レターボックスのパディングを除去して元画像サイズにスケール
+        converted_boxes -= np.array([pad_x, pad_y, pad_x, pad_y], dtype=converted_boxes.dtype)
+        converted_boxes /= scale
         
         # 画像境界内にクランプ
-        converted_boxes[:, 0] = np.clip(converted_boxes[:, 0], 0, img_width)
-        converted_boxes[:, 1] = np.clip(converted_boxes[:, 1], 0, img_height)
-        converted_boxes[:, 2] = np.clip(converted_boxes[:, 2], 0, img_width)
-        converted_boxes[:, 3] = np.clip(converted_boxes[:, 3], 0, img_height)
+        np.clip(converted_boxes[:, 0::2], 0, img_width, out=converted_boxes[:, 0::2])
+        np.clip(converted_boxes[:, 1::2], 0, img_height, out=converted_boxes[:, 1::2])
         
         return converted_boxes
     
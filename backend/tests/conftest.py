@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Run from anywhere: make the backend "app" package importable
+backend_path = Path(__file__).resolve().parents[1]
+if str(backend_path) not in sys.path:
+    sys.path.insert(0, str(backend_path))
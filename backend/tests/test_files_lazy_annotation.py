@@ -0,0 +1,67 @@
+import asyncio
+import sys
+import types
+from io import BytesIO
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from app.api import files  # noqa: E402
+from app.services.file_service import FileService  # noqa: E402
+
+
+class _EmptyMinio:
+    def list_objects(self, bucket_name, prefix=None):
+        return []
+
+
+def _minio_file_service():
+    service = FileService.__new__(FileService)
+    service.minio_available = True
+    service.minio_client = _EmptyMinio()
+    service.bucket_name = "imageflow-files"
+    return service
+
+
+def test_download_file_keeps_file_not_found_from_minio():
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(_minio_file_service().download_file("missing_detected.jpg"))
+
+
+def test_missing_detected_image_is_rendered_on_download(monkeypatch):
+    service = _minio_file_service()
+    rendered = {}
+
+    async def download_file(file_id):
+        if file_id not in rendered.values():
+            return await FileService.download_file(service, file_id)
+        return BytesIO(b"jpeg"), file_id, "image/jpeg"
+
+    class Executor:
+        async def render_annotations(self, execution_id, bucket):
+            rendered[execution_id] = f"{execution_id}_detected.jpg"
+            return rendered[execution_id]
+
+    executor_module = types.ModuleType("app.services.grpc_pipeline_executor")
+    executor_module.get_grpc_pipeline_executor = lambda: Executor()
+    monkeypatch.setitem(
+        sys.modules, "app.services.grpc_pipeline_executor", executor_module
+    )
+    monkeypatch.setattr(files, "file_service", service)
+    monkeypatch.setattr(service, "download_file", download_file)
+
+    stream, filename, content_type = asyncio.run(files._download("exec-1_detected.jpg"))
+
+    assert rendered == {"exec-1": "exec-1_detected.jpg"}
+    assert stream.read() == b"jpeg"
+    assert content_type == "image/jpeg"
+
+
+def test_other_missing_files_are_not_rendered(monkeypatch):
+    service = _minio_file_service()
+    monkeypatch.setattr(files, "file_service", service)
+    monkeypatch.setitem(sys.modules, "app.services.grpc_pipeline_executor", None)
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(files._download("exec-1_resized.jpg"))
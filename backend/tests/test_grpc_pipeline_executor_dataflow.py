@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("grpc")
+pytest.importorskip("pydantic")
+
+from app.services.grpc_pipeline_executor import GRPCPipelineExecutor  # noqa: E402
+
+
+class _Kafka:
+    def __init__(self):
+        self.messages = []
+
+    async def send_message(self, topic, message):
+        self.messages.append(message)
+
+
+def _executor(failing_steps):
+    executor = GRPCPipelineExecutor.__new__(GRPCPipelineExecutor)
+    executor.kafka_service = _Kafka()
+    executor.executed = []
+
+    async def execute_step(step, input_path, execution_id, output_id=None):
+        executor.executed.append(step["stepId"])
+        if step["stepId"] in failing_steps:
+            return {
+                "step_id": step["stepId"],
+                "component_name": step["componentName"],
+                "status": "failed",
+                "error": "service unavailable",
+            }
+        return {
+            "step_id": step["stepId"],
+            "component_name": step["componentName"],
+            "output_path": f"{output_id}_{step['componentName']}.jpg",
+            "status": "success",
+            "metadata": {},
+        }
+
+    executor._execute_step = execute_step
+    return executor
+
+
+PIPELINE = {
+    "steps": [
+        {"stepId": "resize", "componentName": "resize", "dependencies": []},
+        {"stepId": "filter", "componentName": "filter", "dependencies": ["resize"]},
+        {
+            "stepId": "detect",
+            "componentName": "ai_detection",
+            "dependencies": ["filter"],
+        },
+        {"stepId": "thumbnail", "componentName": "resize", "dependencies": []},
+    ],
+    "globalParameters": {"inputPath": "input.jpg"},
+}
+
+
+def test_failed_branch_fails_the_run_and_skips_its_dependents():
+    executor = _executor(failing_steps={"resize"})
+
+    result = asyncio.run(executor.execute_pipeline(PIPELINE, "exec-1"))
+
+    assert result["status"] == "failed"
+    assert result["error"] == "Step resize failed: service unavailable"
+    assert sorted(executor.executed) == ["resize", "thumbnail"]
+    statuses = {
+        step_id: step_result["status"]
+        for step_id, step_result in result["results"].items()
+    }
+    assert statuses == {
+        "resize": "failed",
+        "filter": "skipped",
+        "detect": "skipped",
+        "thumbnail": "success",
+    }
+
+
+def test_run_without_failures_completes():
+    executor = _executor(failing_steps=set())
+
+    result = asyncio.run(executor.execute_pipeline(PIPELINE, "exec-1"))
+
+    assert result["status"] == "completed"
+    assert all(r["status"] == "success" for r in result["results"].values())
@@ -199,6 +199,8 @@ fun RealtimeInspectionDesktop(
 
             val requests = kotlinx.coroutines.flow.MutableSharedFlow<CameraStream.VideoFrame>(extraBufferCapacity = 2)
             var latestJpeg: ByteArray? = null
+            // Frame ids for the server to echo back (0 would mean unnumbered)
+            var frameSequence = 0L
             val recvJob = launch(Dispatchers.IO) {
                 try {
                     stub.processVideoStream(requests).collect { resp ->
@@ -278,6 +280,7 @@ fun RealtimeInspectionDesktop(
                         .setFrameData(com.google.protobuf.ByteString.copyFrom(bytes))
                         .setTimestampMs(System.currentTimeMillis())
                         .setMetadata(meta)
+                        .setSequenceNumber(++frameSequence)
                         .build()
                     val ok = requests.tryEmit(vf)
                     if (!ok) {
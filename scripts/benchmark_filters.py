@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark every filter type of the filter service at 720p, 1080p and 4K:
+the former per-call implementation (kernels built per call, brightness and
+saturation through HSV with a float32 copy for saturation) against the
+current one (cached lookup tables applied with cv2.LUT for brightness,
+gamma and saturation, cached kernels, written in place into the decoded
+frame).
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+import cv2
+import numpy as np
+
+SERVICE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "services", "filter-grpc-app"
+)
+sys.path.append(os.path.join(SERVICE_DIR, "src"))
+sys.path.append(os.path.join(SERVICE_DIR, "generated", "python"))
+
+from imageflow.v1 import filter_pb2  # noqa: E402
+from filter_grpc_server import FilterServiceImplementation  # noqa: E402
+
+RESOLUTIONS = {"720p": (720, 1280), "1080p": (1080, 1920), "4k": (2160, 3840)}
+FILTERS = [
+    ("blur", filter_pb2.FILTER_TYPE_BLUR, 0.5),
+    ("gaussian", filter_pb2.FILTER_TYPE_GAUSSIAN, 0.5),
+    ("sharpen", filter_pb2.FILTER_TYPE_SHARPEN, 0.5),
+    ("brightness", filter_pb2.FILTER_TYPE_BRIGHTNESS, 0.7),
+    ("contrast", filter_pb2.FILTER_TYPE_CONTRAST, 1.3),
+    ("saturation", filter_pb2.FILTER_TYPE_SATURATION, 1.3),
+    ("gamma", filter_pb2.FILTER_TYPE_GAMMA, 1.8),
+]
+
+
+def legacy_filter(image, filter_type, intensity):
+    """FilterServiceImplementation._apply_filter before the lookup tables"""
+    if filter_type in (filter_pb2.FILTER_TYPE_BLUR, filter_pb2.FILTER_TYPE_GAUSSIAN):
+        kernel_size = int(intensity * 10) + 1
+        if kernel_size % 2 == 0:
+            kernel_size += 1
+        return cv2.blur(image, (kernel_size, kernel_size))
+    if filter_type == filter_pb2.FILTER_TYPE_SHARPEN:
+        kernel = np.array([[-1, -1, -1], [-1, 9 + intensity, -1], [-1, -1, -1]])
+        return cv2.filter2D(image, -1, kernel)
+    if filter_type == filter_pb2.FILTER_TYPE_BRIGHTNESS:
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        hsv[:, :, 2] = cv2.add(hsv[:, :, 2], int((intensity - 0.5) * 100))
+        return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+    if filter_type == filter_pb2.FILTER_TYPE_CONTRAST:
+        return cv2.convertScaleAbs(image, alpha=intensity, beta=0)
+    if filter_type == filter_pb2.FILTER_TYPE_SATURATION:
+        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV).astype(np.float32)
+        hsv[:, :, 1] = np.clip(hsv[:, :, 1] * intensity, 0, 255)
+        return cv2.cvtColor(hsv.astype(np.uint8), cv2.COLOR_HSV2BGR)
+    # Gamma did not exist; the usual per-call table is the baseline
+    table = np.array([255.0 * (i / 255.0) ** (1.0 / intensity) for i in range(256)])
+    return cv2.LUT(image, table.astype(np.uint8))
+
+
+def measure(fn, frame, iterations):
+    """Median ms per call; each call gets a fresh copy of the decoded frame"""
+    timings = []
+    for _ in range(iterations + 1):
+        image = frame.copy()
+        start = time.perf_counter()
+        fn(image)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings[1:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+
+    service = FilterServiceImplementation.__new__(FilterServiceImplementation)
+    rng = np.random.default_rng(0)
+
+    print(
+        f"{'resolution':<10} {'filter':<11} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}"
+    )
+    for label, (h, w) in RESOLUTIONS.items():
+        # Smooth synthetic frame, closer to camera content than pure noise
+        small = rng.integers(0, 255, (h // 16, w // 16, 3), dtype=np.uint8)
+        frame = cv2.resize(small, (w, h), interpolation=cv2.INTER_CUBIC)
+        for name, filter_type, intensity in FILTERS:
+            legacy = measure(
+                lambda image: legacy_filter(image, filter_type, intensity),
+                frame,
+                args.iterations,
+            )
+            current = measure(
+                lambda image: service._apply_filter(
+                    image, filter_type, intensity, {}, dst=image
+                ),
+                frame,
+                args.iterations,
+            )
+            print(
+                f"{label:<10} {name:<11} {legacy:>10.2f} {current:>11.2f} {legacy / current:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the AI detection inference backends (ultralytics / onnxruntime / triton)
+against each other on the same input images.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+import cv2
+import numpy as np
+
+sys.path.append(
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "services",
+        "ai-detection-grpc-app",
+        "src",
+    )
+)
+
+from inference_backends import BackendSelector  # noqa: E402
+
+
+def load_images(paths, count):
+    """Load benchmark images, or synthesise random frames if none are given"""
+    if paths:
+        images = [cv2.imread(p) for p in paths]
+        missing = [p for p, img in zip(paths, images) if img is None]
+        if missing:
+            raise SystemExit(f"Could not read images: {missing}")
+        return images
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def benchmark(backend, images, batch_size, iterations, warmup, conf, iou):
+    batches = [images[i : i + batch_size] for i in range(0, len(images), batch_size)]
+    for _ in range(warmup):
+        backend.infer(batches[0], conf, iou)
+
+    latencies = []
+    detections = 0
+    for _ in range(iterations):
+        for batch in batches:
+            start = time.perf_counter()
+            results = backend.infer(batch, conf, iou)
+            latencies.append((time.perf_counter() - start) * 1000 / len(batch))
+            detections += sum(len(r) for r in results)
+
+    latencies.sort()
+    return {
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "fps": 1000 / statistics.mean(latencies),
+        "avg_detections": detections / (iterations * len(images)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI detection backend benchmark")
+    parser.add_argument(
+        "images", nargs="*", help="Input images (default: random 1080p)"
+    )
+    parser.add_argument("--model", default="yolo", help="Request model name")
+    parser.add_argument(
+        "--backends",
+        default="ultralytics,onnxruntime",
+        help="Comma separated backends to compare",
+    )
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--random-count", type=int, default=4)
+    parser.add_argument("--conf", type=float, default=0.5)
+    parser.add_argument("--iou", type=float, default=0.45)
+    args = parser.parse_args()
+
+    images = load_images(args.images, args.random_count)
+    selector = BackendSelector()
+
+    print(
+        f"{'backend':<14}{'load ms':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'fps':>8}{'dets':>7}"
+    )
+    for name in args.backends.split(","):
+        name = name.strip()
+        weights_key = selector.registry_key(args.model).split(":", 1)[1]
+        try:
+            start = time.perf_counter()
+            backend = selector.create(f"{name}:{weights_key}")
+            load_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            print(f"{name:<14}unavailable: {e}")
+            continue
+
+        result = benchmark(
+            backend,
+            images,
+            args.batch_size,
+            args.iterations,
+            args.warmup,
+            args.conf,
+            args.iou,
+        )
+        print(
+            f"{name:<14}{load_ms:>10.1f}{result['mean_ms']:>10.2f}{result['p50_ms']:>10.2f}"
+            f"{result['p95_ms']:>10.2f}{result['fps']:>8.1f}{result['avg_detections']:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
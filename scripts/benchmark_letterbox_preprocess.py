@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark YOLO letterbox preprocessing in the backend Triton client: the
+former implementation (padded frame, float copy, transposed copy and batch
+array per call) against LetterboxPreprocessor with per-thread preallocated
+buffers. Reports time and allocations per frame (tracemalloc, which also
+sees NumPy/OpenCV array allocations).
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+)
+
+from app.services.triton_client import LetterboxPreprocessor  # noqa: E402
+
+RESOLUTIONS = {"720p": (720, 1280), "1080p": (1080, 1920), "4k": (2160, 3840)}
+
+
+def legacy_preprocess(image, target_size=(640, 640)):
+    """TritonYOLOClient._preprocess_image before the preallocated buffers"""
+    h, w = image.shape[:2]
+    target_w, target_h = target_size
+    scale = min(target_w / w, target_h / h)
+    new_w = int(w * scale)
+    new_h = int(h * scale)
+    resized_image = cv2.resize(image, (new_w, new_h))
+    pad_w = (target_w - new_w) // 2
+    pad_h = (target_h - new_h) // 2
+    padded_image = np.zeros((target_h, target_w, 3), dtype=np.uint8)
+    padded_image[pad_h : pad_h + new_h, pad_w : pad_w + new_w] = resized_image
+    input_image = padded_image.astype(np.float32) / 255.0
+    input_image = np.transpose(input_image, (2, 0, 1))
+    input_image = np.expand_dims(input_image, axis=0)
+    return input_image
+
+
+def measure_allocations(fn, image, frames):
+    """Average peak of memory allocated during one call, in bytes.
+
+    The result of the previous call is released before measuring, so only
+    the buffers a call allocates itself are counted.
+    """
+    fn(image)  # first call allocates the per-thread buffers
+    tracemalloc.start()
+    total = 0
+    for _ in range(frames):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = fn(image)
+        total += tracemalloc.get_traced_memory()[1] - current
+        del result
+    tracemalloc.stop()
+    return total / frames
+
+
+def measure_time(fn, image, frames):
+    fn(image)
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn(image)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def check_equivalent(image):
+    """The preallocated path must match the former output (up to pad colour and rounding)"""
+    tensor, (scale, pad_x, pad_y) = LetterboxPreprocessor()(image)
+    h, w = image.shape[:2]
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    expected = legacy_preprocess(image)
+    region = (
+        slice(None),
+        slice(None),
+        slice(pad_y, pad_y + new_h),
+        slice(pad_x, pad_x + new_w),
+    )
+    # legacy feeds BGR; the model expects RGB
+    diff = np.abs(tensor[region] - expected[:, ::-1][region])
+    return float(diff.max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    preprocessor = LetterboxPreprocessor()
+    implementations = {
+        # The legacy result is a transposed view; serialising the request
+        # (tobytes / copy into shared memory) materialises it
+        "legacy": lambda image: np.ascontiguousarray(legacy_preprocess(image)),
+        "preallocated": lambda image: preprocessor(image)[0],
+    }
+
+    print(f"{'resolution':<10} {'impl':<13} {'ms/frame':>9} {'allocated MB/frame':>19}")
+    for label, (h, w) in RESOLUTIONS.items():
+        image = rng.integers(0, 255, (h, w, 3), dtype=np.uint8)
+        print(
+            f"{label:<10} max |diff| vs legacy inside the letterbox: {check_equivalent(image):.4f}"
+        )
+        for name, fn in implementations.items():
+            ms = measure_time(fn, image, args.frames)
+            allocated = measure_allocations(fn, image, max(args.frames // 10, 1))
+            print(f"{label:<10} {name:<13} {ms:>9.2f} {allocated / 1e6:>19.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+"""
+Measure the CPU time a camera stream frame costs in the resize -> AI
+detection -> filter stages with JPEG between the stages (every service
+decodes its input and encodes its output) against raw BGR pixels between
+them (RAW_BGR8: only the first service decodes and the camera stream
+service encodes the response once).
+
+The real resize and filter servicers and the camera stream stage code run
+in-process; requests and responses are serialized and parsed as they would
+be on the wire. Model inference costs the same either way, so the detection
+stage only turns its input into pixels.
+
+Run it with the malloc settings of the service images, e.g.
+MALLOC_MMAP_THRESHOLD_=33554432 MALLOC_TRIM_THRESHOLD_=134217728: without
+them every frame-sized buffer is freshly mapped and page-faulted, which
+costs more than the decoding and encoding raw transport saves.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import statistics
+
+import cv2
+import numpy as np
+
+SERVICES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "services"
+)
+sys.path.append(os.path.join(SERVICES_DIR, "camera-stream-grpc-app", "src"))
+sys.path.append(os.path.join(SERVICES_DIR, "resize-grpc-app", "src"))
+sys.path.append(os.path.join(SERVICES_DIR, "filter-grpc-app", "src"))
+sys.path.append(
+    os.path.join(SERVICES_DIR, "camera-stream-grpc-app", "generated", "python")
+)
+
+from imageflow.v1 import ai_detection_pb2, camera_stream_pb2, common_pb2  # noqa: E402
+from imageflow.v1 import filter_pb2  # noqa: E402
+from camera_stream_grpc_server import CameraStreamProcessorImplementation  # noqa: E402
+from resize_grpc_server import ResizeServiceImplementation  # noqa: E402
+from filter_grpc_server import FilterServiceImplementation  # noqa: E402
+from image_io import decode_image_bytes  # noqa: E402
+
+STAGES = ("resize", "ai_detection", "filter", "encode")
+
+
+class WireStub:
+    """Calls a servicer in-process with the request and response passed
+    through protobuf serialization, like a gRPC channel would"""
+
+    def __init__(self, servicer):
+        self.servicer = servicer
+
+    def __getattr__(self, method):
+        def call(request, timeout=None):
+            request = type(request).FromString(request.SerializeToString())
+            response = getattr(self.servicer, method)(request, None)
+            return type(response).FromString(response.SerializeToString())
+
+        return call
+
+
+class DecodeOnlyDetection:
+    def DetectObjects(self, request, timeout=None):
+        decode_image_bytes(request.input_bytes)
+        response = ai_detection_pb2.DetectionResponse()
+        response.result.status = common_pb2.PROCESSING_STATUS_COMPLETED
+        return response
+
+
+def camera_service(raw_transport):
+    resize = ResizeServiceImplementation.__new__(ResizeServiceImplementation)
+    resize.derivative_cache = None
+    service = CameraStreamProcessorImplementation.__new__(
+        CameraStreamProcessorImplementation
+    )
+    service.raw_transport = raw_transport
+    service.clients = {
+        "resize": WireStub(resize),
+        "ai_detection": WireStub(DecodeOnlyDetection()),
+        "filter": WireStub(
+            FilterServiceImplementation.__new__(FilterServiceImplementation)
+        ),
+    }
+    service.grpc_services = {name: {"timeout": 30.0} for name in service.clients}
+    return service
+
+
+def measure(service, frame, components, iterations):
+    """Median CPU ms per stage and per frame"""
+    stage_ms = {stage: [] for stage in STAGES}
+    totals = []
+    for _ in range(iterations + 1):
+        task = type("Task", (), {})()
+        task.request = frame
+        task.components = components
+        task.detections = []
+        task.current_image = common_pb2.ImageBytes(
+            data=frame.frame_data,
+            format="JPEG",
+            width=frame.metadata.width,
+            height=frame.metadata.height,
+        )
+        total = 0.0
+        for stage in STAGES:
+            start = time.process_time()
+            service._run_frame_stage(stage, task)
+            elapsed = (time.process_time() - start) * 1000
+            stage_ms[stage].append(elapsed)
+            total += elapsed
+        totals.append(total)
+    return (
+        {stage: statistics.median(values[1:]) for stage, values in stage_ms.items()},
+        statistics.median(totals[1:]),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--target-width", type=int, default=1920)
+    parser.add_argument("--target-height", type=int, default=1080)
+    parser.add_argument("--noise", type=float, default=3.0)
+    args = parser.parse_args()
+    # The services log every request
+    logging.disable(logging.INFO)
+
+    # Smooth synthetic 1080p frame with some sensor noise, so it compresses
+    # about as well as camera footage
+    rng = np.random.default_rng(0)
+    small = rng.integers(0, 255, (1080 // 16, 1920 // 16, 3), dtype=np.uint8)
+    pixels = cv2.resize(small, (1920, 1080), interpolation=cv2.INTER_CUBIC)
+    noise = rng.normal(0, args.noise, pixels.shape)
+    pixels = np.clip(pixels + noise, 0, 255).astype(np.uint8)
+    frame = camera_stream_pb2.VideoFrame(
+        frame_data=cv2.imencode(".jpg", pixels, [cv2.IMWRITE_JPEG_QUALITY, 85])[
+            1
+        ].tobytes()
+    )
+    frame.metadata.width, frame.metadata.height = 1920, 1080
+
+    components = [
+        {
+            "component_type": "resize",
+            "parameters": {"width": args.target_width, "height": args.target_height},
+        },
+        {"component_type": "ai_detection", "parameters": {}},
+        {
+            "component_type": "filter",
+            "parameters": {
+                "filter_type": filter_pb2.FILTER_TYPE_BRIGHTNESS,
+                "intensity": "0.7",
+            },
+        },
+    ]
+
+    print(
+        f"1080p frame, resize to {args.target_width}x{args.target_height}, CPU ms per frame"
+    )
+    print(
+        f"{'transport':<10} "
+        + " ".join(f"{stage:>12}" for stage in STAGES)
+        + f" {'total':>8}"
+    )
+    results = {}
+    for label, raw_transport in (("jpeg", False), ("raw", True)):
+        stages, total = measure(
+            camera_service(raw_transport), frame, components, args.iterations
+        )
+        results[label] = total
+        print(
+            f"{label:<10} "
+            + " ".join(f"{stages[stage]:>12.2f}" for stage in STAGES)
+            + f" {total:>8.2f}"
+        )
+    saved = results["jpeg"] - results["raw"]
+    print(f"saved {saved:.2f} ms CPU per frame ({saved / results['jpeg']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
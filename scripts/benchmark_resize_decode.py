@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the resize service decode path on camera stills: full-resolution
+decode + cv2.resize against the DCT-domain reduced decode
+(IMREAD_REDUCED_COLOR_2/4/8) chosen for each target size.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+import cv2
+import numpy as np
+
+sys.path.append(
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "services",
+        "resize-grpc-app",
+        "src",
+    )
+)
+
+from image_io import (  # noqa: E402
+    REDUCED_DECODE_FLAGS,
+    decode_image,
+    encode_image,
+    jpeg_dimensions,
+    reduced_decode_factor,
+)
+
+TARGETS = [(320, 240), (640, 480), (1280, 960), (1920, 1440)]
+
+
+def load_still(path, size):
+    if path:
+        with open(path, "rb") as f:
+            return f.read()
+    # Smooth synthetic 12MP frame; pure noise would make JPEG decode atypically slow
+    width, height = size
+    rng = np.random.default_rng(0)
+    small = rng.integers(0, 255, (height // 16, width // 16, 3), dtype=np.uint8)
+    image = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    return encode_image(image, ".jpg", 92)
+
+
+def run(data, target, reduced):
+    flags = cv2.IMREAD_COLOR
+    if reduced:
+        factor = reduced_decode_factor(jpeg_dimensions(data), target)
+        flags = REDUCED_DECODE_FLAGS.get(factor, cv2.IMREAD_COLOR)
+
+    start = time.perf_counter()
+    image = decode_image(data, flags)
+    decoded = time.perf_counter()
+    resized = cv2.resize(image, target, interpolation=cv2.INTER_AREA)
+    resize_done = time.perf_counter()
+    encode_image(resized, ".jpg", 85)
+    end = time.perf_counter()
+    return (
+        (decoded - start) * 1000,
+        (resize_done - decoded) * 1000,
+        (end - resize_done) * 1000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--image", help="JPEG still to use (default: synthetic 12MP)")
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    data = load_still(args.image, (4000, 3000))
+    width, height = jpeg_dimensions(data)
+    print(f"Source {width}x{height}, {len(data) / 1e6:.1f} MB")
+    print(
+        f"{'target':<11} {'mode':<8} {'factor':>6} {'decode ms':>10} {'resize ms':>10} {'encode ms':>10} {'total ms':>9}"
+    )
+    for target in TARGETS:
+        for reduced in (False, True):
+            phases = [run(data, target, reduced) for _ in range(args.iterations)]
+            decode, resize, encode = (statistics.median(p) for p in zip(*phases))
+            factor = reduced_decode_factor((width, height), target) if reduced else 1
+            print(
+                f"{'x'.join(map(str, target)):<11} {'reduced' if reduced else 'full':<8} {factor:>6} "
+                f"{decode:>10.1f} {resize:>10.1f} {encode:>10.1f} {decode + resize + encode:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
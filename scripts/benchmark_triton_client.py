@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the backend Triton client transports against each other: gRPC with
+system shared memory, binary gRPC and the HTTP client, at several levels of
+request concurrency.
+
+Runs against a real Triton server, or against scripts/fake_triton_server.py
+which is started in-process with --fake.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+import cv2
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(os.path.join(ROOT, "backend"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.triton_client import TritonYOLOClient  # noqa: E402
+
+TRANSPORTS = {
+    "grpc+shm": {"protocol": "grpc", "shared_memory": "system"},
+    "grpc": {"protocol": "grpc", "shared_memory": "none"},
+    "http": {"protocol": "http", "shared_memory": "none"},
+}
+
+
+def write_image(directory, shape=(1080, 1920, 3)):
+    rng = np.random.default_rng(0)
+    path = os.path.join(directory, "frame.jpg")
+    cv2.imwrite(path, rng.integers(0, 255, shape, dtype=np.uint8))
+    return path
+
+
+async def run_transport(name, url, image_path, concurrency, requests):
+    client = TritonYOLOClient(
+        triton_url=url, shared_memory_slots=concurrency, **TRANSPORTS[name]
+    )
+    try:
+        if not await client.connect():
+            raise SystemExit(f"Model is not ready at {url}")
+        if name == "grpc+shm" and not client.uses_shared_memory:
+            return None
+
+        latencies = []
+
+        async def worker(count):
+            for _ in range(count):
+                start = time.perf_counter()
+                await client._triton_detect_objects(image_path, 0.5, 0.45)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await worker(2)  # warm-up
+        latencies.clear()
+
+        per_worker = max(requests // concurrency, 1)
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    finally:
+        # Unregisters and removes the shared memory regions on every path
+        await client.close()
+
+    latencies.sort()
+    return {
+        "mean_ms": statistics.mean(latencies),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)],
+        "throughput": len(latencies) / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--grpc-url", default="localhost:8001")
+    parser.add_argument("--http-url", default="localhost:8000")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--transports", nargs="+", default=list(TRANSPORTS))
+    parser.add_argument(
+        "--fake", action="store_true", help="start the fake Triton server in-process"
+    )
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    servers = None
+    if args.fake:
+        import fake_triton_server
+
+        grpc_port = int(args.grpc_url.rsplit(":", 1)[1])
+        http_port = int(args.http_url.rsplit(":", 1)[1])
+        # Keep a reference: the gRPC server stops when garbage collected
+        servers = fake_triton_server.serve(
+            grpc_port, http_port, args.delay_ms, workers=16
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        image_path = write_image(directory)
+        print(
+            f"{'transport':<10} {'conc':>4} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'req/s':>8}"
+        )
+        for concurrency in args.concurrency:
+            for name in args.transports:
+                url = args.http_url if name == "http" else args.grpc_url
+                result = asyncio.run(
+                    run_transport(name, url, image_path, concurrency, args.requests)
+                )
+                if result is None:
+                    print(f"{name:<10} {concurrency:>4}  shared memory unavailable")
+                    continue
+                print(
+                    f"{name:<10} {concurrency:>4} {result['mean_ms']:>9.2f} "
+                    f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+                    f"{result['throughput']:>8.1f}"
+                )
+
+    if servers is not None:
+        servers[1].shutdown()
+        servers[0].stop(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+"""
+Microbenchmark of YOLO postprocessing in the AI detection service: the former
+list-based path (cv2.dnn.NMSBoxes + per-detection dicts + one Detection message
+per box) against the vectorized path (NumPy NMS + DetectionArrays + packed
+DetectionBatch) on synthetic [84, 8400] outputs.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+import cv2
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(os.path.join(ROOT, "services", "ai-detection-grpc-app", "src"))
+sys.path.append(
+    os.path.join(ROOT, "services", "ai-detection-grpc-app", "generated", "python")
+)
+
+from imageflow.v1 import ai_detection_pb2  # noqa: E402
+from yolo_processing import (  # noqa: E402
+    COCO_CLASS_NAMES,
+    YOLO_INPUT_SIZE,
+    DetectionArrays,
+    postprocess,
+)
+
+IMAGE_SHAPE = (1080, 1920, 3)
+
+
+def synthetic_prediction(num_boxes, rng, num_classes=80, num_anchors=8400):
+    """Raw YOLO output with num_boxes anchors above threshold, mostly non-overlapping"""
+    prediction = np.zeros((4 + num_classes, num_anchors), dtype=np.float32)
+    prediction[4:] = rng.uniform(0, 0.2, (num_classes, num_anchors))
+    anchors = rng.choice(num_anchors, num_boxes, replace=False)
+    prediction[0, anchors] = rng.uniform(20, YOLO_INPUT_SIZE - 20, num_boxes)
+    prediction[1, anchors] = rng.uniform(100, YOLO_INPUT_SIZE - 100, num_boxes)
+    prediction[2, anchors] = rng.uniform(4, 24, num_boxes)
+    prediction[3, anchors] = rng.uniform(4, 24, num_boxes)
+    prediction[4 + rng.integers(0, num_classes, num_boxes), anchors] = rng.uniform(
+        0.6, 0.99, num_boxes
+    )
+    return prediction
+
+
+def letterbox_transform(image_shape):
+    h, w = image_shape[:2]
+    scale = min(YOLO_INPUT_SIZE / w, YOLO_INPUT_SIZE / h)
+    pad_x = (YOLO_INPUT_SIZE - int(round(w * scale))) // 2
+    pad_y = (YOLO_INPUT_SIZE - int(round(h * scale))) // 2
+    return scale, pad_x, pad_y
+
+
+def legacy_path(prediction, transform, conf, iou):
+    """Per-box Python postprocessing as the service did before vectorization"""
+    scale, pad_x, pad_y = transform
+    output = prediction.T
+    scores = np.max(output[:, 4:], axis=1)
+    valid = output[scores > conf]
+    valid_scores = scores[scores > conf]
+    class_ids = np.argmax(valid[:, 4:], axis=1)
+
+    boxes = []
+    for cx, cy, w, h in valid[:, :4]:
+        boxes.append([float(cx - w / 2), float(cy - h / 2), float(w), float(h)])
+    indices = cv2.dnn.NMSBoxesBatched(
+        boxes, valid_scores.tolist(), class_ids.tolist(), conf, iou
+    )
+
+    detections = []
+    for i in np.array(indices).flatten():
+        x, y, w, h = boxes[i]
+        x1, y1 = (x - pad_x) / scale, (y - pad_y) / scale
+        detections.append(
+            {
+                "class_name": COCO_CLASS_NAMES[int(class_ids[i])],
+                "confidence": float(valid_scores[i]),
+                "class_id": int(class_ids[i]),
+                "bbox": {
+                    "x1": x1,
+                    "y1": y1,
+                    "x2": x1 + w / scale,
+                    "y2": y1 + h / scale,
+                },
+            }
+        )
+
+    response = ai_detection_pb2.DetectionResponse()
+    for det in detections:
+        response.detections.append(
+            ai_detection_pb2.Detection(
+                class_name=det["class_name"],
+                confidence=det["confidence"],
+                bbox=ai_detection_pb2.BoundingBox(**det["bbox"]),
+            )
+        )
+    return response.SerializeToString()
+
+
+def vectorized_path(prediction, transform, conf, iou):
+    detections = DetectionArrays(
+        *postprocess(prediction, transform, IMAGE_SHAPE, conf, iou), COCO_CLASS_NAMES
+    )
+    response = ai_detection_pb2.DetectionResponse()
+    batch = response.detection_batch
+    batch.boxes.extend(detections.boxes.ravel())
+    batch.scores.extend(detections.scores)
+    batch.class_ids.extend(detections.class_ids)
+    batch.class_names.update(detections.labels())
+    return response.SerializeToString()
+
+
+def measure(fn, iterations, *args):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        payload = fn(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.mean(timings), timings[int(len(timings) * 0.95) - 1], len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YOLO postprocess microbenchmark")
+    parser.add_argument("--boxes", default="10,100,1000")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--conf", type=float, default=0.5)
+    parser.add_argument("--iou", type=float, default=0.45)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    transform = letterbox_transform(IMAGE_SHAPE)
+
+    print(
+        f"{'boxes':>6}{'path':>12}{'mean ms':>10}{'p95 ms':>10}{'bytes':>9}{'speedup':>9}"
+    )
+    for num_boxes in (int(n) for n in args.boxes.split(",")):
+        prediction = synthetic_prediction(num_boxes, rng)
+        fn_args = (prediction, transform, args.conf, args.iou)
+        legacy = measure(legacy_path, args.iterations, *fn_args)
+        vectorized = measure(vectorized_path, args.iterations, *fn_args)
+        for name, (mean_ms, p95_ms, size) in (
+            ("legacy", legacy),
+            ("vectorized", vectorized),
+        ):
+            print(
+                f"{num_boxes:>6}{name:>12}{mean_ms:>10.3f}{p95_ms:>10.3f}{size:>9}"
+                f"{legacy[0] / mean_ms:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
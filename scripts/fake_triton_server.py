@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+
+"""
+Minimal stand-in for a Triton Inference Server serving the "yolo" model, for
+exercising and benchmarking the backend Triton client without a GPU node.
+
+Speaks the KServe v2 gRPC protocol (including system shared memory regions)
+and the HTTP protocol (JSON header + binary tensor extension). Every request
+returns the same synthetic [1, 84, 8400] output; --delay-ms simulates model
+execution time.
+"""
+
+import json
+import time
+import argparse
+import threading
+from concurrent import futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import resource_tracker, shared_memory
+
+import grpc
+import numpy as np
+from tritonclient.grpc import service_pb2, service_pb2_grpc
+
+MODEL_NAME = "yolo"
+INPUT_NAME = "images"
+OUTPUT_NAME = "output0"
+INPUT_SHAPE = [1, 3, 640, 640]
+OUTPUT_SHAPE = [1, 84, 8400]
+
+
+def synthetic_output(num_boxes=20, seed=0):
+    """YOLO output with num_boxes confident anchors spread over the input"""
+    rng = np.random.default_rng(seed)
+    output = np.zeros(OUTPUT_SHAPE, dtype=np.float32)
+    output[0, 4:] = rng.uniform(0, 0.1, (80, OUTPUT_SHAPE[2]))
+    anchors = rng.choice(OUTPUT_SHAPE[2], num_boxes, replace=False)
+    output[0, 0, anchors] = rng.uniform(40, 600, num_boxes)
+    output[0, 1, anchors] = rng.uniform(40, 600, num_boxes)
+    output[0, 2, anchors] = rng.uniform(20, 80, num_boxes)
+    output[0, 3, anchors] = rng.uniform(20, 80, num_boxes)
+    output[0, 4 + rng.integers(0, 80, num_boxes), anchors] = rng.uniform(
+        0.6, 0.95, num_boxes
+    )
+    return output
+
+
+class SharedMemoryRegions:
+    """System shared memory regions registered by clients"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._regions = {}  # name -> (key, offset, byte_size, SharedMemory)
+
+    def register(self, name, key, offset, byte_size):
+        segment = shared_memory.SharedMemory(name=key.lstrip("/"))
+        # The client owns the segment; do not let this process unlink it on exit
+        resource_tracker.unregister(segment._name, "shared_memory")
+        with self._lock:
+            if name in self._regions:
+                segment.close()
+                raise KeyError(f"shared memory region '{name}' already registered")
+            self._regions[name] = (key, offset, byte_size, segment)
+
+    def unregister(self, name=None):
+        with self._lock:
+            names = [name] if name else list(self._regions)
+            for region_name in names:
+                region = self._regions.pop(region_name, None)
+                if region is not None:
+                    region[3].close()
+
+    def view(self, name, byte_size, offset=0):
+        with self._lock:
+            _, base_offset, region_size, segment = self._regions[name]
+        start = base_offset + offset
+        if offset + byte_size > region_size:
+            raise ValueError(f"shared memory region '{name}' is too small")
+        return segment.buf[start : start + byte_size]
+
+    def status(self):
+        with self._lock:
+            return {
+                name: (key, offset, size)
+                for name, (key, offset, size, _) in self._regions.items()
+            }
+
+
+def _shm_params(parameters):
+    if "shared_memory_region" not in parameters:
+        return None
+    return (
+        parameters["shared_memory_region"].string_param,
+        parameters["shared_memory_byte_size"].int64_param,
+        (
+            parameters["shared_memory_offset"].int64_param
+            if "shared_memory_offset" in parameters
+            else 0
+        ),
+    )
+
+
+class FakeTritonServicer(service_pb2_grpc.GRPCInferenceServiceServicer):
+    def __init__(self, output, regions, delay_seconds):
+        self.output = output
+        self.output_bytes = output.tobytes()
+        self.regions = regions
+        self.delay_seconds = delay_seconds
+        self.input_byte_size = int(np.prod(INPUT_SHAPE)) * 4
+
+    def ServerLive(self, request, context):
+        return service_pb2.ServerLiveResponse(live=True)
+
+    def ServerReady(self, request, context):
+        return service_pb2.ServerReadyResponse(ready=True)
+
+    def ModelReady(self, request, context):
+        return service_pb2.ModelReadyResponse(ready=request.name == MODEL_NAME)
+
+    def ModelMetadata(self, request, context):
+        return service_pb2.ModelMetadataResponse(
+            name=MODEL_NAME,
+            versions=["1"],
+            platform="onnxruntime_onnx",
+            inputs=[
+                service_pb2.ModelMetadataResponse.TensorMetadata(
+                    name=INPUT_NAME, datatype="FP32", shape=INPUT_SHAPE
+                )
+            ],
+            outputs=[
+                service_pb2.ModelMetadataResponse.TensorMetadata(
+                    name=OUTPUT_NAME, datatype="FP32", shape=OUTPUT_SHAPE
+                )
+            ],
+        )
+
+    def ModelInfer(self, request, context):
+        if request.model_name != MODEL_NAME:
+            context.abort(
+                grpc.StatusCode.NOT_FOUND, f"unknown model {request.model_name}"
+            )
+
+        # Touch the input like a real backend would, wherever it was sent
+        tensor = request.inputs[0]
+        shm_input = _shm_params(tensor.parameters)
+        if shm_input is not None:
+            region, byte_size, offset = shm_input
+            data = self.regions.view(region, byte_size, offset)
+        else:
+            data = request.raw_input_contents[0]
+        if len(data) != self.input_byte_size:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "unexpected input size")
+        np.frombuffer(data, dtype=np.float32, count=16).sum()
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+
+        response = service_pb2.ModelInferResponse(
+            model_name=MODEL_NAME, model_version="1", id=request.id
+        )
+        output = response.outputs.add()
+        output.name = OUTPUT_NAME
+        output.datatype = "FP32"
+        output.shape.extend(OUTPUT_SHAPE)
+
+        requested = request.outputs[0] if request.outputs else None
+        shm_output = _shm_params(requested.parameters) if requested else None
+        if shm_output is not None:
+            region, byte_size, offset = shm_output
+            self.regions.view(region, len(self.output_bytes), offset)[
+                :
+            ] = self.output_bytes
+            output.parameters["shared_memory_region"].string_param = region
+            output.parameters["shared_memory_byte_size"].int64_param = byte_size
+        else:
+            response.raw_output_contents.append(self.output_bytes)
+        return response
+
+    def SystemSharedMemoryRegister(self, request, context):
+        try:
+            self.regions.register(
+                request.name, request.key, request.offset, request.byte_size
+            )
+        except (FileNotFoundError, KeyError) as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+        return service_pb2.SystemSharedMemoryRegisterResponse()
+
+    def SystemSharedMemoryUnregister(self, request, context):
+        self.regions.unregister(request.name)
+        return service_pb2.SystemSharedMemoryUnregisterResponse()
+
+    def SystemSharedMemoryStatus(self, request, context):
+        response = service_pb2.SystemSharedMemoryStatusResponse()
+        for name, (key, offset, size) in self.regions.status().items():
+            if request.name and request.name != name:
+                continue
+            region = response.regions[name]
+            region.name, region.key = name, key
+            region.offset, region.byte_size = offset, size
+        return response
+
+
+def make_http_handler(output_bytes, delay_seconds):
+    class FakeTritonHTTPHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _reply(self, status, body=b"", headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path in ("/v2/health/live", "/v2/health/ready"):
+                self._reply(200)
+            elif self.path.startswith(
+                f"/v2/models/{MODEL_NAME}"
+            ) and self.path.endswith("/ready"):
+                self._reply(200)
+            else:
+                self._reply(404)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if not (
+                self.path.startswith(f"/v2/models/{MODEL_NAME}")
+                and self.path.endswith("/infer")
+            ):
+                self._reply(404)
+                return
+            header_length = int(
+                self.headers.get("Inference-Header-Content-Length", len(body))
+            )
+            request = json.loads(body[:header_length])
+            if delay_seconds:
+                time.sleep(delay_seconds)
+
+            header = json.dumps(
+                {
+                    "model_name": MODEL_NAME,
+                    "model_version": "1",
+                    "id": request.get("id", ""),
+                    "outputs": [
+                        {
+                            "name": OUTPUT_NAME,
+                            "datatype": "FP32",
+                            "shape": OUTPUT_SHAPE,
+                            "parameters": {"binary_data_size": len(output_bytes)},
+                        }
+                    ],
+                }
+            ).encode("utf-8")
+            self._reply(
+                200,
+                header + output_bytes,
+                {
+                    "Content-Type": "application/octet-stream",
+                    "Inference-Header-Content-Length": str(len(header)),
+                },
+            )
+
+    return FakeTritonHTTPHandler
+
+
+def serve(grpc_port, http_port, delay_ms, workers):
+    output = synthetic_output()
+    delay_seconds = delay_ms / 1000.0
+
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=workers),
+        options=[
+            ("grpc.max_send_message_length", -1),
+            ("grpc.max_receive_message_length", -1),
+        ],
+    )
+    service_pb2_grpc.add_GRPCInferenceServiceServicer_to_server(
+        FakeTritonServicer(output, SharedMemoryRegions(), delay_seconds), server
+    )
+    server.add_insecure_port(f"0.0.0.0:{grpc_port}")
+    server.start()
+
+    http_server = ThreadingHTTPServer(
+        ("0.0.0.0", http_port), make_http_handler(output.tobytes(), delay_seconds)
+    )
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    print(f"Fake Triton serving '{MODEL_NAME}' on grpc :{grpc_port}, http :{http_port}")
+    return server, http_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--grpc-port", type=int, default=8001)
+    parser.add_argument("--http-port", type=int, default=8000)
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server, http_server = serve(
+        args.grpc_port, args.http_port, args.delay_ms, args.workers
+    )
+    try:
+        server.wait_for_termination()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http_server.shutdown()
+        server.stop(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from imageflow.v1 import common_pb2 as imageflow_dot_v1_dot_common__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x19imageflow/v1/filter.proto\x12\x0cimageflow.v1\x1a\x19imageflow/v1/common.proto\"\xc5\x02\n\rFilterRequest\x12.\n\x0binput_image\x18\x01 \x01(\x0b\x32\x17.imageflow.v1.ImageDataH\x00\x12/\n\x0binput_bytes\x18\x06 \x01(\x0b\x32\x18.imageflow.v1.ImageBytesH\x00\x12-\n\x0b\x66ilter_type\x18\x02 \x01(\x0e\x32\x18.imageflow.v1.FilterType\x12\x11\n\tintensity\x18\x03 \x01(\x02\x12?\n\nparameters\x18\x04 \x03(\x0b\x32+.imageflow.v1.FilterRequest.ParametersEntry\x12\x14\n\x0c\x65xecution_id\x18\x05 \x01(\t\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\x07\n\x05input\"p\n\x0e\x46ilterResponse\x12.\n\x06result\x18\x01 \x01(\x0b\x32\x1e.imageflow.v1.ProcessingResult\x12.\n\x08metadata\x18\x02 \x01(\x0b\x32\x1c.imageflow.v1.FilterMetadata\"\xdd\x01\n\x0e\x46ilterMetadata\x12-\n\x0b\x66ilter_type\x18\x01 \x01(\x0e\x32\x18.imageflow.v1.FilterType\x12\x11\n\tintensity\x18\x02 \x01(\x02\x12O\n\x12\x61pplied_parameters\x18\x03 \x03(\x0b\x32\x33.imageflow.v1.FilterMetadata.AppliedParametersEntry\x1a\x38\n\x16\x41ppliedParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01*\xc4\x01\n\nFilterType\x12\x1b\n\x17\x46ILTER_TYPE_UNSPECIFIED\x10\x00\x12\x14\n\x10\x46ILTER_TYPE_BLUR\x10\x01\x12\x17\n\x13\x46ILTER_TYPE_SHARPEN\x10\x02\x12\x1a\n\x16\x46ILTER_TYPE_BRIGHTNESS\x10\x03\x12\x18\n\x14\x46ILTER_TYPE_CONTRAST\x10\x04\x12\x1a\n\x16\x46ILTER_TYPE_SATURATION\x10\x05\x12\x18\n\x14\x46ILTER_TYPE_GAUSSIAN\x10\x06\x32\xfc\x01\n\rFilterService\x12H\n\x0b\x41pplyFilter\x12\x1b.imageflow.v1.FilterRequest\x1a\x1c.imageflow.v1.FilterResponse\x12R\n\x11\x41pplyFilterStream\x12\x1b.imageflow.v1.FilterRequest\x1a\x1c.imageflow.v1.FilterResponse(\x01\x30\x01\x12M\n\x06Health\x12 .imageflow.v1.HealthCheckRequest\x1a!.imageflow.v1.HealthCheckResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x19imageflow/v1/filter.proto\x12\x0cimageflow.v1\x1a\x19imageflow/v1/common.proto\"\xdc\x02\n\rFilterRequest\x12.\n\x0binput_image\x18\x01 \x01(\x0b\x32\x17.imageflow.v1.ImageDataH\x00\x12/\n\x0binput_bytes\x18\x06 \x01(\x0b\x32\x18.imageflow.v1.ImageBytesH\x00\x12-\n\x0b\x66ilter_type\x18\x02 \x01(\x0e\x32\x18.imageflow.v1.FilterType\x12\x11\n\tintensity\x18\x03 \x01(\x02\x12?\n\nparameters\x18\x04 \x03(\x0b\x32+.imageflow.v1.FilterRequest.ParametersEntry\x12\x14\n\x0c\x65xecution_id\x18\x05 \x01(\t\x12\x15\n\routput_format\x18\x07 \x01(\t\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\x07\n\x05input\"p\n\x0e\x46ilterResponse\x12.\n\x06result\x18\x01 \x01(\x0b\x32\x1e.imageflow.v1.ProcessingResult\x12.\n\x08metadata\x18\x02 \x01(\x0b\x32\x1c.imageflow.v1.FilterMetadata\"\xf9\x01\n\x0e\x46ilterMetadata\x12-\n\x0b\x66ilter_type\x18\x01 \x01(\x0e\x32\x18.imageflow.v1.FilterType\x12\x11\n\tintensity\x18\x02 \x01(\x02\x12O\n\x12\x61pplied_parameters\x18\x03 \x03(\x0b\x32\x33.imageflow.v1.FilterMetadata.AppliedParametersEntry\x12\x1a\n\x12processing_time_ms\x18\x04 \x01(\x01\x1a\x38\n\x16\x41ppliedParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xbf\x01\n\nFilterStep\x12-\n\x0b\x66ilter_type\x18\x01 \x01(\x0e\x32\x18.imageflow.v1.FilterType\x12\x11\n\tintensity\x18\x02 \x01(\x02\x12<\n\nparameters\x18\x03 \x03(\x0b\x32(.imageflow.v1.FilterStep.ParametersEntry\x1a\x31\n\x0fParametersEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd4\x01\n\x12\x46ilterChainRequest\x12.\n\x0binput_image\x18\x01 \x01(\x0b\x32\x17.imageflow.v1.ImageDataH\x00\x12/\n\x0binput_bytes\x18\x02 \x01(\x0b\x32\x18.imageflow.v1.ImageBytesH\x00\x12\'\n\x05steps\x18\x03 \x03(\x0b\x32\x18.imageflow.v1.FilterStep\x12\x14\n\x0c\x65xecution_id\x18\x04 \x01(\t\x12\x15\n\routput_format\x18\x05 \x01(\tB\x07\n\x05input\"r\n\x13\x46ilterChainResponse\x12.\n\x06result\x18\x01 \x01(\x0b\x32\x1e.imageflow.v1.ProcessingResult\x12+\n\x05steps\x18\x02 \x03(\x0b\x32\x1c.imageflow.v1.FilterMetadata*\xdb\x01\n\nFilterType\x12\x1b\n\x17\x46ILTER_TYPE_UNSPECIFIED\x10\x00\x12\x14\n\x10\x46ILTER_TYPE_BLUR\x10\x01\x12\x17\n\x13\x46ILTER_TYPE_SHARPEN\x10\x02\x12\x1a\n\x16\x46ILTER_TYPE_BRIGHTNESS\x10\x03\x12\x18\n\x14\x46ILTER_TYPE_CONTRAST\x10\x04\x12\x1a\n\x16\x46ILTER_TYPE_SATURATION\x10\x05\x12\x18\n\x14\x46ILTER_TYPE_GAUSSIAN\x10\x06\x12\x15\n\x11\x46ILTER_TYPE_GAMMA\x10\x07\x32\xd5\x02\n\rFilterService\x12H\n\x0b\x41pplyFilter\x12\x1b.imageflow.v1.FilterRequest\x1a\x1c.imageflow.v1.FilterResponse\x12R\n\x11\x41pplyFilterStream\x12\x1b.imageflow.v1.FilterRequest\x1a\x1c.imageflow.v1.FilterResponse(\x01\x30\x01\x12W\n\x10\x41pplyFilterChain\x12 .imageflow.v1.FilterChainRequest\x1a!.imageflow.v1.FilterChainResponse\x12M\n\x06Health\x12 .imageflow.v1.HealthCheckRequest\x1a!.imageflow.v1.HealthCheckResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -36,18 +36,28 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_FILTERREQUEST_PARAMETERSENTRY']._serialized_options = b'8\001'
   _globals['_FILTERMETADATA_APPLIEDPARAMETERSENTRY']._loaded_options = None
   _globals['_FILTERMETADATA_APPLIEDPARAMETERSENTRY']._serialized_options = b'8\001'
-  _globals['_FILTERTYPE']._serialized_start=737
-  _globals['_FILTERTYPE']._serialized_end=933
+  _globals['_FILTERSTEP_PARAMETERSENTRY']._loaded_options = None
+  _globals['_FILTERSTEP_PARAMETERSENTRY']._serialized_options = b'8\001'
+  _globals['_FILTERTYPE']._serialized_start=1313
+  _globals['_FILTERTYPE']._serialized_end=1532
   _globals['_FILTERREQUEST']._serialized_start=71
-  _globals['_FILTERREQUEST']._serialized_end=396
-  _globals['_FILTERREQUEST_PARAMETERSENTRY']._serialized_start=338
-  _globals['_FILTERREQUEST_PARAMETERSENTRY']._serialized_end=387
-  _globals['_FILTERRESPONSE']._serialized_start=398
-  _globals['_FILTERRESPONSE']._serialized_end=510
-  _globals['_FILTERMETADATA']._serialized_start=513
-  _globals['_FILTERMETADATA']._serialized_end=734
-  _globals['_FILTERMETADATA_APPLIEDPARAMETERSENTRY']._serialized_start=678
-  _globals['_FILTERMETADATA_APPLIEDPARAMETERSENTRY']._serialized_end=734
-  _globals['_FILTERSERVICE']._serialized_start=936
-  _globals['_FILTERSERVICE']._serialized_end=1188
+  _globals['_FILTERREQUEST']._serialized_end=419
+  _globals['_FILTERREQUEST_PARAMETERSENTRY']._serialized_start=361
+  _globals['_FILTERREQUEST_PARAMETERSENTRY']._serialized_end=410
+  _globals['_FILTERRESPONSE']._serialized_start=421
+  _globals['_FILTERRESPONSE']._serialized_end=533
+  _globals['_FILTERMETADATA']._serialized_start=536
+  _globals['_FILTERMETADATA']._serialized_end=785
+  _globals['_FILTERMETADATA_APPLIEDPARAMETERSENTRY']._serialized_start=729
+  _globals['_FILTERMETADATA_APPLIEDPARAMETERSENTRY']._serialized_end=785
+  _globals['_FILTERSTEP']._serialized_start=788
+  _globals['_FILTERSTEP']._serialized_end=979
+  _globals['_FILTERSTEP_PARAMETERSENTRY']._serialized_start=361
+  _globals['_FILTERSTEP_PARAMETERSENTRY']._serialized_end=410
+  _globals['_FILTERCHAINREQUEST']._serialized_start=982
+  _globals['_FILTERCHAINREQUEST']._serialized_end=1194
+  _globals['_FILTERCHAINRESPONSE']._serialized_start=1196
+  _globals['_FILTERCHAINRESPONSE']._serialized_end=1310
+  _globals['_FILTERSERVICE']._serialized_start=1535
+  _globals['_FILTERSERVICE']._serialized_end=1876
 # @@protoc_insertion_point(module_scope)
@@ -2,16 +2,18 @@ import sys
 import os
 import time
 import logging
+import queue
 import json
+import threading
 from concurrent import futures
 from datetime import datetime, timezone
 
 import grpc
 from minio import Minio
+from minio.error import S3Error
 import cv2
 import numpy as np
 import requests
-from PIL import Image
 from google.protobuf.timestamp_pb2 import Timestamp
 
 # Add generated proto path
@@ -23,6 +25,23 @@ from imageflow.v1 import ai_detection_pb2_grpc
 from imageflow.v1 import common_pb2
 from grpc_health.v1 import health_pb2, health_pb2_grpc
 
+from model_registry import ModelRegistry
+from batch_scheduler import BatchScheduler
+from inference_backends import BackendSelector
+from yolo_processing import DetectionArrays
+from annotation import renderer_for
+from key_resolver import ObjectKeyResolver
+from result_cache import DetectionResultCache, content_digest, etag_digest
+from health_monitor import HealthMonitor
+from image_io import (
+    RAW_BGR8,
+    content_type_for,
+    decode_image_bytes,
+    encode_image,
+    load_object_image,
+    put_bytes,
+)
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -42,12 +61,67 @@ class AIDetectionServiceImplementation(
         # Create MinIO client pool for connection reuse
         self._create_minio_client()
 
+        # Cached resolution of request object keys to existing MinIO keys
+        self.key_resolver = ObjectKeyResolver(self.minio_client)
+
+        # Maximum requests processed concurrently per streaming RPC
+        self.stream_max_in_flight = int(os.getenv("STREAM_MAX_IN_FLIGHT", "4"))
+
         # Triton server endpoint
         self.triton_url = os.getenv("TRITON_GRPC_URL", "triton-service:8001")
 
+        # Resident inference backends shared by all request threads
+        self.backend_selector = BackendSelector()
+        self.model_registry = ModelRegistry(
+            loader=self.backend_selector.create,
+            key_fn=self.backend_selector.registry_key,
+        )
+        self.preload_models = [
+            m.strip()
+            for m in os.getenv("PRELOAD_MODELS", "yolo").split(",")
+            if m.strip()
+        ]
+        self.model_registry.preload(self.preload_models)
+
+        # Dynamic micro-batching of concurrent DetectObjects calls
+        self.batch_timeout_seconds = float(os.getenv("BATCH_TIMEOUT_SECONDS", "60"))
+        if os.getenv("ENABLE_DYNAMIC_BATCHING", "true").lower() == "true":
+            self.batch_scheduler = BatchScheduler(
+                self._run_batch_inference,
+                max_batch_size=int(os.getenv("BATCH_MAX_SIZE", "8")),
+                max_wait_ms=float(os.getenv("BATCH_MAX_WAIT_MS", "5")),
+            )
+        else:
+            self.batch_scheduler = None
+
+        # Version reported in DetectionMetadata and part of result cache keys
+        self.model_version = os.getenv("MODEL_VERSION", "v1.0")
+
+        # Content-addressed cache of detection results (off unless enabled)
+        if os.getenv("ENABLE_RESULT_CACHE", "false").lower() == "true":
+            self.result_cache = DetectionResultCache(
+                minio_client=self.minio_client,
+                shared_bucket=os.getenv("RESULT_CACHE_SHARED_BUCKET", "") or None,
+            )
+        else:
+            self.result_cache = None
+
+        # "eager" draws boxes on every draw_boxes request; "lazy" renders the
+        # annotated image only when RenderAnnotations is called for it
+        self.annotation_mode = os.getenv("ANNOTATION_MODE", "eager").lower()
+
         # Performance optimization: pre-warm services
         self._warm_up()
 
+        # Health is probed in the background; health RPCs read the cached state
+        self.health_monitor = HealthMonitor(
+            self._health_check, name="ai-detection"
+        ).start()
+
+        # Periodically log service statistics
+        self.stats_log_interval = float(os.getenv("STATS_LOG_INTERVAL_SECONDS", "60"))
+        self._start_stats_reporter()
+
         logger.info(
             f"Initialized optimized AI Detection Service with Triton: {self.triton_url}"
         )
@@ -75,6 +149,34 @@ class AIDetectionServiceImplementation(
             logger.error(f"Failed to create MinIO client: {e}")
             raise
 
+    def _start_stats_reporter(self):
+        """Start a daemon thread that logs service statistics periodically"""
+        if self.stats_log_interval <= 0:
+            return
+
+        def report():
+            while True:
+                time.sleep(self.stats_log_interval)
+                try:
+                    logger.info(f"AI Detection stats: {json.dumps(self.get_stats())}")
+                except Exception as e:
+                    logger.warning(f"Failed to report stats: {e}")
+
+        threading.Thread(target=report, name="stats-reporter", daemon=True).start()
+
+    def get_stats(self):
+        """Collect statistics from the service components"""
+        stats = {
+            "model_registry": self.model_registry.stats(),
+            "health": self.health_monitor.stats(),
+            "key_resolver": self.key_resolver.stats(),
+        }
+        if self.result_cache is not None:
+            stats["result_cache"] = self.result_cache.stats()
+        if self.batch_scheduler is not None:
+            stats["batch_scheduler"] = self.batch_scheduler.stats()
+        return stats
+
     def _warm_up(self):
         """Pre-warm AI detection and OpenCV for better performance"""
         try:
@@ -88,19 +190,18 @@ class AIDetectionServiceImplementation(
             logger.warning(f"Warm-up failed: {e}")
 
     def _health_check(self):
-        """Internal health check method"""
-        try:
-            # Test MinIO connection
-            self.minio_client.list_buckets()
-            # Test OpenCV functionality
-            test_img = np.zeros((100, 100, 3), dtype=np.uint8)
-            cv2.resize(test_img, (50, 50))
-            # Test detection pipeline
-            self._perform_object_detection(test_img, "yolo", 0.5, 0.4)
-            return True
-        except Exception as e:
-            logger.error(f"Health check failed: {e}")
-            return False
+        """Health probe run periodically by the health monitor.
+
+        Checks MinIO and that the preloaded models are resident without
+        running inference; a model evicted since startup is reloaded here
+        rather than on a request thread.
+        """
+        # Test MinIO connection
+        self.minio_client.list_buckets()
+        # Test detection pipeline
+        for model_name in self.preload_models or ["yolo"]:
+            self.model_registry.get(model_name)
+        return True
 
     def DetectObjects(self, request, context):
         """Handle object detection request"""
@@ -110,21 +211,28 @@ class AIDetectionServiceImplementation(
         )
 
         try:
-            local_input = f"/tmp/input_{request.execution_id}"
-            local_output = f"/tmp/output_{request.execution_id}"
+            lazy_annotation = request.draw_boxes and self.annotation_mode == "lazy"
+            cache_key = cached = None
+            image = None
 
             # Check if input is direct bytes or MinIO reference
             if request.HasField("input_bytes"):
                 # Handle direct byte input (for real-time streaming)
-                logger.info("Processing direct image bytes input")
-
-                # Write bytes directly to temporary file
-                with open(local_input, "wb") as f:
-                    f.write(request.input_bytes.data)
-
                 logger.info(
-                    f"Saved {len(request.input_bytes.data)} bytes to {local_input}"
+                    f"Processing direct image bytes input ({len(request.input_bytes.data)} bytes)"
                 )
+                if self.result_cache is not None:
+                    content_id = content_digest(request.input_bytes.data)
+                    if request.input_bytes.format.upper() == RAW_BGR8:
+                        # The same pixel bytes can form differently shaped images
+                        content_id += (
+                            f":{request.input_bytes.width}x{request.input_bytes.height}"
+                        )
+                    cache_key = self._result_cache_key(content_id, request)
+                    cached = self.result_cache.get(cache_key)
+                # The bytes path returns no image, so a cache hit skips decoding
+                if cached is None:
+                    image = decode_image_bytes(request.input_bytes)
 
             elif request.HasField("input_image"):
                 # Handle MinIO reference input (for batch processing)
@@ -132,107 +240,60 @@ class AIDetectionServiceImplementation(
 
                 # Download image from MinIO
                 bucket_name = request.input_image.bucket
-                object_key = request.input_image.object_key
-
-                logger.info(f"Checking bucket '{bucket_name}' existence...")
-                if not self.minio_client.bucket_exists(bucket_name):
-                    raise ValueError(f"Bucket '{bucket_name}' does not exist")
+                object_key = self.key_resolver.resolve(
+                    bucket_name, request.input_image.object_key
+                )
 
-                # List objects in bucket for debugging
-                logger.info(f"Listing objects in bucket '{bucket_name}'...")
-                try:
-                    objects = list(
-                        self.minio_client.list_objects(
-                            bucket_name, prefix="", recursive=True
-                        )
+                if self.result_cache is not None:
+                    stat = self.minio_client.stat_object(bucket_name, object_key)
+                    cache_key = self._result_cache_key(
+                        etag_digest(bucket_name, object_key, stat.etag), request
                     )
-                    logger.info(f"Found {len(objects)} objects in bucket:")
-                    for obj in objects[:10]:  # Show first 10 objects
-                        logger.info(
-                            f"  - {obj.object_name} (size: {obj.size}, modified: {obj.last_modified})"
-                        )
-                    if len(objects) > 10:
-                        logger.info(f"  ... and {len(objects) - 10} more objects")
-                except Exception as list_error:
-                    logger.warning(f"Could not list objects in bucket: {list_error}")
+                    cached = self.result_cache.get(cache_key)
 
-                # Check if the specific object exists
-                logger.info(
-                    f"Checking if object '{object_key}' exists in bucket '{bucket_name}'..."
-                )
-                try:
-                    self.minio_client.stat_object(bucket_name, object_key)
-                    logger.info(f"Object '{object_key}' exists")
-                except Exception as stat_error:
-                    logger.error(f"Object '{object_key}' does not exist: {stat_error}")
-
-                    # Try to find similar objects (with potential extensions)
-                    possible_extensions = [".jpg", ".jpeg", ".png", ".bmp", ".tiff"]
-                    found_alternative = False
-
-                    for ext in possible_extensions:
-                        try_key = object_key + ext
-                        try:
-                            self.minio_client.stat_object(bucket_name, try_key)
-                            logger.info(f"Found alternative object: '{try_key}'")
-                            object_key = try_key  # Use the found object
-                            found_alternative = True
-                            break
-                        except:
-                            continue
-
-                    if not found_alternative:
-                        # Try without execution_id suffix and with extensions
-                        base_name = (
-                            object_key.split("_")[0]
-                            if "_" in object_key
-                            else object_key
+                # Lazy annotation writes no image, so a cache hit skips the download
+                if cached is None or not lazy_annotation:
+                    logger.info(
+                        f"Downloading '{object_key}' from bucket '{bucket_name}'"
+                    )
+                    try:
+                        image = load_object_image(
+                            self.minio_client, bucket_name, object_key
                         )
-                        for ext in possible_extensions:
-                            try_key = base_name + ext
-                            try:
-                                self.minio_client.stat_object(bucket_name, try_key)
-                                logger.info(f"Found base name alternative: '{try_key}'")
-                                object_key = try_key
-                                found_alternative = True
-                                break
-                            except:
-                                continue
-
-                    if not found_alternative:
-                        raise ValueError(
-                            f"Could not find object '{request.input_image.object_key}' or any alternative in bucket '{bucket_name}'"
+                    except S3Error:
+                        # The cached resolution may point at a deleted object
+                        self.key_resolver.invalidate(
+                            bucket_name, request.input_image.object_key
                         )
-
-                logger.info(f"Downloading '{object_key}' from bucket '{bucket_name}'")
-                self.minio_client.fget_object(bucket_name, object_key, local_input)
+                        raise
             else:
                 raise ValueError("Request must have either input_bytes or input_image")
 
-            # Load image
-            image = cv2.imread(local_input)
-            if image is None:
-                raise ValueError(f"Could not read input image from {local_input}")
-
-            original_height, original_width = image.shape[:2]
-            logger.info(f"Processing image size: {original_width}x{original_height}")
+            if cached is not None:
+                detections, (original_height, original_width), cache_tier = cached
+                logger.info(
+                    f"Serving {len(detections)} detections from the {cache_tier} result cache"
+                )
+            else:
+                cache_tier = ""
+                original_height, original_width = image.shape[:2]
+                logger.info(
+                    f"Processing image size: {original_width}x{original_height}"
+                )
 
-            # Perform object detection (mock implementation for now)
-            detections = self._perform_object_detection(
-                image,
-                request.model_name,
-                request.confidence_threshold,
-                request.nms_threshold,
-            )
+                # Perform object detection (mock implementation for now)
+                detections = self._perform_object_detection(
+                    image,
+                    request.model_name,
+                    request.confidence_threshold,
+                    request.nms_threshold,
+                    cache_key=cache_key,
+                )
 
             inference_time = time.time() - start_time
 
-            # Draw bounding boxes if requested
-            output_image = image.copy()
-            if request.draw_boxes and detections:
-                output_image = self._draw_bounding_boxes(output_image, detections)
-
-            # For real-time processing (input_bytes), skip MinIO upload
+            # For real-time processing (input_bytes), skip MinIO upload.
+            # No image is returned on this path, so boxes are never drawn.
             if request.HasField("input_bytes"):
                 # Real-time processing: return response directly without MinIO upload
                 processing_time = time.time() - start_time
@@ -253,33 +314,23 @@ class AIDetectionServiceImplementation(
                 response.result.processing_time_seconds = processing_time
 
                 # Add detections
-                for detection in detections:
-                    det_proto = response.detections.add()
-                    det_proto.class_name = detection["class_name"]
-                    det_proto.confidence = detection["confidence"]
-                    det_proto.class_id = detection["class_id"]
-                    det_proto.bbox.x1 = detection["bbox"]["x1"]
-                    det_proto.bbox.y1 = detection["bbox"]["y1"]
-                    det_proto.bbox.x2 = detection["bbox"]["x2"]
-                    det_proto.bbox.y2 = detection["bbox"]["y2"]
+                self._fill_detections(response, detections, request.packed_detections)
 
                 # Set metadata
                 response.metadata.model_name = request.model_name
-                response.metadata.model_version = "v1.0"
+                response.metadata.model_version = self.model_version
                 response.metadata.confidence_threshold = request.confidence_threshold
                 response.metadata.nms_threshold = request.nms_threshold
                 response.metadata.total_detections = len(detections)
                 response.metadata.inference_time_ms = inference_time * 1000
                 response.metadata.nms_time_ms = 0  # Mock value
+                response.metadata.cache_hit = cached is not None
+                response.metadata.cache_tier = cache_tier
 
                 logger.info(
                     f"AI detection completed successfully for real-time processing, detected {len(detections)} objects"
                 )
 
-                # Clean up
-                if os.path.exists(local_input):
-                    os.remove(local_input)
-
                 return response
 
             # For MinIO-based processing (input_image), upload to MinIO
@@ -289,37 +340,43 @@ class AIDetectionServiceImplementation(
                 execution_id = request.execution_id
                 output_path = f"{execution_id}_detected.jpg"
 
-                # Use Pillow for reliable JPEG saving
-                # Convert BGR (OpenCV) to RGB (Pillow)
-                output_rgb = cv2.cvtColor(output_image, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(output_rgb)
-                pil_image.save(local_output, "JPEG", quality=85, optimize=True)
-
                 # Upload to MinIO
                 if not self.minio_client.bucket_exists(request.input_image.bucket):
                     self.minio_client.make_bucket(request.input_image.bucket)
 
-                self.minio_client.fput_object(
-                    request.input_image.bucket, output_path, local_output
-                )
-            logger.info(f"Uploaded detection result to {output_path}")
+                if lazy_annotation:
+                    # Rendered on first fetch; downstream steps get the source image
+                    img_bytes = None
+                else:
+                    output_image = image
+                    if request.draw_boxes and len(detections):
+                        output_image = self._draw_bounding_boxes(image, detections)
+                    img_bytes = encode_image(output_image, ".jpg", 85, optimize=True)
+                    put_bytes(
+                        self.minio_client,
+                        request.input_image.bucket,
+                        output_path,
+                        img_bytes,
+                    )
+                    logger.info(f"Uploaded detection result to {output_path}")
 
             # Save detection metadata with enhanced information
             metadata_path = output_path.replace(".png", ".json").replace(
                 ".jpg", ".json"
             )
+            detection_dicts = detections.to_dicts()
             detection_data = {
                 "execution_id": request.execution_id,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "image_info": {
-                    "input_file": request.input_image.object_key,
+                    "input_file": object_key,
                     "output_file": output_path,
                     "width": original_width,
                     "height": original_height,
                 },
                 "model_info": {
                     "name": request.model_name,
-                    "version": "v1.0",
+                    "version": self.model_version,
                     "confidence_threshold": request.confidence_threshold,
                     "nms_threshold": request.nms_threshold,
                 },
@@ -340,45 +397,31 @@ class AIDetectionServiceImplementation(
                             "y": (det["bbox"]["y1"] + det["bbox"]["y2"]) / 2,
                         },
                     }
-                    for det in detections
+                    for det in detection_dicts
                 ],
                 "summary": {
                     "total_detections": len(detections),
-                    "classes_detected": list(
-                        set([det["class_name"] for det in detections])
-                    ),
+                    "classes_detected": list(detections.labels().values()),
                     "highest_confidence": (
-                        max([det["confidence"] for det in detections])
-                        if detections
-                        else 0.0
+                        float(detections.scores.max()) if len(detections) else 0.0
                     ),
                     "average_confidence": (
-                        sum([det["confidence"] for det in detections]) / len(detections)
-                        if detections
-                        else 0.0
+                        float(detections.scores.mean()) if len(detections) else 0.0
                     ),
                 },
             }
 
-            with open(f"/tmp/metadata_{request.execution_id}.json", "w") as f:
-                json.dump(detection_data, f, indent=2, ensure_ascii=False)
-
-            self.minio_client.fput_object(
+            put_bytes(
+                self.minio_client,
                 request.input_image.bucket,
                 metadata_path,
-                f"/tmp/metadata_{request.execution_id}.json",
+                json.dumps(detection_data, indent=2, ensure_ascii=False).encode(
+                    "utf-8"
+                ),
+                content_type="application/json",
             )
             logger.info(f"Uploaded detection JSON metadata to {metadata_path}")
 
-            # Cleanup local files
-            for temp_file in [
-                local_input,
-                local_output,
-                f"/tmp/metadata_{request.execution_id}.json",
-            ]:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-
             processing_time = time.time() - start_time
 
             # Create response
@@ -392,12 +435,19 @@ class AIDetectionServiceImplementation(
 
             # Set output image info
             response.result.output_image.bucket = request.input_image.bucket
-            response.result.output_image.object_key = output_path
-            response.result.output_image.content_type = (
-                "image/jpeg" if output_path.endswith(".jpg") else "image/png"
-            )
             response.result.output_image.width = original_width
             response.result.output_image.height = original_height
+            if lazy_annotation:
+                response.result.output_image.object_key = object_key
+                response.result.output_image.content_type = content_type_for(object_key)
+                response.result.metadata["annotation_mode"] = "lazy"
+                response.result.metadata["annotated_output_file"] = output_path
+            else:
+                response.result.output_image.object_key = output_path
+                response.result.output_image.content_type = content_type_for(
+                    output_path
+                )
+                response.result.output_image.size_bytes = len(img_bytes)
 
             # Add JSON detection file info to metadata
             json_filename = f"{request.execution_id}_detected.json"
@@ -411,24 +461,18 @@ class AIDetectionServiceImplementation(
             response.result.processing_time_seconds = processing_time
 
             # Add detections
-            for detection in detections:
-                det_proto = response.detections.add()
-                det_proto.class_name = detection["class_name"]
-                det_proto.confidence = detection["confidence"]
-                det_proto.class_id = detection["class_id"]
-                det_proto.bbox.x1 = detection["bbox"]["x1"]
-                det_proto.bbox.y1 = detection["bbox"]["y1"]
-                det_proto.bbox.x2 = detection["bbox"]["x2"]
-                det_proto.bbox.y2 = detection["bbox"]["y2"]
+            self._fill_detections(response, detections, request.packed_detections)
 
             # Set metadata
             response.metadata.model_name = request.model_name
-            response.metadata.model_version = "v1.0"
+            response.metadata.model_version = self.model_version
             response.metadata.confidence_threshold = request.confidence_threshold
             response.metadata.nms_threshold = request.nms_threshold
             response.metadata.total_detections = len(detections)
             response.metadata.inference_time_ms = inference_time * 1000
             response.metadata.nms_time_ms = 0  # Mock value
+            response.metadata.cache_hit = cached is not None
+            response.metadata.cache_tier = cache_tier
 
             logger.info(
                 f"AI detection completed in {processing_time:.2f}s with {len(detections)} detections"
@@ -446,200 +490,277 @@ class AIDetectionServiceImplementation(
 
             return response
 
+    def DetectObjectsStream(self, request_iterator, context):
+        """Handle a bidirectional stream of object detection requests (pipelined, in-order)"""
+        logger.info(f"DetectObjectsStream started from {context.peer()}")
+        yield from _pipelined_stream(
+            request_iterator, context, self.DetectObjects, self.stream_max_in_flight
+        )
+        logger.info(f"DetectObjectsStream ended for {context.peer()}")
+
     def _perform_object_detection(
-        self, image, model_name, confidence_threshold, nms_threshold
+        self, image, model_name, confidence_threshold, nms_threshold, cache_key=None
     ):
-        """Actual YOLO object detection implementation using ultralytics"""
+        """Run detection through the resident backend.
+
+        Successful results are stored in the result cache under cache_key;
+        the error fallback never is.
+        """
         logger.info(
             f"Running {model_name} detection with confidence threshold {confidence_threshold}"
         )
 
         try:
-            # Import ultralytics for YOLO detection
-            from ultralytics import YOLO
-
-            # Load YOLO model (will download if not exists)
-            if model_name.lower() in ["yolo", "yolo11", "yolov11"]:
-                model = YOLO("yolo11n.pt")  # Use YOLO11 nano model
-            elif model_name.lower() in ["yolov8", "yolo8"]:
-                model = YOLO("yolov8n.pt")  # Use YOLOv8 nano model
+            key = (model_name, float(confidence_threshold), float(nms_threshold))
+            if self.batch_scheduler is not None:
+                # Share one batched inference with concurrent requests
+                detections = self.batch_scheduler.infer(
+                    key, image, timeout=self.batch_timeout_seconds
+                )
             else:
-                # Default to YOLO11
-                model = YOLO("yolo11n.pt")
-
-            # Run inference
-            results = model(
-                image, conf=confidence_threshold, iou=nms_threshold, verbose=False
-            )
-
-            detections = []
-            for result in results:
-                if result.boxes is not None:
-                    for box in result.boxes:
-                        # Get detection data
-                        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                        confidence = float(box.conf[0].cpu().numpy())
-                        class_id = int(box.cls[0].cpu().numpy())
-
-                        # Get class name from model names
-                        class_name = (
-                            model.names[class_id]
-                            if class_id < len(model.names)
-                            else f"class_{class_id}"
-                        )
-
-                        detection = {
-                            "class_name": class_name,
-                            "confidence": confidence,
-                            "class_id": class_id,
-                            "bbox": {
-                                "x1": float(x1),
-                                "y1": float(y1),
-                                "x2": float(x2),
-                                "y2": float(y2),
-                            },
-                        }
-                        detections.append(detection)
+                detections = self._run_batch_inference(key, [image])[0]
 
             logger.info(
-                f"Detected {len(detections)} objects: {[d['class_name'] for d in detections]}"
+                f"Detected {len(detections)} objects: {list(detections.labels().values())}"
             )
+            if cache_key is not None:
+                self.result_cache.put(cache_key, detections, image.shape)
             return detections
 
         except Exception as e:
             logger.error(f"Error in YOLO detection: {str(e)}")
             # Fallback to mock detection on error
             logger.warning("Falling back to mock detection due to error")
-            detections = [
-                {
-                    "class_name": "error_fallback",
-                    "confidence": 0.5,
-                    "class_id": 999,
-                    "bbox": {"x1": 100.0, "y1": 50.0, "x2": 200.0, "y2": 300.0},
-                },
-            ]
-            return detections
-
-    def _draw_bounding_boxes(self, image, detections):
-        """Draw bounding boxes on image with enhanced labels"""
-        colors = {
-            "person": (0, 255, 0),  # Green
-            "car": (255, 0, 0),  # Blue
-            "horse": (255, 255, 0),  # Cyan
-            "dog": (255, 0, 255),  # Magenta
-            "cat": (0, 255, 255),  # Yellow
-            "bird": (128, 0, 128),  # Purple
-            "bicycle": (255, 128, 0),  # Orange
-            "motorcycle": (0, 128, 255),  # Light blue
-            "default": (0, 0, 255),  # Red
-        }
+            return DetectionArrays(
+                [[100.0, 50.0, 200.0, 300.0]], [0.5], [999], {999: "error_fallback"}
+            )
 
-        for detection in detections:
-            bbox = detection["bbox"]
-            class_name = detection["class_name"]
-            confidence = detection["confidence"]
+    def _result_cache_key(self, content_id, request):
+        return self.result_cache.make_key(
+            content_id,
+            self.backend_selector.registry_key(request.model_name),
+            self.model_version,
+            request.confidence_threshold,
+            request.nms_threshold,
+        )
 
-            color = colors.get(class_name, colors["default"])
+    def InvalidateResultCache(self, request, context):
+        """Drop cached results of a model version, e.g. after updating its weights"""
+        response = ai_detection_pb2.ResultCacheInvalidationResponse()
+        if self.result_cache is not None:
+            response.invalidated_entries = self.result_cache.invalidate(
+                self.backend_selector.registry_key(request.model_name),
+                request.model_version,
+            )
+        if request.evict_model:
+            response.model_evicted = self.model_registry.evict(request.model_name)
+        return response
 
-            # Draw rectangle
-            cv2.rectangle(
-                image,
-                (int(bbox["x1"]), int(bbox["y1"])),
-                (int(bbox["x2"]), int(bbox["y2"])),
-                color,
-                2,
+    def _fill_detections(self, response, detections, packed):
+        """Add detections to a DetectionResponse.
+
+        packed=True fills the columnar DetectionBatch, avoiding one protobuf
+        sub-message per detection; otherwise repeated Detection is used.
+        """
+        if packed:
+            batch = response.detection_batch
+            batch.boxes.extend(detections.boxes.ravel().tolist())
+            batch.scores.extend(detections.scores.tolist())
+            batch.class_ids.extend(detections.class_ids.tolist())
+            batch.class_names.update(detections.labels())
+            return
+
+        labels = detections.labels()
+        for (x1, y1, x2, y2), score, class_id in zip(
+            detections.boxes.tolist(),
+            detections.scores.tolist(),
+            detections.class_ids.tolist(),
+        ):
+            response.detections.append(
+                ai_detection_pb2.Detection(
+                    class_name=labels[class_id],
+                    confidence=score,
+                    class_id=class_id,
+                    bbox=ai_detection_pb2.BoundingBox(x1=x1, y1=y1, x2=x2, y2=y2),
+                )
             )
 
-            # Create label with background
-            label = f"{class_name}: {confidence:.2f}"
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            font_scale = 0.6
-            font_thickness = 2
+    def _run_batch_inference(self, key, images):
+        """Run one inference over a list of images sharing model and thresholds.
 
-            # Get text size
-            (text_width, text_height), baseline = cv2.getTextSize(
-                label, font, font_scale, font_thickness
-            )
+        Returns one DetectionArrays per input image, in input order.
+        """
+        model_name, confidence_threshold, nms_threshold = key
 
-            # Calculate label position
-            label_x = int(bbox["x1"])
-            label_y = int(bbox["y1"]) - 10
-
-            # Ensure label stays within image bounds
-            if label_y - text_height - 5 < 0:
-                label_y = int(bbox["y1"]) + text_height + 15
-
-            # Draw semi-transparent background rectangle for label
-            overlay = image.copy()
-            cv2.rectangle(
-                overlay,
-                (label_x, label_y - text_height - 5),
-                (label_x + text_width, label_y + baseline),
-                color,
-                -1,  # Fill rectangle
-            )
+        # Resident backend for this model (loaded once per backend and weights)
+        backend = self.model_registry.get(model_name)
+        return backend.infer(images, confidence_threshold, nms_threshold)
 
-            # Apply transparency to background
-            alpha = 0.7  # Transparency level (0.0 = fully transparent, 1.0 = opaque)
-            cv2.addWeighted(overlay, alpha, image, 1 - alpha, 0, image)
-
-            # Draw text on top of background
-            cv2.putText(
-                image,
-                label,
-                (label_x, label_y),
-                font,
-                font_scale,
-                (255, 255, 255),  # White text for better contrast
-                font_thickness,
-            )
+    def _draw_bounding_boxes(self, image, detections):
+        """Return an annotated copy of image (a per-thread scratch buffer)"""
+        return renderer_for(detections.class_names).render(image, detections)
+
+    def RenderAnnotations(self, request, context):
+        """Render {execution_id}_detected.jpg from the stored detection JSON.
+
+        Used in lazy annotation mode, where DetectObjects only stores the
+        detections; the annotated image is produced on the first fetch and
+        reused afterwards.
+        """
+        start_time = time.time()
+        bucket = request.bucket
+        output_path = f"{request.execution_id}_detected.jpg"
+        metadata_path = f"{request.execution_id}_detected.json"
+        response = ai_detection_pb2.AnnotationResponse()
 
-        return image
+        try:
+            try:
+                stat = self.minio_client.stat_object(bucket, output_path)
+                response.already_rendered = True
+                size_bytes = stat.size
+            except S3Error as e:
+                if e.code != "NoSuchKey":
+                    raise
+                metadata_object = self.minio_client.get_object(bucket, metadata_path)
+                try:
+                    detection_data = json.loads(metadata_object.read())
+                finally:
+                    metadata_object.close()
+                    metadata_object.release_conn()
+
+                image = load_object_image(
+                    self.minio_client,
+                    bucket,
+                    detection_data["image_info"]["input_file"],
+                )
+                detections = self._detections_from_json(detection_data["detections"])
+                img_bytes = encode_image(
+                    self._draw_bounding_boxes(image, detections),
+                    ".jpg",
+                    85,
+                    optimize=True,
+                )
+                put_bytes(self.minio_client, bucket, output_path, img_bytes)
+                size_bytes = len(img_bytes)
+                logger.info(f"Rendered {len(detections)} annotations to {output_path}")
+
+            response.result.status = common_pb2.PROCESSING_STATUS_COMPLETED
+            response.result.output_image.bucket = bucket
+            response.result.output_image.object_key = output_path
+            response.result.output_image.content_type = content_type_for(output_path)
+            response.result.output_image.size_bytes = size_bytes
+        except Exception as e:
+            logger.error(f"Error rendering annotations for {output_path}: {e}")
+            response.result.status = common_pb2.PROCESSING_STATUS_FAILED
+            response.result.message = f"Annotation rendering failed: {str(e)}"
+
+        response.result.processing_time_seconds = time.time() - start_time
+        return response
+
+    @staticmethod
+    def _detections_from_json(detection_dicts):
+        """Rebuild DetectionArrays from the detections of a detection JSON file"""
+        if not detection_dicts:
+            return DetectionArrays.empty()
+        return DetectionArrays(
+            [
+                [d["bbox"]["x1"], d["bbox"]["y1"], d["bbox"]["x2"], d["bbox"]["y2"]]
+                for d in detection_dicts
+            ],
+            [d["confidence"] for d in detection_dicts],
+            [d["class_id"] for d in detection_dicts],
+            {d["class_id"]: d["class_name"] for d in detection_dicts},
+        )
 
     def Health(self, request, context):
-        """Health check endpoint with actual service verification"""
+        """Health check endpoint answered from the cached probe state"""
         response = common_pb2.HealthCheckResponse()
 
-        if self._health_check():
+        if self.health_monitor.serving:
             response.status = common_pb2.HealthCheckResponse.SERVING
-            logger.debug("AI Detection health check passed")
         else:
             response.status = common_pb2.HealthCheckResponse.NOT_SERVING
-            logger.warning("AI Detection health check failed")
 
         return response
 
 
+def _pipelined_stream(request_iterator, context, handler, max_in_flight):
+    """Run handler over a request stream with bounded concurrency.
+
+    A reader thread pulls requests and submits them to a per-stream pool, so
+    decoding frame N+1 overlaps processing of frame N. At most max_in_flight
+    requests are outstanding and responses are yielded in request order.
+    """
+    executor = futures.ThreadPoolExecutor(
+        max_workers=max_in_flight, thread_name_prefix="stream"
+    )
+    in_flight = threading.Semaphore(max_in_flight)
+    pending = queue.Queue()
+    stopped = threading.Event()
+    end_of_stream = object()
+
+    def read_requests():
+        try:
+            for request in request_iterator:
+                while not in_flight.acquire(timeout=0.5):
+                    if stopped.is_set():
+                        return
+                if stopped.is_set():
+                    return
+                pending.put(executor.submit(handler, request, context))
+        except Exception as e:
+            if not stopped.is_set():
+                logger.warning(f"Request stream ended with error: {e}")
+        finally:
+            pending.put(end_of_stream)
+
+    threading.Thread(target=read_requests, name="stream-reader", daemon=True).start()
+
+    try:
+        while True:
+            item = pending.get()
+            if item is end_of_stream:
+                break
+            response = item.result()
+            in_flight.release()
+            yield response
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 class HealthServiceImplementation(health_pb2_grpc.HealthServicer):
-    """Standard gRPC health check service implementation"""
+    """Standard gRPC health service answered from the cached probe state"""
 
     def __init__(self, ai_detection_service):
         self.ai_detection_service = ai_detection_service
+        self.health_monitor = ai_detection_service.health_monitor
+
+    @staticmethod
+    def _response(serving):
+        return health_pb2.HealthCheckResponse(
+            status=(
+                health_pb2.HealthCheckResponse.SERVING
+                if serving
+                else health_pb2.HealthCheckResponse.NOT_SERVING
+            )
+        )
 
     def Check(self, request, context):
-        """Standard gRPC health check implementation"""
-        response = health_pb2.HealthCheckResponse()
-
-        if self.ai_detection_service._health_check():
-            response.status = health_pb2.HealthCheckResponse.SERVING
-            logger.debug("AI Detection health check passed")
-        else:
-            response.status = health_pb2.HealthCheckResponse.NOT_SERVING
-            logger.warning("AI Detection health check failed")
-
-        return response
+        """Return the last background probe result without probing"""
+        return self._response(self.health_monitor.serving)
 
     def Watch(self, request, context):
-        """Health check watch implementation (streaming)"""
-        # For simplicity, just return current status
-        response = health_pb2.HealthCheckResponse()
-
-        if self.ai_detection_service._health_check():
-            response.status = health_pb2.HealthCheckResponse.SERVING
-        else:
-            response.status = health_pb2.HealthCheckResponse.NOT_SERVING
-
-        yield response
+        """Stream the current status, then every status transition"""
+        serving, version = self.health_monitor.snapshot()
+        yield self._response(serving)
+        while context.is_active():
+            serving, new_version = self.health_monitor.wait_for_change(
+                version, timeout=1.0
+            )
+            if new_version != version:
+                version = new_version
+                yield self._response(serving)
 
 
 def serve():
@@ -649,6 +770,8 @@ def serve():
     # Optimize thread pool for AI workloads
     max_workers = int(os.getenv("GRPC_MAX_WORKERS", "15"))
 
+    max_message_bytes = int(os.getenv("GRPC_MAX_MESSAGE_MB", "32")) * 1024 * 1024
+
     # Configure server options for better performance
     server_options = [
         ("grpc.keepalive_time_ms", 30000),
@@ -659,6 +782,9 @@ def serve():
         ("grpc.http2.min_ping_interval_without_data_ms", 5000),
         ("grpc.max_connection_idle_ms", 300000),
         ("grpc.max_connection_age_ms", 600000),
+        # Raw pixel frames between stages exceed the 4MB default (1080p BGR is ~6MB)
+        ("grpc.max_send_message_length", max_message_bytes),
+        ("grpc.max_receive_message_length", max_message_bytes),
     ]
 
     server = grpc.server(
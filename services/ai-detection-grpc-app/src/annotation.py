@@ -0,0 +1,143 @@
+import colorsys
+import threading
+
+import cv2
+import numpy as np
+
+# Colours the service has always used for these classes (BGR)
+NAMED_CLASS_COLORS = {
+    "person": (0, 255, 0),  # Green
+    "car": (255, 0, 0),  # Blue
+    "horse": (255, 255, 0),  # Cyan
+    "dog": (255, 0, 255),  # Magenta
+    "cat": (0, 255, 255),  # Yellow
+    "bird": (128, 0, 128),  # Purple
+    "bicycle": (255, 128, 0),  # Orange
+    "motorcycle": (0, 128, 255),  # Light blue
+}
+DEFAULT_COLOR = (0, 0, 255)  # Red
+
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+LABEL_FONT_SCALE = 0.6
+LABEL_THICKNESS = 2
+LABEL_ALPHA = 0.7  # Opacity of the label background
+BOX_THICKNESS = 2
+
+
+def _class_items(class_names):
+    if isinstance(class_names, dict):
+        return class_names.items()
+    return enumerate(class_names)
+
+
+def build_palette(class_names):
+    """class_id -> BGR colour for every class of a model.
+
+    Classes with an established colour keep it; the rest get evenly spread
+    hues so that neighbouring class ids stay distinguishable.
+    """
+    palette = {}
+    for class_id, name in _class_items(class_names):
+        color = NAMED_CLASS_COLORS.get(name)
+        if color is None:
+            hue = (class_id * 0.618033988749895) % 1.0
+            r, g, b = colorsys.hsv_to_rgb(hue, 0.85, 0.95)
+            color = (int(b * 255), int(g * 255), int(r * 255))
+        palette[class_id] = color
+    return palette
+
+
+class AnnotationRenderer:
+    """Draws detection boxes and labels for one model's class list.
+
+    All detections are drawn in a single pass over a per-thread scratch copy
+    of the frame; only the small label-background regions are alpha-blended,
+    never the whole image.
+    """
+
+    def __init__(self, class_names):
+        self.class_names = class_names
+        self.palette = build_palette(class_names)
+        self._local = threading.local()
+
+    def _scratch(self, image):
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None or buffer.shape != image.shape:
+            buffer = np.empty_like(image)
+            self._local.buffer = buffer
+        np.copyto(buffer, image)
+        return buffer
+
+    def render(self, image, detections):
+        """Return an annotated copy of image.
+
+        The result lives in this thread's scratch buffer and is overwritten
+        by the next render call on the same thread, so encode or copy it
+        before rendering again.
+        """
+        canvas = self._scratch(image)
+        height, width = canvas.shape[:2]
+
+        for (x1, y1, x2, y2), score, class_id in zip(
+            detections.boxes.astype(np.int32).tolist(),
+            detections.scores.tolist(),
+            detections.class_ids.tolist(),
+        ):
+            color = self.palette.get(class_id, DEFAULT_COLOR)
+            cv2.rectangle(canvas, (x1, y1), (x2, y2), color, BOX_THICKNESS)
+
+            label = f"{detections.class_name(class_id)}: {score:.2f}"
+            (text_width, text_height), baseline = cv2.getTextSize(
+                label, LABEL_FONT, LABEL_FONT_SCALE, LABEL_THICKNESS
+            )
+
+            # Label above the box, or inside it when it would leave the image
+            label_x, label_y = x1, y1 - 10
+            if label_y - text_height - 5 < 0:
+                label_y = y1 + text_height + 15
+
+            # Blend the label background in place, restricted to its ROI
+            top = max(label_y - text_height - 5, 0)
+            bottom = min(label_y + baseline + 1, height)
+            left = max(label_x, 0)
+            right = min(label_x + text_width + 1, width)
+            if bottom > top and right > left:
+                roi = canvas[top:bottom, left:right]
+                background = np.empty_like(roi)
+                background[:] = color
+                cv2.addWeighted(
+                    background, LABEL_ALPHA, roi, 1 - LABEL_ALPHA, 0, dst=roi
+                )
+
+            cv2.putText(
+                canvas,
+                label,
+                (label_x, label_y),
+                LABEL_FONT,
+                LABEL_FONT_SCALE,
+                (255, 255, 255),  # White text for better contrast
+                LABEL_THICKNESS,
+            )
+
+        return canvas
+
+
+# Models normally share a handful of class lists; the bound only guards
+# against callers passing ad-hoc class maps
+MAX_RENDERERS = 16
+_renderers = {}
+_renderers_lock = threading.Lock()
+
+
+def renderer_for(class_names):
+    """Shared renderer (and palette) per distinct model class list"""
+    key = tuple(_class_items(class_names))
+    renderer = _renderers.get(key)
+    if renderer is None:
+        with _renderers_lock:
+            renderer = _renderers.get(key)
+            if renderer is None:
+                if len(_renderers) >= MAX_RENDERERS:
+                    _renderers.pop(next(iter(_renderers)))
+                renderer = _renderers[key] = AnnotationRenderer(class_names)
+    return renderer
@@ -0,0 +1,148 @@
+import time
+import queue
+import logging
+import threading
+from bisect import bisect_left
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram (upper-inclusive bucket bounds)"""
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self):
+        with self._lock:
+            buckets = {
+                f"le_{bound:g}": count
+                for bound, count in zip(self.bounds, self._counts)
+            }
+            buckets["le_inf"] = self._counts[-1]
+            return {
+                "count": self._count,
+                "mean": self._sum / self._count if self._count else 0.0,
+                "buckets": buckets,
+            }
+
+
+class _PendingRequest:
+    __slots__ = ("key", "image", "future", "enqueued_at")
+
+    def __init__(self, key, image):
+        self.key = key
+        self.image = image
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class BatchScheduler:
+    """Collects concurrent inference requests into micro-batches.
+
+    Requests are grouped by key (model name and thresholds) so that every
+    batch can be served by one call of ``infer_fn(key, images)``, which must
+    return one result per image in the same order. A batch is dispatched as
+    soon as ``max_batch_size`` requests are waiting or the oldest request has
+    waited ``max_wait_ms``.
+    """
+
+    def __init__(self, infer_fn, max_batch_size=8, max_wait_ms=5.0):
+        self._infer_fn = infer_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_s = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue = queue.Queue()
+        self._batch_sizes = Histogram(range(1, self.max_batch_size + 1))
+        self._queue_wait_ms = Histogram([0.5, 1, 2, 5, 10, 20, 50, 100, 250])
+        self._batches = 0
+        self._failed_batches = 0
+
+        self._worker = threading.Thread(
+            target=self._run, name="batch-scheduler", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, key, image):
+        """Queue an image for batched inference and return a Future"""
+        pending = _PendingRequest(key, image)
+        self._queue.put(pending)
+        return pending.future
+
+    def infer(self, key, image, timeout=None):
+        """Blocking convenience wrapper around submit()"""
+        return self.submit(key, image).result(timeout=timeout)
+
+    def _collect(self):
+        """Block for the first request, then gather more until full or timed out"""
+        first = self._queue.get()
+        collected = [first]
+        deadline = first.enqueued_at + self.max_wait_s
+
+        while len(collected) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    collected.append(self._queue.get_nowait())
+                else:
+                    collected.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return collected
+
+    def _run(self):
+        while True:
+            collected = self._collect()
+
+            groups = {}
+            for pending in collected:
+                groups.setdefault(pending.key, []).append(pending)
+
+            for key, batch in groups.items():
+                self._dispatch(key, batch)
+
+    def _dispatch(self, key, batch):
+        dispatched_at = time.monotonic()
+        for pending in batch:
+            self._queue_wait_ms.observe((dispatched_at - pending.enqueued_at) * 1000)
+        self._batch_sizes.observe(len(batch))
+        self._batches += 1
+
+        try:
+            results = self._infer_fn(key, [pending.image for pending in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch inference returned {len(results)} results for {len(batch)} images"
+                )
+        except Exception as e:
+            self._failed_batches += 1
+            logger.error(f"Batched inference failed for {key}: {e}")
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+
+        for pending, result in zip(batch, results):
+            pending.future.set_result(result)
+
+    def stats(self):
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_s * 1000,
+            "queue_depth": self._queue.qsize(),
+            "batches": self._batches,
+            "failed_batches": self._failed_batches,
+            "batch_size": self._batch_sizes.snapshot(),
+            "queue_wait_ms": self._queue_wait_ms.snapshot(),
+        }
@@ -0,0 +1,250 @@
+import os
+import ast
+import logging
+import threading
+
+from model_registry import resolve_model_weights
+from yolo_processing import (
+    COCO_CLASS_NAMES,
+    YOLO_INPUT_SIZE,
+    DetectionArrays,
+    letterbox_batch,
+    postprocess,
+)
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ULTRALYTICS = "ultralytics"
+BACKEND_ONNXRUNTIME = "onnxruntime"
+BACKEND_TRITON = "triton"
+
+
+class InferenceBackend:
+    """Interface of an object detection engine.
+
+    ``infer`` takes a list of BGR images and returns one DetectionArrays per
+    image, in input order.
+    """
+
+    name = "base"
+
+    def __init__(self, weights):
+        self.weights = weights
+        self.class_names = COCO_CLASS_NAMES
+
+    def infer(self, images, confidence_threshold, nms_threshold):
+        raise NotImplementedError
+
+    def memory_bytes(self):
+        """Approximate resident memory of the loaded model"""
+        return 0
+
+
+class UltralyticsBackend(InferenceBackend):
+    """PyTorch inference through the ultralytics YOLO API"""
+
+    name = BACKEND_ULTRALYTICS
+
+    def __init__(self, weights):
+        super().__init__(weights)
+        from ultralytics import YOLO
+
+        self.model = YOLO(weights)
+        self.class_names = self.model.names
+        # The resident model is shared by all server threads, but its
+        # predictor keeps per-call state and is not thread-safe
+        self._lock = threading.Lock()
+
+    def infer(self, images, confidence_threshold, nms_threshold):
+        with self._lock:
+            # ultralytics letterboxes the list into one batch tensor
+            results = self.model(
+                images, conf=confidence_threshold, iou=nms_threshold, verbose=False
+            )
+
+            batch_detections = []
+            for result in results:
+                boxes = result.boxes
+                if boxes is None or len(boxes) == 0:
+                    batch_detections.append(DetectionArrays.empty(self.class_names))
+                    continue
+                # One device->host copy per tensor instead of per box
+                batch_detections.append(
+                    DetectionArrays(
+                        boxes.xyxy.cpu().numpy(),
+                        boxes.conf.cpu().numpy(),
+                        boxes.cls.cpu().numpy(),
+                        self.class_names,
+                    )
+                )
+        return batch_detections
+
+    def memory_bytes(self):
+        module = self.model.model
+        return sum(
+            t.numel() * t.element_size()
+            for t in list(module.parameters()) + list(module.buffers())
+        )
+
+
+class _TensorBackend(InferenceBackend):
+    """Shared letterbox -> raw tensor inference -> vectorized postprocess path"""
+
+    # Set by subclasses when the model only accepts batch size 1
+    fixed_batch = True
+
+    def infer(self, images, confidence_threshold, nms_threshold):
+        batch, transforms = letterbox_batch(images, YOLO_INPUT_SIZE)
+
+        if self.fixed_batch:
+            outputs = [self._run(batch[i : i + 1])[0] for i in range(len(images))]
+        else:
+            outputs = self._run(batch)
+
+        return [
+            DetectionArrays(
+                *postprocess(
+                    output,
+                    transform,
+                    image.shape,
+                    confidence_threshold,
+                    nms_threshold,
+                ),
+                self.class_names,
+            )
+            for output, transform, image in zip(outputs, transforms, images)
+        ]
+
+    def _run(self, batch):
+        """Run the raw model on [N, 3, H, W] and return [N, 4 + classes, anchors]"""
+        raise NotImplementedError
+
+
+class OnnxRuntimeBackend(_TensorBackend):
+    """CPU inference with ONNX Runtime, without importing PyTorch"""
+
+    name = BACKEND_ONNXRUNTIME
+
+    def __init__(self, weights, intra_op_threads=0, inter_op_threads=0):
+        super().__init__(weights)
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            weights, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.output_name = self.session.get_outputs()[0].name
+        self.fixed_batch = model_input.shape[0] == 1
+
+        # ultralytics exports store the class names as model metadata
+        names = self.session.get_modelmeta().custom_metadata_map.get("names")
+        if names:
+            try:
+                self.class_names = ast.literal_eval(names)
+            except (ValueError, SyntaxError):
+                logger.warning(f"Could not parse class names from {weights}")
+
+    def _run(self, batch):
+        return self.session.run([self.output_name], {self.input_name: batch})[0]
+
+    def memory_bytes(self):
+        try:
+            return os.path.getsize(self.weights)
+        except OSError:
+            return 0
+
+
+class TritonBackend(_TensorBackend):
+    """Remote inference on Triton (models/yolo/config.pbtxt layout) over gRPC"""
+
+    name = BACKEND_TRITON
+
+    def __init__(self, weights, url, model_name="yolo", model_version="1"):
+        super().__init__(weights)
+        import tritonclient.grpc as grpcclient
+
+        self._grpcclient = grpcclient
+        self.client = grpcclient.InferenceServerClient(url=url)
+        self.model_name = model_name
+        self.model_version = model_version
+        if not self.client.is_model_ready(model_name, model_version):
+            raise RuntimeError(
+                f"Triton model {model_name} version {model_version} is not ready at {url}"
+            )
+
+        metadata = self.client.get_model_metadata(model_name, model_version)
+        self.input_name = metadata.inputs[0].name
+        self.output_name = metadata.outputs[0].name
+        self.fixed_batch = int(metadata.inputs[0].shape[0]) == 1
+
+    def _run(self, batch):
+        infer_input = self._grpcclient.InferInput(
+            self.input_name, list(batch.shape), "FP32"
+        )
+        infer_input.set_data_from_numpy(batch)
+        result = self.client.infer(
+            model_name=self.model_name,
+            model_version=self.model_version,
+            inputs=[infer_input],
+            outputs=[self._grpcclient.InferRequestedOutput(self.output_name)],
+        )
+        return result.as_numpy(self.output_name)
+
+
+class BackendSelector:
+    """Chooses and builds the inference backend for each request model name.
+
+    MODEL_BACKENDS maps model names to backends, e.g.
+    ``yolo=onnxruntime,yolov8=ultralytics``; other names use
+    INFERENCE_BACKEND. Registry keys combine backend and weights so the same
+    model can be resident on several engines at once.
+    """
+
+    def __init__(self):
+        self.default_backend = os.getenv("INFERENCE_BACKEND", BACKEND_ULTRALYTICS)
+        self.overrides = {}
+        for entry in os.getenv("MODEL_BACKENDS", "").split(","):
+            if "=" in entry:
+                model_name, backend = entry.split("=", 1)
+                self.overrides[model_name.strip().lower()] = backend.strip()
+
+        self.onnx_model_dir = os.getenv("ONNX_MODEL_DIR", "/app/models")
+        self.onnx_intra_op_threads = int(os.getenv("ORT_INTRA_OP_THREADS", "0"))
+        self.onnx_inter_op_threads = int(os.getenv("ORT_INTER_OP_THREADS", "0"))
+        self.triton_url = os.getenv("TRITON_GRPC_URL", "triton-service:8001")
+        self.triton_model_name = os.getenv("TRITON_MODEL_NAME", "yolo")
+        self.triton_model_version = os.getenv("TRITON_MODEL_VERSION", "1")
+
+    def backend_for(self, model_name):
+        return self.overrides.get(
+            (model_name or "").strip().lower(), self.default_backend
+        )
+
+    def registry_key(self, model_name):
+        return f"{self.backend_for(model_name)}:{resolve_model_weights(model_name)}"
+
+    def create(self, key):
+        backend, weights = key.split(":", 1)
+        if backend == BACKEND_ULTRALYTICS:
+            return UltralyticsBackend(weights)
+        if backend == BACKEND_ONNXRUNTIME:
+            onnx_path = os.path.join(
+                self.onnx_model_dir, os.path.splitext(weights)[0] + ".onnx"
+            )
+            return OnnxRuntimeBackend(
+                onnx_path, self.onnx_intra_op_threads, self.onnx_inter_op_threads
+            )
+        if backend == BACKEND_TRITON:
+            return TritonBackend(
+                weights,
+                self.triton_url,
+                self.triton_model_name,
+                self.triton_model_version,
+            )
+        raise ValueError(f"Unknown inference backend: {backend}")
@@ -0,0 +1,150 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Extensions tried when a request references an object key without one
+CANDIDATE_EXTENSIONS = [".jpg", ".jpeg", ".png", ".bmp", ".tiff"]
+
+
+class ObjectKeyResolver:
+    """Resolves request object keys to existing MinIO keys with an LRU cache.
+
+    A key resolves to itself if it exists, otherwise to the key with one of
+    CANDIDATE_EXTENSIONS appended, otherwise to the part before the first
+    "_" plus an extension. Each lookup is one prefix-scoped listing, read only
+    until the candidates have been passed (listings are sorted). Misses are
+    cached for a shorter TTL so keys written by an earlier pipeline step are
+    picked up quickly.
+    """
+
+    def __init__(
+        self,
+        minio_client,
+        max_entries=None,
+        ttl_seconds=None,
+        negative_ttl_seconds=None,
+    ):
+        self.minio_client = minio_client
+        self.max_entries = max_entries or int(
+            os.getenv("OBJECT_KEY_CACHE_SIZE", "10000")
+        )
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("OBJECT_KEY_CACHE_TTL_SECONDS", "300"))
+        if negative_ttl_seconds is None:
+            negative_ttl_seconds = float(
+                os.getenv("OBJECT_KEY_NEGATIVE_TTL_SECONDS", "5")
+            )
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+
+        self._lock = threading.Lock()
+        # (bucket, key) -> (resolved key or None, expires_at), LRU order
+        self._entries = OrderedDict()
+        self._known_buckets = set()
+
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._listings = 0
+        self._evictions = 0
+
+    def resolve(self, bucket, object_key):
+        """Return the existing key for object_key, or raise ValueError"""
+        self._check_bucket(bucket)
+
+        cache_key = (bucket, object_key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(cache_key)
+                if entry[0] is None:
+                    self._negative_hits += 1
+                else:
+                    self._hits += 1
+                resolved = entry[0]
+            else:
+                self._misses += 1
+                entry = None
+
+        if entry is None:
+            resolved = self._lookup(bucket, object_key)
+            self._store(cache_key, resolved)
+            if resolved is not None and resolved != object_key:
+                logger.info(f"Resolved object '{object_key}' to '{resolved}'")
+
+        if resolved is None:
+            raise ValueError(
+                f"Could not find object '{object_key}' or any alternative in bucket '{bucket}'"
+            )
+        return resolved
+
+    def invalidate(self, bucket, object_key):
+        """Forget a cached resolution, e.g. after the object turned out to be gone"""
+        with self._lock:
+            self._entries.pop((bucket, object_key), None)
+
+    def _check_bucket(self, bucket):
+        if bucket in self._known_buckets:
+            return
+        if not self.minio_client.bucket_exists(bucket):
+            raise ValueError(f"Bucket '{bucket}' does not exist")
+        with self._lock:
+            self._known_buckets.add(bucket)
+
+    def _lookup(self, bucket, object_key):
+        candidates = [object_key] + [object_key + ext for ext in CANDIDATE_EXTENSIONS]
+        found = self._first_existing(bucket, object_key, candidates)
+        if found is None and "_" in object_key:
+            base_name = object_key.split("_")[0]
+            found = self._first_existing(
+                bucket, base_name, [base_name + ext for ext in CANDIDATE_EXTENSIONS]
+            )
+        return found
+
+    def _first_existing(self, bucket, prefix, candidates):
+        """Return the first candidate present under prefix, in candidate order"""
+        wanted = set(candidates)
+        last = max(candidates)
+        present = set()
+        with self._lock:
+            self._listings += 1
+        for obj in self.minio_client.list_objects(bucket, prefix=prefix):
+            name = obj.object_name
+            if name > last:
+                break
+            if name in wanted:
+                present.add(name)
+                if name == candidates[0]:
+                    break
+        for candidate in candidates:
+            if candidate in present:
+                return candidate
+        return None
+
+    def _store(self, cache_key, resolved):
+        ttl = self.ttl_seconds if resolved is not None else self.negative_ttl_seconds
+        with self._lock:
+            self._entries[cache_key] = (resolved, time.monotonic() + ttl)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._negative_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "negative_hits": self._negative_hits,
+                "misses": self._misses,
+                "hit_ratio": (
+                    (self._hits + self._negative_hits) / lookups if lookups else 0.0
+                ),
+                "listings": self._listings,
+                "evictions": self._evictions,
+            }
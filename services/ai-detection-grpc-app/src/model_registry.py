@@ -0,0 +1,194 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Model name aliases accepted by DetectionRequest.model_name -> weights file
+MODEL_ALIASES = {
+    "yolo": "yolo11n.pt",
+    "yolo11": "yolo11n.pt",
+    "yolov11": "yolo11n.pt",
+    "yolo11n": "yolo11n.pt",
+    "yolov8": "yolov8n.pt",
+    "yolo8": "yolov8n.pt",
+    "yolov8n": "yolov8n.pt",
+}
+DEFAULT_MODEL_WEIGHTS = "yolo11n.pt"
+
+
+def resolve_model_weights(model_name):
+    """Resolve a request model name (alias or weights file) to a weights file"""
+    name = (model_name or "").strip()
+    if name.endswith((".pt", ".onnx")):
+        return name
+    return MODEL_ALIASES.get(name.lower(), DEFAULT_MODEL_WEIGHTS)
+
+
+def _estimate_model_bytes(model, key):
+    """Estimate the resident size of a loaded model in bytes"""
+    try:
+        return int(model.memory_bytes())
+    except Exception:
+        return 0
+
+
+class _Entry:
+    __slots__ = ("model", "size_bytes", "loaded_at")
+
+    def __init__(self, model, size_bytes):
+        self.model = model
+        self.size_bytes = size_bytes
+        self.loaded_at = time.time()
+
+
+class ModelRegistry:
+    """Thread-safe registry keeping loaded models resident under a memory budget.
+
+    Models are identified by ``key_fn(model_name)`` and built with
+    ``loader(key)``. Each key is loaded at most once; concurrent requests for a model
+    that is still loading wait on the same load. When the resident size would
+    exceed the budget, the least recently used models are evicted. A model
+    larger than the whole budget is still kept so the service stays usable.
+    """
+
+    def __init__(self, loader, key_fn=None, memory_budget_mb=None, size_estimator=None):
+        if memory_budget_mb is None:
+            memory_budget_mb = float(os.getenv("MODEL_MEMORY_BUDGET_MB", "1024"))
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self._loader = loader
+        self._key_fn = key_fn or resolve_model_weights
+        self._size_estimator = size_estimator or _estimate_model_bytes
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> _Entry, LRU order
+        self._loading = {}  # key -> threading.Event
+        self._resident_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._load_failures = 0
+        self._evictions = 0
+        self._load_time_total_ms = 0.0
+        self._last_load_time_ms = 0.0
+
+    def get(self, model_name):
+        """Return the resident model for model_name, loading it on first use"""
+        key = self._key_fn(model_name)
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry.model
+
+                pending = self._loading.get(key)
+                if pending is None:
+                    # This thread owns the load
+                    pending = threading.Event()
+                    self._loading[key] = pending
+                    self._misses += 1
+                    break
+
+            # Another thread is loading the same model; wait and re-check
+            pending.wait()
+
+        try:
+            return self._load(key)
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+            pending.set()
+
+    def _load(self, key):
+        load_start = time.time()
+        try:
+            model = self._loader(key)
+        except Exception:
+            with self._lock:
+                self._load_failures += 1
+            raise
+        load_time_ms = (time.time() - load_start) * 1000
+        size_bytes = self._size_estimator(model, key)
+
+        with self._lock:
+            self._loads += 1
+            self._load_time_total_ms += load_time_ms
+            self._last_load_time_ms = load_time_ms
+            self._entries[key] = _Entry(model, size_bytes)
+            self._resident_bytes += size_bytes
+            evicted = self._evict_over_budget(keep=key)
+
+        logger.info(
+            f"Loaded model {key} in {load_time_ms:.1f}ms "
+            f"({size_bytes / (1024 * 1024):.1f}MB resident)"
+        )
+        for name in evicted:
+            logger.info(f"Evicted model {name} to stay within memory budget")
+        return model
+
+    def _evict_over_budget(self, keep):
+        """Evict LRU entries until under budget. Caller must hold the lock."""
+        evicted = []
+        while (
+            self._resident_bytes > self.memory_budget_bytes and len(self._entries) > 1
+        ):
+            name = next(iter(self._entries))
+            if name == keep:
+                self._entries.move_to_end(name)
+                name = next(iter(self._entries))
+            entry = self._entries.pop(name)
+            self._resident_bytes -= entry.size_bytes
+            self._evictions += 1
+            evicted.append(name)
+        return evicted
+
+    def preload(self, model_names):
+        """Load the given models ahead of traffic; failures are logged, not raised"""
+        for model_name in model_names:
+            model_name = model_name.strip()
+            if not model_name:
+                continue
+            try:
+                self.get(model_name)
+            except Exception as e:
+                logger.warning(f"Failed to preload model {model_name}: {e}")
+
+    def evict(self, model_name):
+        """Explicitly drop a model from the registry. Returns True if it was resident."""
+        key = self._key_fn(model_name)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self._resident_bytes -= entry.size_bytes
+            self._evictions += 1
+        logger.info(f"Evicted model {key} on request")
+        return True
+
+    def is_resident(self, model_name):
+        with self._lock:
+            return self._key_fn(model_name) in self._entries
+
+    def stats(self):
+        """Snapshot of registry counters"""
+        with self._lock:
+            return {
+                "resident_models": list(self._entries.keys()),
+                "resident_bytes": self._resident_bytes,
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "loads": self._loads,
+                "load_failures": self._load_failures,
+                "evictions": self._evictions,
+                "last_load_time_ms": self._last_load_time_ms,
+                "avg_load_time_ms": (
+                    self._load_time_total_ms / self._loads if self._loads else 0.0
+                ),
+            }
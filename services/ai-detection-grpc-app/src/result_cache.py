@@ -0,0 +1,223 @@
+import io
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent import futures
+
+from minio.error import S3Error
+
+from yolo_processing import DetectionArrays
+
+logger = logging.getLogger(__name__)
+
+TIER_MEMORY = "memory"
+TIER_SHARED = "shared"
+
+
+def content_digest(data):
+    """Content identifier of encoded image bytes"""
+    return "b2:" + hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def etag_digest(bucket, object_key, etag):
+    """Content identifier of a MinIO object, from its ETag"""
+    return f"etag:{bucket}/{object_key}:{etag}"
+
+
+class CacheKey:
+    __slots__ = ("digest", "model_key", "model_version")
+
+    def __init__(self, digest, model_key, model_version):
+        self.digest = digest
+        self.model_key = model_key
+        self.model_version = model_version
+
+    def object_name(self, prefix):
+        return f"{prefix}/{self.model_key.replace(':', '/')}/{self.model_version}/{self.digest}.json"
+
+
+class DetectionResultCache:
+    """Content-addressed cache of detection results.
+
+    Entries are keyed by the input content (byte hash or MinIO ETag), the
+    resolved model, its version and the thresholds, so identical frames and
+    re-runs over unchanged objects skip decoding and inference. The
+    in-process tier is a bounded LRU; when a shared bucket is configured,
+    entries are also written there (off the request path) so every replica
+    benefits. Bumping or invalidating a model version makes its entries
+    unreachable in both tiers.
+    """
+
+    def __init__(
+        self,
+        max_entries=None,
+        minio_client=None,
+        shared_bucket=None,
+        shared_prefix="detection-cache",
+    ):
+        self.max_entries = max_entries or int(os.getenv("RESULT_CACHE_SIZE", "4096"))
+        self.minio_client = minio_client
+        self.shared_bucket = shared_bucket
+        self.shared_prefix = shared_prefix
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # CacheKey.digest -> (key, detections, shape)
+        self._writer = (
+            futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-cache")
+            if self.shared_bucket
+            else None
+        )
+        self._shared_bucket_ready = False
+
+        self._memory_hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def make_key(
+        self, content_id, model_key, model_version, confidence_threshold, nms_threshold
+    ):
+        raw = f"{content_id}|{model_key}|{model_version}|{confidence_threshold:.4f}|{nms_threshold:.4f}"
+        digest = hashlib.blake2b(raw.encode("utf-8"), digest_size=20).hexdigest()
+        return CacheKey(digest, model_key, model_version)
+
+    def get(self, key):
+        """Return (detections, image_shape, tier) or None"""
+        with self._lock:
+            entry = self._entries.get(key.digest)
+            if entry is not None:
+                self._entries.move_to_end(key.digest)
+                self._memory_hits += 1
+                return entry[1], entry[2], TIER_MEMORY
+
+        if self.shared_bucket:
+            cached = self._get_shared(key)
+            if cached is not None:
+                self._put_memory(key, *cached)
+                with self._lock:
+                    self._shared_hits += 1
+                return cached[0], cached[1], TIER_SHARED
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key, detections, image_shape):
+        image_shape = tuple(image_shape[:2])
+        self._put_memory(key, detections, image_shape)
+        if self._writer is not None:
+            self._writer.submit(self._put_shared, key, detections, image_shape)
+
+    def _put_memory(self, key, detections, image_shape):
+        with self._lock:
+            self._entries[key.digest] = (key, detections, image_shape)
+            self._entries.move_to_end(key.digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _get_shared(self, key):
+        try:
+            response = self.minio_client.get_object(
+                self.shared_bucket, key.object_name(self.shared_prefix)
+            )
+        except S3Error as e:
+            if e.code not in ("NoSuchKey", "NoSuchBucket"):
+                logger.warning(f"Shared result cache read failed: {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Shared result cache read failed: {e}")
+            return None
+        try:
+            data = json.loads(response.read())
+        finally:
+            response.close()
+            response.release_conn()
+
+        class_names = {int(k): v for k, v in data["class_names"].items()}
+        detections = DetectionArrays(
+            data["boxes"], data["scores"], data["class_ids"], class_names
+        )
+        return detections, tuple(data["image_shape"])
+
+    def _put_shared(self, key, detections, image_shape):
+        try:
+            if not self._shared_bucket_ready:
+                if not self.minio_client.bucket_exists(self.shared_bucket):
+                    self.minio_client.make_bucket(self.shared_bucket)
+                self._shared_bucket_ready = True
+            payload = json.dumps(
+                {
+                    "boxes": detections.boxes.tolist(),
+                    "scores": detections.scores.tolist(),
+                    "class_ids": detections.class_ids.tolist(),
+                    "class_names": detections.labels(),
+                    "image_shape": list(image_shape),
+                }
+            ).encode("utf-8")
+            self.minio_client.put_object(
+                self.shared_bucket,
+                key.object_name(self.shared_prefix),
+                io.BytesIO(payload),
+                length=len(payload),
+                content_type="application/json",
+            )
+        except Exception as e:
+            logger.warning(f"Shared result cache write failed: {e}")
+
+    def invalidate(self, model_key, model_version=None):
+        """Drop entries of a model (optionally only one version). Returns the count."""
+        with self._lock:
+            stale = [
+                digest
+                for digest, (key, _, _) in self._entries.items()
+                if key.model_key == model_key
+                and (not model_version or key.model_version == model_version)
+            ]
+            for digest in stale:
+                del self._entries[digest]
+            self._invalidations += len(stale)
+        removed = len(stale)
+
+        if self.shared_bucket:
+            removed += self._invalidate_shared(model_key, model_version)
+        logger.info(
+            f"Invalidated {removed} cached results for {model_key} {model_version or '(all versions)'}"
+        )
+        return removed
+
+    def _invalidate_shared(self, model_key, model_version):
+        prefix = f"{self.shared_prefix}/{model_key.replace(':', '/')}/"
+        if model_version:
+            prefix += f"{model_version}/"
+        removed = 0
+        try:
+            for obj in self.minio_client.list_objects(
+                self.shared_bucket, prefix=prefix, recursive=True
+            ):
+                self.minio_client.remove_object(self.shared_bucket, obj.object_name)
+                removed += 1
+        except Exception as e:
+            logger.warning(f"Shared result cache invalidation failed: {e}")
+        return removed
+
+    def stats(self):
+        with self._lock:
+            lookups = self._memory_hits + self._shared_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "memory_hits": self._memory_hits,
+                "shared_hits": self._shared_hits,
+                "misses": self._misses,
+                "hit_ratio": (
+                    (self._memory_hits + self._shared_hits) / lookups
+                    if lookups
+                    else 0.0
+                ),
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
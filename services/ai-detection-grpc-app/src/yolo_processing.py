@@ -0,0 +1,168 @@
+import cv2
+import numpy as np
+
+# Input size of the exported YOLO models (models/yolo/config.pbtxt)
+YOLO_INPUT_SIZE = 640
+LETTERBOX_PAD_VALUE = 114
+
+COCO_CLASS_NAMES = [
+    "person", "bicycle", "car", "motorcycle", "airplane", "bus", "train", "truck",
+    "boat", "traffic light", "fire hydrant", "stop sign", "parking meter", "bench",
+    "bird", "cat", "dog", "horse", "sheep", "cow", "elephant", "bear", "zebra",
+    "giraffe", "backpack", "umbrella", "handbag", "tie", "suitcase", "frisbee",
+    "skis", "snowboard", "sports ball", "kite", "baseball bat", "baseball glove",
+    "skateboard", "surfboard", "tennis racket", "bottle", "wine glass", "cup",
+    "fork", "knife", "spoon", "bowl", "banana", "apple", "sandwich", "orange",
+    "broccoli", "carrot", "hot dog", "pizza", "donut", "cake", "chair", "couch",
+    "potted plant", "bed", "dining table", "toilet", "tv", "laptop", "mouse",
+    "remote", "keyboard", "cell phone", "microwave", "oven", "toaster", "sink",
+    "refrigerator", "book", "clock", "vase", "scissors", "teddy bear", "hair drier",
+    "toothbrush",
+]  # fmt: skip
+
+
+def letterbox(image, size=YOLO_INPUT_SIZE, out=None):
+    """Letterbox a BGR image into a normalised CHW float32 tensor.
+
+    Returns (tensor, (scale, pad_x, pad_y)) where the metadata maps model
+    coordinates back to the original image: orig = (model - pad) / scale.
+    When out is given (shape [3, size, size], float32) it is written in place.
+    """
+    h, w = image.shape[:2]
+    scale = min(size / w, size / h)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+
+    canvas = np.full((size, size, 3), LETTERBOX_PAD_VALUE, dtype=np.uint8)
+    canvas[pad_y : pad_y + new_h, pad_x : pad_x + new_w] = cv2.resize(
+        image, (new_w, new_h), interpolation=cv2.INTER_LINEAR
+    )
+
+    if out is None:
+        out = np.empty((3, size, size), dtype=np.float32)
+    # BGR -> RGB, HWC -> CHW and normalisation in one strided write
+    np.multiply(canvas[:, :, ::-1].transpose(2, 0, 1), 1.0 / 255.0, out=out)
+    return out, (scale, pad_x, pad_y)
+
+
+def letterbox_batch(images, size=YOLO_INPUT_SIZE):
+    """Letterbox a list of images into one [N, 3, size, size] tensor"""
+    batch = np.empty((len(images), 3, size, size), dtype=np.float32)
+    transforms = []
+    for i, image in enumerate(images):
+        _, transform = letterbox(image, size, out=batch[i])
+        transforms.append(transform)
+    return batch, transforms
+
+
+def decode_predictions(prediction, confidence_threshold):
+    """Decode one raw YOLO output [4 + num_classes, num_anchors].
+
+    Returns (boxes_xyxy, scores, class_ids) for anchors above the threshold,
+    in model input coordinates.
+    """
+    if prediction.shape[0] > prediction.shape[1]:
+        prediction = prediction.T
+    # Threshold on the max score first; argmax only runs on surviving anchors
+    scores = prediction[4:].max(axis=0)
+    keep = np.flatnonzero(scores > confidence_threshold)
+    candidates = prediction[:, keep]
+    class_ids = candidates[4:].argmax(axis=0)
+
+    cx, cy, w, h = candidates[:4]
+    half_w, half_h = w / 2, h / 2
+    boxes = np.stack([cx - half_w, cy - half_h, cx + half_w, cy + half_h], axis=1)
+    return boxes, scores[keep], class_ids
+
+
+def non_max_suppression(boxes, scores, class_ids, iou_threshold, max_detections=300):
+    """Class-aware NMS on xyxy arrays. Returns kept indices sorted by score.
+
+    The arrays are handed to OpenCV's batched NMS as-is, so there is no
+    per-box conversion to Python lists and no Python-level suppression loop.
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    xywh = boxes.copy()
+    xywh[:, 2:] -= xywh[:, :2]
+    keep = cv2.dnn.NMSBoxesBatched(
+        xywh, scores, class_ids, 0.0, iou_threshold, top_k=max_detections
+    )
+    return np.asarray(keep, dtype=np.int64).reshape(-1)
+
+
+def scale_boxes(boxes, transform, image_shape):
+    """Map letterboxed boxes back to original image coordinates and clip"""
+    scale, pad_x, pad_y = transform
+    boxes = (boxes - np.array([pad_x, pad_y, pad_x, pad_y], dtype=boxes.dtype)) / scale
+    h, w = image_shape[:2]
+    np.clip(boxes[:, 0::2], 0, w, out=boxes[:, 0::2])
+    np.clip(boxes[:, 1::2], 0, h, out=boxes[:, 1::2])
+    return boxes
+
+
+def postprocess(
+    prediction, transform, image_shape, confidence_threshold, iou_threshold
+):
+    """Decode, suppress and rescale one raw YOLO output.
+
+    Returns (boxes_xyxy, scores, class_ids) as NumPy arrays in original image
+    coordinates.
+    """
+    boxes, scores, class_ids = decode_predictions(prediction, confidence_threshold)
+    keep = non_max_suppression(boxes, scores, class_ids, iou_threshold)
+    boxes = scale_boxes(boxes[keep], transform, image_shape)
+    return boxes, scores[keep], class_ids[keep]
+
+
+class DetectionArrays:
+    """Columnar detections of one image.
+
+    boxes is [N, 4] xyxy float32, scores [N] float32 and class_ids [N] int32.
+    Keeping detections as arrays avoids per-object Python work until a
+    consumer actually needs dictionaries or per-detection messages.
+    """
+
+    __slots__ = ("boxes", "scores", "class_ids", "class_names")
+
+    def __init__(self, boxes, scores, class_ids, class_names):
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        self.scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+        self.class_ids = np.asarray(class_ids, dtype=np.int32).reshape(-1)
+        self.class_names = class_names
+
+    @classmethod
+    def empty(cls, class_names=()):
+        return cls(np.empty((0, 4)), np.empty(0), np.empty(0), class_names)
+
+    def __len__(self):
+        return len(self.scores)
+
+    def class_name(self, class_id):
+        try:
+            return self.class_names[class_id]
+        except (IndexError, KeyError):
+            return f"class_{class_id}"
+
+    def labels(self):
+        """class_id -> class name for the classes present"""
+        return {
+            class_id: self.class_name(class_id)
+            for class_id in np.unique(self.class_ids).tolist()
+        }
+
+    def to_dicts(self):
+        """Convert to the service's detection dictionaries"""
+        labels = self.labels()
+        return [
+            {
+                "class_name": labels[class_id],
+                "confidence": score,
+                "class_id": class_id,
+                "bbox": {"x1": x1, "y1": y1, "x2": x2, "y2": y2},
+            }
+            for (x1, y1, x2, y2), score, class_id in zip(
+                self.boxes.tolist(), self.scores.tolist(), self.class_ids.tolist()
+            )
+        ]
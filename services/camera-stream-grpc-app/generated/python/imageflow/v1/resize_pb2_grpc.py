@@ -46,6 +46,11 @@ class ResizeServiceStub(object):
                 request_serializer=imageflow_dot_v1_dot_resize__pb2.ResizeRequest.SerializeToString,
                 response_deserializer=imageflow_dot_v1_dot_resize__pb2.ResizeResponse.FromString,
                 _registered_method=True)
+        self.ResizeImageMulti = channel.unary_unary(
+                '/imageflow.v1.ResizeService/ResizeImageMulti',
+                request_serializer=imageflow_dot_v1_dot_resize__pb2.ResizeMultiRequest.SerializeToString,
+                response_deserializer=imageflow_dot_v1_dot_resize__pb2.ResizeMultiResponse.FromString,
+                _registered_method=True)
         self.Health = channel.unary_unary(
                 '/imageflow.v1.ResizeService/Health',
                 request_serializer=imageflow_dot_v1_dot_common__pb2.HealthCheckRequest.SerializeToString,
@@ -69,6 +74,13 @@ class ResizeServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ResizeImageMulti(self, request, context):
+        """Several sizes of one image: decoded once, derivatives uploaded concurrently
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Health(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -88,6 +100,11 @@ def add_ResizeServiceServicer_to_server(servicer, server):
                     request_deserializer=imageflow_dot_v1_dot_resize__pb2.ResizeRequest.FromString,
                     response_serializer=imageflow_dot_v1_dot_resize__pb2.ResizeResponse.SerializeToString,
             ),
+            'ResizeImageMulti': grpc.unary_unary_rpc_method_handler(
+                    servicer.ResizeImageMulti,
+                    request_deserializer=imageflow_dot_v1_dot_resize__pb2.ResizeMultiRequest.FromString,
+                    response_serializer=imageflow_dot_v1_dot_resize__pb2.ResizeMultiResponse.SerializeToString,
+            ),
             'Health': grpc.unary_unary_rpc_method_handler(
                     servicer.Health,
                     request_deserializer=imageflow_dot_v1_dot_common__pb2.HealthCheckRequest.FromString,
@@ -159,6 +176,33 @@ class ResizeService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def ResizeImageMulti(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/imageflow.v1.ResizeService/ResizeImageMulti',
+            imageflow_dot_v1_dot_resize__pb2.ResizeMultiRequest.SerializeToString,
+            imageflow_dot_v1_dot_resize__pb2.ResizeMultiResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def Health(request,
             target,
@@ -8,7 +8,7 @@ from datetime import datetime, timezone
 import threading
 import queue
 import json
-import requests
+import itertools
 from typing import Dict, List, Any, Optional
 
 import grpc
@@ -35,12 +35,24 @@ from grpc_health.v1 import health_pb2, health_pb2_grpc
 from imageflow.v1 import evaluator_pb2
 from imageflow.v1 import evaluator_pb2_grpc
 
+from pipeline_cache import PENDING, PipelineDefinitionCache
+from stream_pipeline import FRAME_POLICIES, FrameAdmission, StagedPipeline
+
 # Setup logging
 logging.basicConfig(
     level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Per-stream pipeline stages, in order; each runs on its own thread so
+# consecutive frames can occupy different stages at the same time. "encode"
+# turns raw pixels left by the last stage into the JPEG of the response.
+STREAM_STAGES = ("resize", "ai_detection", "filter", "evaluate", "encode")
+
+# ImageBytes format / result content type of undecoded BGR pixels
+RAW_BGR8 = "RAW_BGR8"
+RAW_BGR8_CONTENT_TYPE = "image/x-raw-bgr8"
+
 
 class CameraStreamProcessorImplementation(
     camera_stream_pb2_grpc.CameraStreamProcessorServicer
@@ -118,15 +130,39 @@ class CameraStreamProcessorImplementation(
             os.getenv("FRAME_SKIP_THRESHOLD", "1000")
         )  # ms - 1秒に延長
 
+        # Frames admitted per stream but not yet answered (across all stages)
+        self.stream_max_in_flight = int(os.getenv("STREAM_MAX_IN_FLIGHT", "4"))
+        # "ordered" or "unordered" (released as completed, matched by sequence_number);
+        # a stream can override it with the response_order processing param
+        self.stream_response_order = os.getenv("STREAM_RESPONSE_ORDER", "ordered")
+
+        # Frame admission per source: every_frame, latest_only or fixed_rate;
+        # overridable per source with the frame_policy / max_queued_frames /
+        # target_fps processing params
+        self.frame_policy = os.getenv("STREAM_FRAME_POLICY", "latest_only")
+        self.max_queued_frames = int(os.getenv("STREAM_MAX_QUEUED_FRAMES", "1"))
+        self.target_fps = float(os.getenv("STREAM_TARGET_FPS", "5"))
+
+        # Pass frames between stages as raw BGR pixels, so JPEG is only
+        # decoded by the first service and encoded once for the response
+        self.raw_transport = os.getenv("STREAM_RAW_TRANSPORT", "true").lower() == "true"
+        self.max_message_bytes = (
+            int(os.getenv("GRPC_MAX_MESSAGE_MB", "32")) * 1024 * 1024
+        )
+
         # Initialize gRPC connections
         self.channels = {}
         self.clients = {}
         self._initialize_grpc_connections()
 
-        # Cache for pipeline definitions
-        self._pipeline_cache = {}
-        self._cache_timestamp = 0
-        self._cache_ttl = 300  # 5 minutes
+        # Cache for pipeline definitions, refreshed in the background so
+        # frame processing never waits for the backend
+        self.pipeline_cache = PipelineDefinitionCache(
+            self.backend_api_url,
+            headers=self._backend_headers(),
+            ttl=float(os.getenv("PIPELINE_CACHE_TTL_SECONDS", "30")),
+            timeout=float(os.getenv("PIPELINE_FETCH_TIMEOUT_SECONDS", "5")),
+        )
 
         logger.info(f"CameraStreamProcessor initialized")
         logger.info(f"Deployment environment: {self.deployment_env}")
@@ -148,6 +184,8 @@ class CameraStreamProcessorImplementation(
                         ("grpc.http2.max_pings_without_data", 0),
                         ("grpc.http2.min_time_between_pings_ms", 10000),
                         ("grpc.http2.min_ping_interval_without_data_ms", 300000),
+                        ("grpc.max_send_message_length", self.max_message_bytes),
+                        ("grpc.max_receive_message_length", self.max_message_bytes),
                     ],
                 )
 
@@ -165,115 +203,143 @@ class CameraStreamProcessorImplementation(
                     f"Failed to initialize gRPC connection to {service_name}: {e}"
                 )
 
-    def _get_pipeline_definition(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
-        """Get pipeline definition from backend API with caching"""
-        current_time = time.time()
+    def _backend_headers(self) -> Dict[str, str]:
+        """Headers for service-to-service requests to the backend API"""
+        headers = {}
 
-        # Check cache validity
-        if (current_time - self._cache_timestamp) > self._cache_ttl:
-            self._pipeline_cache.clear()
-            self._cache_timestamp = current_time
+        # Add service bypass header for internal communication
+        if self.skip_auth:
+            headers["X-Service-Internal"] = "true"
+            headers["X-Service-Name"] = "camera-stream-grpc"
 
-        # Return cached pipeline if available
-        if pipeline_id in self._pipeline_cache:
-            return self._pipeline_cache[pipeline_id]
+        # Add service token if available
+        if self.service_auth_token:
+            headers["Authorization"] = f"Bearer {self.service_auth_token}"
 
-        try:
-            # Fetch pipeline definition from backend API
-            # Prepare headers for service-to-service authentication
-            headers = {}
-
-            # Add service bypass header for internal communication
-            if self.skip_auth:
-                headers["X-Service-Internal"] = "true"
-                headers["X-Service-Name"] = "camera-stream-grpc"
-                logger.debug(f"Added service bypass headers: {headers}")
-
-            # Add service token if available
-            if self.service_auth_token:
-                headers["Authorization"] = f"Bearer {self.service_auth_token}"
-                logger.debug(f"Added service token to headers")
-
-            logger.debug(
-                f"Making request to: {self.backend_api_url}/v1/pipelines/{pipeline_id}"
-            )
-            logger.debug(f"Request headers: {headers}")
+        return headers
 
-            response = requests.get(
-                f"{self.backend_api_url}/v1/pipelines/{pipeline_id}",
-                headers=headers,
-                timeout=5,
-            )
-            if response.status_code == 200:
-                pipeline_def = response.json()
-                self._pipeline_cache[pipeline_id] = pipeline_def
-                logger.info(f"Fetched pipeline definition for {pipeline_id}")
-                return pipeline_def
-            else:
-                logger.warning(
-                    f"Failed to fetch pipeline {pipeline_id}: HTTP {response.status_code}"
-                )
-                return None
+    def _get_pipeline_definition(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get pipeline definition from the cache without waiting for the backend:
+        None if the pipeline does not exist, PENDING while it is first fetched
+        """
+        return self.pipeline_cache.get(pipeline_id)
 
-        except Exception as e:
-            logger.error(f"Error fetching pipeline definition for {pipeline_id}: {e}")
-            return None
+    def InvalidatePipelineCache(self, request, context):
+        """Refetch pipeline definitions the backend reports as saved or deleted"""
+        response = camera_stream_pb2.PipelineCacheInvalidationResponse()
+        response.invalidated_entries = self.pipeline_cache.invalidate(
+            request.pipeline_ids
+        )
+        logger.info(
+            f"Pipeline cache invalidation for {list(request.pipeline_ids)}: "
+            f"{response.invalidated_entries} cached"
+        )
+        return response
 
     def ProcessVideoStream(self, request_iterator, context):
         """
         Bidirectional streaming RPC for real-time video processing
+
+        Frames run through STREAM_STAGES as a pipeline: up to
+        STREAM_MAX_IN_FLIGHT frames of the stream are processed at once,
+        each in a different stage. Frames arriving faster than that are
+        queued per source and dropped according to the source's frame policy.
         """
         client_id = context.peer()
         logger.info(f"New video stream started from {client_id}")
 
+        requests_iter = iter(request_iterator)
         try:
-            # Process incoming video frames
-            for video_frame in request_iterator:
-                start_time = time.time()
-
-                try:
-                    # Process the frame
-                    processed_frame = self._process_video_frame(video_frame)
-                    yield processed_frame
-
-                    processing_time = (time.time() - start_time) * 1000
-                    logger.debug(
-                        f"Frame processed in {processing_time:.2f}ms for source {video_frame.metadata.source_id}"
-                    )
-
-                except Exception as e:
-                    logger.error(
-                        f"Error processing frame from {video_frame.metadata.source_id}: {e}"
-                    )
-
-                    # Send error response
-                    error_frame = camera_stream_pb2.ProcessedFrame()
-                    error_frame.source_id = video_frame.metadata.source_id
-                    error_frame.status = (
-                        camera_stream_pb2.STREAM_PROCESSING_STATUS_FAILED
-                    )
-                    error_frame.error_message = str(e)
+            first_frame = next(requests_iter, None)
+        except Exception as e:
+            logger.error(f"Stream error for {client_id}: {e}")
+            first_frame = None
+        if first_frame is None:
+            logger.info(f"Video stream ended for {client_id}")
+            return
 
-                    timestamp = Timestamp()
-                    timestamp.GetCurrentTime()
-                    error_frame.processed_at.CopyFrom(timestamp)
+        # Start loading the pipeline while the stream is being set up
+        pipeline_id = first_frame.metadata.pipeline_id
+        if pipeline_id and pipeline_id != "passthrough":
+            self.pipeline_cache.prefetch(pipeline_id)
 
-                    yield error_frame
+        response_order = first_frame.metadata.processing_params.get(
+            "response_order", self.stream_response_order
+        )
+        pipeline = StagedPipeline(
+            [
+                (stage, lambda task, stage=stage: self._run_frame_stage(stage, task))
+                for stage in STREAM_STAGES
+            ],
+            self.stream_max_in_flight,
+            ordered=response_order != "unordered",
+            name=f"stream-{first_frame.metadata.source_id}",
+            admission=FrameAdmission(
+                source_of=lambda frame: frame.metadata.source_id,
+                policy_of=self._frame_policy,
+            ),
+        )
 
+        try:
+            yield from pipeline.run(
+                itertools.chain([first_frame], requests_iter),
+                self._begin_frame,
+                self._finish_frame,
+            )
         except Exception as e:
             logger.error(f"Stream error for {client_id}: {e}")
         finally:
-            logger.info(f"Video stream ended for {client_id}")
+            logger.info(
+                f"Video stream ended for {client_id} | stage latency ms: "
+                + json.dumps(
+                    {k: round(v, 1) for k, v in pipeline.stage_latency_ms().items()}
+                )
+                + " | sources: "
+                + json.dumps(pipeline.admission.stats())
+                + " | pipeline cache: "
+                + json.dumps(self.pipeline_cache.stats())
+            )
+
+    def _frame_policy(self, video_frame):
+        """(policy, max_queued, target_fps) for the source of a frame"""
+        params = video_frame.metadata.processing_params
+        policy = params.get("frame_policy", self.frame_policy)
+        if policy not in FRAME_POLICIES:
+            logger.warning(
+                f"Unknown frame policy '{policy}' for source {video_frame.metadata.source_id}, using {self.frame_policy}"
+            )
+            policy = self.frame_policy
+        try:
+            max_queued = int(params.get("max_queued_frames", self.max_queued_frames))
+            target_fps = float(params.get("target_fps", self.target_fps))
+        except ValueError as e:
+            logger.warning(f"Invalid frame policy parameters: {e}")
+            max_queued, target_fps = self.max_queued_frames, self.target_fps
+        logger.info(
+            f"Frame policy for source {video_frame.metadata.source_id}: {policy} "
+            f"(max_queued={max_queued}, target_fps={target_fps})"
+        )
+        return policy, max_queued, target_fps
+
+    @staticmethod
+    def _response_sequence(task):
+        """Sequence number of the sender if it numbered the frame, else its stream position"""
+        return task.request.sequence_number or task.sequence
 
-    def _process_video_frame(self, video_frame):
+    def _begin_frame(self, task):
         """
-        Process a single video frame through the defined pipeline
+        Admit a frame: skip check and pipeline lookup. Frames that need no
+        pipeline stages (skipped, passthrough) are marked done here.
         """
-        start_time = time.time()
+        video_frame = task.request
+        task.start_time = time.time()
 
         # Create response frame
         processed_frame = camera_stream_pb2.ProcessedFrame()
         processed_frame.source_id = video_frame.metadata.source_id
+        processed_frame.sequence_number = self._response_sequence(task)
+        task.processed_frame = processed_frame
 
         # フレーム受信時の詳細ログ
         logger.debug(f"=== Processing Video Frame ===")
@@ -284,90 +350,157 @@ class CameraStreamProcessorImplementation(
             f"Frame dimensions: {video_frame.metadata.width}x{video_frame.metadata.height}"
         )
 
-        try:
-            # Check if we should skip this frame for performance
-            if self._should_skip_frame(video_frame):
+        # Check if we should skip this frame for performance
+        if self._should_skip_frame(video_frame):
+            processed_frame.status = camera_stream_pb2.STREAM_PROCESSING_STATUS_SKIPPED
+            processed_frame.error_message = "Frame skipped due to high load"
+            logger.info(f"Frame SKIPPED for source {video_frame.metadata.source_id}")
+            task.done = True
+            return
+
+        # Get pipeline definition based on metadata
+        pipeline_id = video_frame.metadata.pipeline_id
+
+        if pipeline_id and pipeline_id != "passthrough":
+            # Get pipeline definition from backend
+            pipeline_def = self._get_pipeline_definition(pipeline_id)
+            if pipeline_def is PENDING:
                 processed_frame.status = (
                     camera_stream_pb2.STREAM_PROCESSING_STATUS_SKIPPED
                 )
-                processed_frame.error_message = "Frame skipped due to high load"
-                logger.info(
-                    f"Frame SKIPPED for source {video_frame.metadata.source_id}"
+                processed_frame.error_message = (
+                    f"Pipeline {pipeline_id} definition is loading"
                 )
-                return processed_frame
-
-            # Get pipeline definition based on metadata
-            pipeline_id = video_frame.metadata.pipeline_id
-
-            if pipeline_id and pipeline_id != "passthrough":
-                # Get pipeline definition from backend
-                pipeline_def = self._get_pipeline_definition(pipeline_id)
-                if pipeline_def:
-                    # Process frame through the defined pipeline
-                    result = self._execute_pipeline(video_frame, pipeline_def)
-                    if result:
-                        processed_frame.detections.extend(result.get("detections", []))
-                        if "processed_data" in result:
-                            processed_frame.processed_data = result["processed_data"]
-                        processed_frame.status = (
-                            camera_stream_pb2.STREAM_PROCESSING_STATUS_SUCCESS
-                        )
-                        # Populate pipeline id always for downstream mapping
-                        if pipeline_id:
-                            processed_frame.pipeline_id = pipeline_id
-
-                        # Try to evaluate detections via inspection-evaluator service
-                        try:
-                            eval_judgment, eval_item_id, eval_criteria_id = (
-                                self._evaluate_detections(
-                                    video_frame, list(result.get("detections", []))
-                                )
-                            )
-                            if eval_judgment:
-                                processed_frame.judgment = eval_judgment
-                            if eval_item_id:
-                                processed_frame.item_id = eval_item_id
-                            if eval_criteria_id:
-                                processed_frame.criteria_id = eval_criteria_id
-                        except Exception as e:
-                            logger.warning(f"Evaluator call failed: {e}")
-                    else:
-                        processed_frame.status = (
-                            camera_stream_pb2.STREAM_PROCESSING_STATUS_FAILED
-                        )
-                        processed_frame.error_message = "Pipeline execution failed"
-                else:
-                    # Pipeline not found, fallback to passthrough
-                    processed_frame.processed_data = video_frame.frame_data
+                task.done = True
+                return
+            if pipeline_def:
+                components = pipeline_def.get("components", [])
+                if not components:
+                    logger.warning("Pipeline has no components")
                     processed_frame.status = (
-                        camera_stream_pb2.STREAM_PROCESSING_STATUS_SUCCESS
-                    )
-                    logger.warning(
-                        f"Pipeline {pipeline_id} not found, using passthrough"
+                        camera_stream_pb2.STREAM_PROCESSING_STATUS_FAILED
                     )
-            else:
-                # Simple passthrough for testing or when no pipeline specified
-                processed_frame.processed_data = video_frame.frame_data
-                processed_frame.status = (
-                    camera_stream_pb2.STREAM_PROCESSING_STATUS_SUCCESS
+                    processed_frame.error_message = "Pipeline execution failed"
+                    task.done = True
+                    return
+
+                # Sort components by dependencies to determine execution order
+                task.components = self._sort_components_by_dependencies(components)
+                for component in task.components:
+                    if component.get("component_type", "") not in STREAM_STAGES:
+                        logger.warning(
+                            f"Unknown component type: {component.get('component_type', '')}"
+                        )
+
+                # Start with the original frame data
+                task.current_image = common_pb2.ImageBytes(
+                    data=video_frame.frame_data,
+                    format="JPEG",
+                    width=video_frame.metadata.width,
+                    height=video_frame.metadata.height,
                 )
+                task.detections = []
+                # Populate pipeline id always for downstream mapping
+                processed_frame.pipeline_id = pipeline_id
+                return
 
-            # Set timing information
-            processing_time = (time.time() - start_time) * 1000
-            processed_frame.processing_time_ms = int(processing_time)
+            # Pipeline not found, fallback to passthrough
+            logger.warning(f"Pipeline {pipeline_id} not found, using passthrough")
 
-            # Set timestamp
-            timestamp = Timestamp()
-            timestamp.GetCurrentTime()
-            processed_frame.processed_at.CopyFrom(timestamp)
+        # Simple passthrough for testing or when no pipeline specified
+        processed_frame.processed_data = video_frame.frame_data
+        processed_frame.status = camera_stream_pb2.STREAM_PROCESSING_STATUS_SUCCESS
+        task.done = True
 
-            return processed_frame
+    def _run_frame_stage(self, stage, task):
+        """
+        Execute the components of one stage for a frame through real gRPC services
+        """
+        video_frame = task.request
 
-        except Exception as e:
-            logger.error(f"Error in frame processing: {e}")
+        if stage == "evaluate":
+            # Try to evaluate detections via inspection-evaluator service
+            try:
+                eval_judgment, eval_item_id, eval_criteria_id = (
+                    self._evaluate_detections(video_frame, list(task.detections))
+                )
+                processed_frame = task.processed_frame
+                if eval_judgment:
+                    processed_frame.judgment = eval_judgment
+                if eval_item_id:
+                    processed_frame.item_id = eval_item_id
+                if eval_criteria_id:
+                    processed_frame.criteria_id = eval_criteria_id
+            except Exception as e:
+                logger.warning(f"Evaluator call failed: {e}")
+            return
+
+        if stage == "encode":
+            task.current_image = self._encode_frame(task.current_image)
+            return
+
+        for component in task.components:
+            if component.get("component_type", "") != stage:
+                continue
+            component_params = component.get("parameters", {})
+
+            logger.debug(f"Executing component: {stage}")
+
+            if stage == "resize":
+                task.current_image = self._execute_resize(
+                    task.current_image, component_params
+                )
+            elif stage == "ai_detection":
+                task.detections.extend(
+                    self._execute_ai_detection(task.current_image, component_params)
+                )
+            elif stage == "filter":
+                task.current_image = self._execute_filter(
+                    task.current_image, component_params
+                )
+
+    def _finish_frame(self, task):
+        """
+        Build the response of a frame once it has left the pipeline
+        """
+        processed_frame = getattr(task, "processed_frame", None)
+        if processed_frame is None:
+            processed_frame = camera_stream_pb2.ProcessedFrame()
+            processed_frame.source_id = task.request.metadata.source_id
+            processed_frame.sequence_number = self._response_sequence(task)
+
+        if task.dropped:
+            processed_frame.status = camera_stream_pb2.STREAM_PROCESSING_STATUS_SKIPPED
+            processed_frame.error_message = f"Frame dropped ({task.policy})"
+        elif task.error is not None:
+            logger.error(
+                f"Error processing frame from {task.request.metadata.source_id}: {task.error}"
+            )
             processed_frame.status = camera_stream_pb2.STREAM_PROCESSING_STATUS_FAILED
-            processed_frame.error_message = str(e)
-            return processed_frame
+            processed_frame.error_message = str(task.error)
+        elif not task.done:
+            # Went through every stage
+            processed_frame.detections.extend(task.detections)
+            processed_frame.processed_data = task.current_image.data
+            processed_frame.status = camera_stream_pb2.STREAM_PROCESSING_STATUS_SUCCESS
+
+        # Set timing information
+        processing_time = (
+            time.time() - getattr(task, "start_time", time.time())
+        ) * 1000
+        processed_frame.processing_time_ms = int(processing_time)
+        processed_frame.dropped_frames = task.dropped_frames
+        processed_frame.effective_fps = task.effective_fps
+        logger.debug(
+            f"Frame processed in {processing_time:.2f}ms for source {processed_frame.source_id}"
+        )
+
+        # Set timestamp
+        timestamp = Timestamp()
+        timestamp.GetCurrentTime()
+        processed_frame.processed_at.CopyFrom(timestamp)
+
+        return processed_frame
 
     def _evaluate_detections(
         self, video_frame, detections_list: List[ai_detection_pb2.Detection]
@@ -450,56 +583,6 @@ class CameraStreamProcessorImplementation(
         )
         return False
 
-    def _execute_pipeline(
-        self, video_frame, pipeline_def: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """
-        Execute the pipeline defined in Web UI through real gRPC services
-        """
-        try:
-            components = pipeline_def.get("components", [])
-            if not components:
-                logger.warning("Pipeline has no components")
-                return None
-
-            # Sort components by dependencies to determine execution order
-            execution_order = self._sort_components_by_dependencies(components)
-
-            # Start with the original frame data
-            current_data = video_frame.frame_data
-            result = {"detections": [], "processed_data": current_data}
-
-            # Execute each component in order
-            for component in execution_order:
-                component_type = component.get("component_type", "")
-                component_params = component.get("parameters", {})
-
-                logger.debug(f"Executing component: {component_type}")
-
-                if component_type == "resize":
-                    current_data = self._execute_resize(current_data, component_params)
-                elif component_type == "ai_detection":
-                    detections = self._execute_ai_detection(
-                        current_data,
-                        component_params,
-                        video_frame.metadata.width,
-                        video_frame.metadata.height,
-                    )
-                    result["detections"].extend(detections)
-                elif component_type == "filter":
-                    current_data = self._execute_filter(current_data, component_params)
-                else:
-                    logger.warning(f"Unknown component type: {component_type}")
-
-                # Update processed data after each step
-                result["processed_data"] = current_data
-
-            return result
-
-        except Exception as e:
-            logger.error(f"Pipeline execution error: {e}")
-            return None
-
     def _sort_components_by_dependencies(
         self, components: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
@@ -519,26 +602,24 @@ class CameraStreamProcessorImplementation(
             key=lambda c: order_priority.get(c.get("component_type", ""), 999),
         )
 
-    def _execute_resize(self, frame_data: bytes, params: Dict[str, Any]) -> bytes:
+    def _execute_resize(
+        self, image_bytes: common_pb2.ImageBytes, params: Dict[str, Any]
+    ) -> common_pb2.ImageBytes:
         """Execute resize operation through gRPC service"""
         try:
             if "resize" not in self.clients:
                 logger.error("Resize gRPC client not available")
-                return frame_data
+                return image_bytes
 
             client = self.clients["resize"]
 
             # Create resize request
             request = resize_pb2.ResizeRequest()
-
-            # Create ImageBytes for input_bytes
-            image_bytes = common_pb2.ImageBytes()
-            image_bytes.data = frame_data
-            image_bytes.format = "JPEG"
-
             request.input_bytes.CopyFrom(image_bytes)
             request.target_width = params.get("width", 640)
             request.target_height = params.get("height", 480)
+            if self.raw_transport:
+                request.output_format = RAW_BGR8
 
             # Call resize service
             response = client.ResizeImage(
@@ -548,21 +629,21 @@ class CameraStreamProcessorImplementation(
             if response.result.status == common_pb2.PROCESSING_STATUS_COMPLETED:
                 # Check if we have direct output data (for real-time processing)
                 if response.result.output_data:
-                    return response.result.output_data
+                    return self._result_image(response.result)
                 # Otherwise use MinIO reference data (shouldn't happen in real-time)
                 else:
                     logger.error("Resize failed: No output data in response")
-                    return frame_data
+                    return image_bytes
             else:
                 logger.error(f"Resize failed: {response.result.message}")
-                return frame_data
+                return image_bytes
 
         except Exception as e:
             logger.error(f"Resize execution error: {e}")
-            return frame_data
+            return image_bytes
 
     def _execute_ai_detection(
-        self, frame_data: bytes, params: Dict[str, Any], width: int = 0, height: int = 0
+        self, image_bytes: common_pb2.ImageBytes, params: Dict[str, Any]
     ) -> List[ai_detection_pb2.Detection]:
         """Execute AI detection through gRPC service"""
         try:
@@ -574,14 +655,6 @@ class CameraStreamProcessorImplementation(
 
             # Create detection request
             request = ai_detection_pb2.DetectionRequest()
-
-            # Create ImageBytes for input_bytes
-            image_bytes = common_pb2.ImageBytes()
-            image_bytes.data = frame_data
-            image_bytes.format = "JPEG"
-            image_bytes.width = width
-            image_bytes.height = height
-
             request.input_bytes.CopyFrom(image_bytes)
             request.model_name = params.get("model_name", "yolo11n")
             request.confidence_threshold = params.get("confidence_threshold", 0.5)
@@ -602,25 +675,23 @@ class CameraStreamProcessorImplementation(
             logger.error(f"AI detection execution error: {e}")
             return []
 
-    def _execute_filter(self, frame_data: bytes, params: Dict[str, Any]) -> bytes:
+    def _execute_filter(
+        self, image_bytes: common_pb2.ImageBytes, params: Dict[str, Any]
+    ) -> common_pb2.ImageBytes:
         """Execute filter operation through gRPC service"""
         try:
             if "filter" not in self.clients:
                 logger.error("Filter gRPC client not available")
-                return frame_data
+                return image_bytes
 
             client = self.clients["filter"]
 
             # Create filter request
             request = filter_pb2.FilterRequest()
-
-            # Create ImageBytes for input_bytes
-            image_bytes = common_pb2.ImageBytes()
-            image_bytes.data = frame_data
-            image_bytes.format = "JPEG"
-
             request.input_bytes.CopyFrom(image_bytes)
             request.filter_type = params.get("filter_type", filter_pb2.FILTER_TYPE_BLUR)
+            if self.raw_transport:
+                request.output_format = RAW_BGR8
 
             # Add filter parameters
             for key, value in params.items():
@@ -635,18 +706,50 @@ class CameraStreamProcessorImplementation(
             if response.result.status == common_pb2.PROCESSING_STATUS_COMPLETED:
                 # Check if we have direct output data (for real-time processing)
                 if response.result.output_data:
-                    return response.result.output_data
+                    return self._result_image(response.result)
                 # Otherwise use MinIO reference data (shouldn't happen in real-time)
                 else:
                     logger.error("Filter failed: No output data in response")
-                    return frame_data
+                    return image_bytes
             else:
                 logger.error(f"Filter failed: {response.result.message}")
-                return frame_data
+                return image_bytes
 
         except Exception as e:
             logger.error(f"Filter execution error: {e}")
-            return frame_data
+            return image_bytes
+
+    def _result_image(
+        self, result: common_pb2.ProcessingResult
+    ) -> common_pb2.ImageBytes:
+        """Inline output of a stage as input for the next one"""
+        raw = result.output_image.content_type == RAW_BGR8_CONTENT_TYPE
+        return common_pb2.ImageBytes(
+            data=result.output_data,
+            format=RAW_BGR8 if raw else "JPEG",
+            width=result.output_image.width,
+            height=result.output_image.height,
+        )
+
+    def _encode_frame(
+        self, image_bytes: common_pb2.ImageBytes
+    ) -> common_pb2.ImageBytes:
+        """JPEG of the frame for the response; encoded frames are kept as they are"""
+        if image_bytes.format != RAW_BGR8:
+            return image_bytes
+        width, height = image_bytes.width, image_bytes.height
+        image = np.ndarray(
+            (height, width, 3),
+            dtype=np.uint8,
+            buffer=image_bytes.data,
+            strides=(image_bytes.stride or width * 3, 3, 1),
+        )
+        ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        if not ok:
+            raise ValueError(f"Could not encode {width}x{height} frame as JPEG")
+        return common_pb2.ImageBytes(
+            data=buffer.tobytes(), format="JPEG", width=width, height=height
+        )
 
     def _validate_frame(self, frame_data):
         """
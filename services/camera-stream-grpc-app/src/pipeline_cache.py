@@ -0,0 +1,177 @@
+import time
+import logging
+import threading
+from concurrent import futures
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Returned by PipelineDefinitionCache.get while the first fetch of a pipeline
+# is still in flight
+PENDING = object()
+
+
+class _Entry:
+    __slots__ = (
+        "definition",
+        "etag",
+        "fetched_at",
+        "refreshing",
+        "failures",
+        "generation",
+    )
+
+    def __init__(self):
+        self.definition = None  # None: not found (or never fetched successfully)
+        self.etag = None
+        self.fetched_at = None  # monotonic time of the last answer, None before it
+        self.refreshing = False
+        self.failures = 0
+        self.generation = 0  # bumped by invalidate()
+
+
+class PipelineDefinitionCache:
+    """Pipeline definitions from the backend, fetched off the frame path.
+
+    get() only reads the cache: an entry older than ttl is returned as it is
+    while a background thread revalidates it with a conditional GET
+    (If-None-Match with the ETag of the cached copy; the backend answers 304
+    while the pipeline is unchanged). A pipeline not seen before returns
+    PENDING until its first fetch completes. Failed fetches keep serving the
+    last good definition and are retried after retry_seconds; pipelines the
+    backend does not know are cached as None for not_found_ttl.
+    invalidate() marks entries stale, e.g. when the backend pushes a save.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        headers=None,
+        ttl=30.0,
+        not_found_ttl=10.0,
+        retry_seconds=5.0,
+        timeout=5.0,
+        max_workers=2,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.headers = dict(headers or {})
+        self.ttl = ttl
+        self.not_found_ttl = not_found_ttl
+        self.retry_seconds = retry_seconds
+        self.timeout = timeout
+
+        # Pooled keep-alive connections to the backend, shared by the workers
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pipeline-cache"
+        )
+
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._stats = {"hits": 0, "stale_hits": 0, "fetches": 0, "not_modified": 0}
+
+    def get(self, pipeline_id):
+        """Cached definition (dict), None if not found, or PENDING; never blocks"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(pipeline_id)
+            if entry is None:
+                entry = self._entries[pipeline_id] = _Entry()
+            if entry.fetched_at is None:
+                self._schedule(pipeline_id, entry)
+                return PENDING
+            if now - entry.fetched_at >= self._ttl_of(entry):
+                self._schedule(pipeline_id, entry)
+                self._stats["stale_hits"] += 1
+            else:
+                self._stats["hits"] += 1
+            return entry.definition
+
+    def prefetch(self, pipeline_id):
+        """Start fetching a pipeline that is about to be used"""
+        self.get(pipeline_id)
+
+    def invalidate(self, pipeline_ids):
+        """Revalidate the given pipelines now; returns how many were cached"""
+        invalidated = 0
+        with self._lock:
+            for pipeline_id in pipeline_ids:
+                entry = self._entries.get(pipeline_id)
+                if entry is None:
+                    continue
+                invalidated += 1
+                entry.generation += 1
+                if entry.fetched_at is not None:
+                    entry.fetched_at = float("-inf")
+                self._schedule(pipeline_id, entry)
+        return invalidated
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    def _ttl_of(self, entry):
+        if entry.failures:
+            return self.retry_seconds
+        return self.ttl if entry.definition is not None else self.not_found_ttl
+
+    def _schedule(self, pipeline_id, entry):
+        # Called with the lock held
+        if entry.refreshing:
+            return
+        entry.refreshing = True
+        try:
+            self._executor.submit(self._refresh, pipeline_id, entry)
+        except RuntimeError:  # shut down
+            entry.refreshing = False
+
+    def _refresh(self, pipeline_id, entry):
+        with self._lock:
+            generation = entry.generation
+            headers = dict(self.headers)
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+        try:
+            response = self.session.get(
+                f"{self.base_url}/v1/pipelines/{pipeline_id}",
+                headers=headers,
+                timeout=self.timeout,
+            )
+            with self._lock:
+                entry.refreshing = False
+                if response.status_code == 304:
+                    self._stats["not_modified"] += 1
+                elif response.status_code == 200:
+                    self._stats["fetches"] += 1
+                    entry.definition = response.json()
+                    entry.etag = response.headers.get("ETag")
+                    logger.info(f"Fetched pipeline definition for {pipeline_id}")
+                elif response.status_code == 404:
+                    entry.definition, entry.etag = None, None
+                    logger.warning(f"Pipeline {pipeline_id} not found")
+                else:
+                    raise requests.HTTPError(f"HTTP {response.status_code}")
+                entry.failures = 0
+                entry.fetched_at = time.monotonic()
+                if entry.generation != generation:
+                    # Invalidated while this request was in flight
+                    entry.fetched_at = float("-inf")
+                    self._schedule(pipeline_id, entry)
+        except Exception as e:
+            with self._lock:
+                entry.refreshing = False
+                entry.failures += 1
+                entry.fetched_at = time.monotonic()
+            logger.warning(
+                f"Failed to fetch pipeline {pipeline_id} (attempt {entry.failures}), "
+                f"{'serving cached copy' if entry.definition is not None else 'no cached copy'}: {e}"
+            )
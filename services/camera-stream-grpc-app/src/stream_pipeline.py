@@ -0,0 +1,359 @@
+import math
+import time
+import queue
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+# Frame admission policies, selectable per source:
+# every_frame - process every frame; reading waits while the queue is full
+# latest_only - keep only the newest queued frames, drop older ones
+# fixed_rate - admit at most target_fps frames per second, latest wins
+EVERY_FRAME = "every_frame"
+LATEST_ONLY = "latest_only"
+FIXED_RATE = "fixed_rate"
+FRAME_POLICIES = (EVERY_FRAME, LATEST_ONLY, FIXED_RATE)
+
+
+class StageTask:
+    """One request travelling through a StagedPipeline.
+
+    Stages keep their own per-request state as attributes. Setting done
+    sends the task straight to the response side, skipping the remaining
+    stages; an exception raised by a stage is stored in error. A task the
+    admission policy dropped never reaches begin or the stages and has
+    dropped set.
+    """
+
+    def __init__(self, sequence, request):
+        self.sequence = sequence
+        self.request = request
+        self.done = False
+        self.error = None
+        self.dropped = False
+        self.admitted = False
+        self.source = None
+        self.policy = None
+        # Source statistics at the time of the response
+        self.dropped_frames = 0
+        self.effective_fps = 0.0
+
+
+class _SourceState:
+    __slots__ = (
+        "policy",
+        "max_queued",
+        "min_interval",
+        "queued",
+        "in_flight",
+        "dropped",
+        "last_accepted",
+        "completions",
+    )
+
+    def __init__(self, policy, max_queued, target_fps):
+        self.policy = policy
+        self.max_queued = max(1, max_queued)
+        self.min_interval = 1.0 / target_fps if target_fps > 0 else 0.0
+        self.queued = deque()
+        self.in_flight = 0
+        self.dropped = 0
+        self.last_accepted = None
+        self.completions = deque(maxlen=30)  # monotonic times of processed frames
+
+
+class FrameAdmission:
+    """Per-source queues deciding which frames enter the pipeline.
+
+    source_of(request) names the source of a frame; policy_of(request)
+    returns (policy, max_queued, target_fps) and is consulted for the first
+    frame of each source. Not thread-safe: StagedPipeline calls it under its
+    own lock.
+    """
+
+    def __init__(self, source_of=None, policy_of=None):
+        self.source_of = source_of or (lambda request: None)
+        self.policy_of = policy_of or (lambda request: (EVERY_FRAME, 1, 0.0))
+        self._sources = {}
+
+    def _state(self, task):
+        state = self._sources.get(task.source)
+        if state is None:
+            state = _SourceState(*self.policy_of(task.request))
+            self._sources[task.source] = state
+        return state
+
+    def offer(self, task, now):
+        """Queue a frame; returns the frames dropped to make room for it,
+        or None if it cannot be accepted yet (EVERY_FRAME with a full queue)
+        """
+        task.source = self.source_of(task.request)
+        state = self._state(task)
+        task.policy = state.policy
+
+        if state.policy == FIXED_RATE and state.last_accepted is not None:
+            if now - state.last_accepted < state.min_interval:
+                state.dropped += 1
+                return [task]
+
+        dropped = []
+        if len(state.queued) >= state.max_queued:
+            if state.policy == EVERY_FRAME:
+                return None
+            # Latest frame wins: the oldest queued ones give way
+            while len(state.queued) >= state.max_queued:
+                dropped.append(state.queued.popleft())
+            state.dropped += len(dropped)
+
+        state.queued.append(task)
+        state.last_accepted = now
+        return dropped
+
+    def pop(self, window):
+        """Admit the oldest queued frame of a source with fewer than window in flight"""
+        candidates = [
+            state
+            for state in self._sources.values()
+            if state.queued and state.in_flight < window
+        ]
+        if not candidates:
+            return None
+        state = min(candidates, key=lambda s: s.queued[0].sequence)
+        task = state.queued.popleft()
+        state.in_flight += 1
+        task.admitted = True
+        return task
+
+    def empty(self):
+        return not any(state.queued for state in self._sources.values())
+
+    def complete(self, task, now):
+        """Account for a frame leaving the pipeline and stamp its source statistics"""
+        state = self._sources.get(task.source)
+        if state is None:
+            return
+        if task.admitted:
+            state.in_flight -= 1
+            state.completions.append(now)
+        task.dropped_frames = state.dropped
+        if len(state.completions) > 1:
+            span = state.completions[-1] - state.completions[0]
+            task.effective_fps = (len(state.completions) - 1) / span if span else 0.0
+
+    def stats(self):
+        return {
+            str(source): {
+                "policy": state.policy,
+                "queued": len(state.queued),
+                "in_flight": state.in_flight,
+                "dropped": state.dropped,
+            }
+            for source, state in self._sources.items()
+        }
+
+
+class StagedPipeline:
+    """Stage-parallel processing of one request stream.
+
+    Every stage has its own worker thread and FIFO queue, so while frame N
+    is in the last stage, frame N+1 can be in the one before it: throughput
+    approaches 1 / (slowest stage) instead of 1 / (sum of all stages).
+    Responses are released in request order, or as soon as each one is
+    complete when ordered is False (e.g. a skipped frame overtaking frames
+    still in the stages).
+
+    The reader keeps draining the request stream into a FrameAdmission, so
+    frames wait where the admission policy can still drop them rather than
+    in the gRPC receive buffer or between stages. Frames are admitted while
+    fewer than window() of their source are in flight, window() being about
+    the number of stages the measured latencies keep busy at once (at most
+    max_in_flight, which also bounds the stream as a whole).
+    """
+
+    def __init__(
+        self, stages, max_in_flight, ordered=True, name="stream", admission=None
+    ):
+        self.stages = list(stages)  # (name, fn(task)) in execution order
+        self.max_in_flight = max_in_flight
+        self.ordered = ordered
+        self.name = name
+        self.admission = admission or FrameAdmission()
+
+        self._lock = threading.Lock()
+        self._stage_latency_ms = {stage_name: 0.0 for stage_name, _ in self.stages}
+
+    def run(self, request_iterator, begin, finish):
+        """Yield finish(task) for every request of request_iterator.
+
+        begin(task) runs on the admission thread as each frame is admitted,
+        the stage functions on their own threads, and finish(task) on the
+        caller's thread just before its response is yielded. Dropped frames
+        skip begin and the stages but still get a response.
+        """
+        admission = self.admission
+        cond = threading.Condition()
+        status = {"in_flight": 0, "reading": True}
+        stopped = threading.Event()
+        stage_queues = [queue.Queue() for _ in self.stages]
+        completed = queue.Queue()
+
+        def forward(task, index):
+            if task.done or index == len(self.stages):
+                completed.put(task)
+            else:
+                stage_queues[index].put(task)
+
+        def read_requests():
+            sequence = 0
+            try:
+                for request in request_iterator:
+                    task = StageTask(sequence, request)
+                    sequence += 1
+                    with cond:
+                        while True:
+                            if stopped.is_set():
+                                return
+                            dropped = admission.offer(task, time.monotonic())
+                            if dropped is not None:
+                                break
+                            cond.wait(0.5)
+                        cond.notify_all()
+                    for dropped_task in dropped:
+                        dropped_task.dropped = dropped_task.done = True
+                        completed.put(dropped_task)
+            except Exception as e:
+                if not stopped.is_set():
+                    logger.warning(f"{self.name}: request stream ended with error: {e}")
+            finally:
+                with cond:
+                    status["reading"] = False
+                    cond.notify_all()
+
+        def admit_frames():
+            try:
+                while True:
+                    with cond:
+                        while True:
+                            if stopped.is_set():
+                                return
+                            task = None
+                            if status["in_flight"] < self.max_in_flight:
+                                task = admission.pop(self.window())
+                            if task is not None:
+                                status["in_flight"] += 1
+                                cond.notify_all()
+                                break
+                            if not status["reading"] and admission.empty():
+                                return
+                            cond.wait(0.5)
+                    try:
+                        begin(task)
+                    except Exception as e:
+                        task.error, task.done = e, True
+                    forward(task, 0)
+            finally:
+                (stage_queues[0] if stage_queues else completed).put(_END)
+
+        def run_stage(index, stage_name, fn):
+            while True:
+                task = stage_queues[index].get()
+                if task is _END:
+                    forward_end = (
+                        stage_queues[index + 1]
+                        if index + 1 < len(self.stages)
+                        else completed
+                    )
+                    forward_end.put(_END)
+                    return
+                if stopped.is_set():
+                    continue
+                start = time.perf_counter()
+                try:
+                    fn(task)
+                except Exception as e:
+                    task.error, task.done = e, True
+                self._record_latency(stage_name, (time.perf_counter() - start) * 1000)
+                forward(task, index + 1)
+
+        def release(task):
+            with cond:
+                if task.admitted:
+                    status["in_flight"] -= 1
+                admission.complete(task, time.monotonic())
+                cond.notify_all()
+            return finish(task)
+
+        threads = [
+            threading.Thread(
+                target=run_stage,
+                args=(index, stage_name, fn),
+                name=f"{self.name}-{stage_name}",
+                daemon=True,
+            )
+            for index, (stage_name, fn) in enumerate(self.stages)
+        ]
+        threads.append(
+            threading.Thread(
+                target=read_requests, name=f"{self.name}-reader", daemon=True
+            )
+        )
+        threads.append(
+            threading.Thread(
+                target=admit_frames, name=f"{self.name}-admission", daemon=True
+            )
+        )
+        for thread in threads:
+            thread.start()
+
+        pending = {}  # sequence -> completed task waiting for its predecessors
+        next_sequence = 0
+        try:
+            while True:
+                task = completed.get()
+                if task is _END:
+                    break
+                if not self.ordered:
+                    yield release(task)
+                    continue
+                pending[task.sequence] = task
+                while next_sequence in pending:
+                    ready = pending.pop(next_sequence)
+                    next_sequence += 1
+                    yield release(ready)
+        finally:
+            stopped.set()
+            with cond:
+                cond.notify_all()
+            # Unblock stage threads still waiting for work; they exit on _END
+            for stage_queue in stage_queues:
+                stage_queue.put(_END)
+
+    def window(self):
+        """Frames per source worth having in flight: enough to keep every
+        stage busy, i.e. total latency / slowest stage, rounded up. More
+        would only wait between stages, where they can no longer be dropped.
+        """
+        latencies = self.stage_latency_ms()
+        slowest = max(latencies.values(), default=0.0)
+        if slowest <= 0.0:
+            return self.max_in_flight
+        busy_stages = math.ceil(sum(latencies.values()) / slowest)
+        return max(1, min(self.max_in_flight, busy_stages))
+
+    def _record_latency(self, stage_name, elapsed_ms, alpha=0.2):
+        with self._lock:
+            previous = self._stage_latency_ms[stage_name]
+            self._stage_latency_ms[stage_name] = (
+                elapsed_ms
+                if previous == 0.0
+                else previous + alpha * (elapsed_ms - previous)
+            )
+
+    def stage_latency_ms(self):
+        """Moving average of the time each stage spends per request"""
+        with self._lock:
+            return dict(self._stage_latency_ms)
@@ -46,6 +46,11 @@ class FilterServiceStub(object):
                 request_serializer=imageflow_dot_v1_dot_filter__pb2.FilterRequest.SerializeToString,
                 response_deserializer=imageflow_dot_v1_dot_filter__pb2.FilterResponse.FromString,
                 _registered_method=True)
+        self.ApplyFilterChain = channel.unary_unary(
+                '/imageflow.v1.FilterService/ApplyFilterChain',
+                request_serializer=imageflow_dot_v1_dot_filter__pb2.FilterChainRequest.SerializeToString,
+                response_deserializer=imageflow_dot_v1_dot_filter__pb2.FilterChainResponse.FromString,
+                _registered_method=True)
         self.Health = channel.unary_unary(
                 '/imageflow.v1.FilterService/Health',
                 request_serializer=imageflow_dot_v1_dot_common__pb2.HealthCheckRequest.SerializeToString,
@@ -69,6 +74,13 @@ class FilterServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ApplyFilterChain(self, request, context):
+        """Ordered filters on one decoded image, encoded once at the end
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Health(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -88,6 +100,11 @@ def add_FilterServiceServicer_to_server(servicer, server):
                     request_deserializer=imageflow_dot_v1_dot_filter__pb2.FilterRequest.FromString,
                     response_serializer=imageflow_dot_v1_dot_filter__pb2.FilterResponse.SerializeToString,
             ),
+            'ApplyFilterChain': grpc.unary_unary_rpc_method_handler(
+                    servicer.ApplyFilterChain,
+                    request_deserializer=imageflow_dot_v1_dot_filter__pb2.FilterChainRequest.FromString,
+                    response_serializer=imageflow_dot_v1_dot_filter__pb2.FilterChainResponse.SerializeToString,
+            ),
             'Health': grpc.unary_unary_rpc_method_handler(
                     servicer.Health,
                     request_deserializer=imageflow_dot_v1_dot_common__pb2.HealthCheckRequest.FromString,
@@ -159,6 +176,33 @@ class FilterService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def ApplyFilterChain(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/imageflow.v1.FilterService/ApplyFilterChain',
+            imageflow_dot_v1_dot_filter__pb2.FilterChainRequest.SerializeToString,
+            imageflow_dot_v1_dot_filter__pb2.FilterChainResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def Health(request,
             target,
@@ -1,7 +1,10 @@
 import sys
 import os
 import time
+import functools
 import logging
+import queue
+import threading
 from concurrent import futures
 from datetime import datetime, timezone
 
@@ -9,7 +12,6 @@ import grpc
 from minio import Minio
 import cv2
 import numpy as np
-from PIL import Image
 from google.protobuf.timestamp_pb2 import Timestamp
 
 # Add generated proto path
@@ -21,12 +23,77 @@ from imageflow.v1 import filter_pb2_grpc
 from imageflow.v1 import common_pb2
 from grpc_health.v1 import health_pb2, health_pb2_grpc
 
+from health_monitor import HealthMonitor
+from image_io import (
+    RAW_BGR8,
+    RAW_BGR8_CONTENT_TYPE,
+    content_type_for,
+    decode_image_bytes,
+    encode_image,
+    load_object_image,
+    put_bytes,
+    raw_image_data,
+)
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Filters that map each channel value independently (256-entry lookup table).
+# Contrast is a point filter too, but cv2.convertScaleAbs computes it
+# vectorised and faster than a table lookup.
+POINT_FILTERS = (filter_pb2.FILTER_TYPE_BRIGHTNESS, filter_pb2.FILTER_TYPE_GAMMA)
+
+
+@functools.lru_cache(maxsize=256)
+def point_lut(filter_type, intensity, parameters=()):
+    """Lookup table for cv2.LUT implementing a point filter.
+
+    parameters is the sorted tuple of the request parameters; it is part of
+    the cache key only. The returned table is shared and read-only.
+    """
+    values = np.arange(256, dtype=np.float64)
+
+    if filter_type == filter_pb2.FILTER_TYPE_BRIGHTNESS:
+        # Add the same offset to every channel
+        table = values + int((intensity - 0.5) * 100)
+    elif filter_type == filter_pb2.FILTER_TYPE_GAMMA:
+        gamma = intensity if intensity > 0 else 1.0
+        table = np.rint(255.0 * (values / 255.0) ** (1.0 / gamma))
+    elif filter_type == filter_pb2.FILTER_TYPE_SATURATION:
+        # Applied to an HSV image: scales S, leaves H and V untouched
+        saturation = np.floor(
+            np.clip(np.arange(256, dtype=np.float32) * np.float32(intensity), 0, 255)
+        )
+        table = np.stack([values, saturation, values], axis=-1)
+    else:
+        raise ValueError(f"Filter type {filter_type} has no lookup table")
+
+    lut = np.clip(table, 0, 255).astype(np.uint8).reshape(1, 256, -1)
+    lut.flags.writeable = False
+    return lut
+
+
+@functools.lru_cache(maxsize=256)
+def filter_kernel(filter_type, intensity, parameters=()):
+    """Convolution kernel (or box size for the blurs) of a filter, cached like point_lut"""
+    if filter_type in (filter_pb2.FILTER_TYPE_BLUR, filter_pb2.FILTER_TYPE_GAUSSIAN):
+        kernel_size = int(intensity * 10) + 1
+        if kernel_size % 2 == 0:
+            kernel_size += 1
+        return (kernel_size, kernel_size)
+
+    if filter_type == filter_pb2.FILTER_TYPE_SHARPEN:
+        kernel = np.array(
+            [[-1, -1, -1], [-1, 9 + intensity, -1], [-1, -1, -1]], dtype=np.float32
+        )
+        kernel.flags.writeable = False
+        return kernel
+
+    raise ValueError(f"Filter type {filter_type} has no kernel")
+
 
 class FilterServiceImplementation(filter_pb2_grpc.FilterServiceServicer):
     def __init__(self):
@@ -38,9 +105,15 @@ class FilterServiceImplementation(filter_pb2_grpc.FilterServiceServicer):
         # Create MinIO client pool for connection reuse
         self._create_minio_client()
 
+        # Maximum requests processed concurrently per streaming RPC
+        self.stream_max_in_flight = int(os.getenv("STREAM_MAX_IN_FLIGHT", "4"))
+
         # Performance optimization: pre-warm OpenCV filters
         self._warm_up()
 
+        # Health is probed in the background; health RPCs read the cached state
+        self.health_monitor = HealthMonitor(self._health_check, name="filter").start()
+
         try:
             cv2_path = getattr(cv2, "__file__", "<unknown>")
             cv2_ver = getattr(cv2, "__version__", "<unknown>")
@@ -75,18 +148,14 @@ class FilterServiceImplementation(filter_pb2_grpc.FilterServiceServicer):
             logger.warning(f"Warm-up failed: {e}")
 
     def _health_check(self):
-        """Internal health check method"""
-        try:
-            # Test MinIO connection
-            self.minio_client.list_buckets()
-            # Test OpenCV functionality
-            test_img = np.zeros((100, 100, 3), dtype=np.uint8)
-            # Avoid GaussianBlur; use simple blur
-            cv2.blur(test_img, (5, 5))
-            return True
-        except Exception as e:
-            logger.error(f"Health check failed: {e}")
-            return False
+        """Health probe run periodically by the health monitor"""
+        # Test MinIO connection
+        self.minio_client.list_buckets()
+        # Test OpenCV functionality
+        test_img = np.zeros((100, 100, 3), dtype=np.uint8)
+        # Avoid GaussianBlur; use simple blur
+        cv2.blur(test_img, (5, 5))
+        return True
 
     def ApplyFilter(self, request, context):
         """Handle filter application request"""
@@ -96,42 +165,7 @@ class FilterServiceImplementation(filter_pb2_grpc.FilterServiceServicer):
         )
 
         try:
-            local_input = f"/tmp/input_{request.execution_id}"
-            local_output = f"/tmp/output_{request.execution_id}"
-
-            # Check if input is direct bytes or MinIO reference
-            if request.HasField("input_bytes"):
-                # Handle direct byte input (for real-time streaming)
-                logger.info("Processing direct image bytes input")
-
-                # Write bytes directly to temporary file
-                with open(local_input, "wb") as f:
-                    f.write(request.input_bytes.data)
-
-                logger.info(
-                    f"Saved {len(request.input_bytes.data)} bytes to {local_input}"
-                )
-
-            elif request.HasField("input_image"):
-                # Handle MinIO reference input (for batch processing)
-                logger.info("Processing MinIO image reference input")
-
-                logger.info(
-                    f"Downloading {request.input_image.object_key} from bucket {request.input_image.bucket}"
-                )
-                self.minio_client.fget_object(
-                    request.input_image.bucket,
-                    request.input_image.object_key,
-                    local_input,
-                )
-            else:
-                raise ValueError("Request must have either input_bytes or input_image")
-
-            # Load image
-            image = cv2.imread(local_input)
-            if image is None:
-                raise ValueError(f"Could not read input image from {local_input}")
-
+            image = self._load_input(request)
             original_height, original_width = image.shape[:2]
             logger.info(f"Processing image size: {original_width}x{original_height}")
 
@@ -140,104 +174,25 @@ class FilterServiceImplementation(filter_pb2_grpc.FilterServiceServicer):
                 image, request.filter_type, request.intensity, request.parameters
             )
 
-            # For real-time processing (input_bytes), return direct bytes
-            if request.HasField("input_bytes"):
-                # Convert filtered image to JPEG bytes
-                # Convert BGR (OpenCV) to RGB (Pillow)
-                filtered_rgb = cv2.cvtColor(filtered_image, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(filtered_rgb)
-
-                # Save to bytes buffer
-                import io
-
-                img_buffer = io.BytesIO()
-                pil_image.save(img_buffer, format="JPEG", quality=85)
-                img_bytes = img_buffer.getvalue()
-
-                # Create response with direct bytes
-                response = filter_pb2.FilterResponse()
-                response.result.status = common_pb2.PROCESSING_STATUS_COMPLETED
-                response.result.message = f"Filter {filter_pb2.FilterType.Name(request.filter_type)} applied successfully"
-                response.result.output_data = img_bytes  # Store the actual image bytes
-
-                # Set metadata
-                response.result.output_image.content_type = "image/jpeg"
-                response.result.output_image.width = original_width
-                response.result.output_image.height = original_height  # Set timestamp
-                now = Timestamp()
-                now.FromDatetime(datetime.now(timezone.utc))
-                response.result.processed_at.CopyFrom(now)
-                response.result.processing_time_seconds = time.time() - start_time
-
-                # Set metadata
-                response.metadata.filter_type = request.filter_type
-                response.metadata.intensity = request.intensity
-                response.metadata.processing_time_ms = (time.time() - start_time) * 1000
-
-                logger.info(
-                    f"Filter applied successfully, returning {len(img_bytes)} bytes"
-                )
-
-                # Clean up
-                if os.path.exists(local_input):
-                    os.remove(local_input)
-
-                return response
-
-            # For MinIO-based processing (input_image), upload to MinIO
-            else:
-                # Save filtered image with workflow-expected naming
-                # ワークフローでは {execution_id}_final.jpg を期待している
-                execution_id = request.execution_id
-                output_path = f"{execution_id}_final.jpg"
-
-                # Use Pillow for reliable JPEG saving
-                # Convert BGR (OpenCV) to RGB (Pillow)
-                filtered_rgb = cv2.cvtColor(filtered_image, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(filtered_rgb)
-                pil_image.save(local_output, "JPEG", quality=85, optimize=True)
-
-                # Upload to MinIO
-                if not self.minio_client.bucket_exists(request.input_image.bucket):
-                    self.minio_client.make_bucket(request.input_image.bucket)
-
-                self.minio_client.fput_object(
-                    request.input_image.bucket, output_path, local_output
-                )
-                logger.info(f"Uploaded filtered image to {output_path}")
-
-                # Cleanup local files
-                if os.path.exists(local_input):
-                    os.remove(local_input)
-                if os.path.exists(local_output):
-                    os.remove(local_output)
-
-                processing_time = time.time() - start_time
-
-                # Create response
-                response = filter_pb2.FilterResponse()
+            response = filter_pb2.FilterResponse()
+            self._write_output(request, filtered_image, response.result)
 
-                # Set processing result
-                response.result.status = common_pb2.PROCESSING_STATUS_COMPLETED
-                response.result.message = f"Filter {filter_pb2.FilterType.Name(request.filter_type)} applied successfully"
+            processing_time = time.time() - start_time
 
-                # Set output image info
-                response.result.output_image.bucket = request.input_image.bucket
-                response.result.output_image.object_key = output_path
-                response.result.output_image.content_type = (
-                    "image/jpeg" if output_path.endswith(".jpg") else "image/png"
-                )
-                response.result.output_image.width = original_width
-                response.result.output_image.height = original_height
+            # Set processing result
+            response.result.status = common_pb2.PROCESSING_STATUS_COMPLETED
+            response.result.message = f"Filter {filter_pb2.FilterType.Name(request.filter_type)} applied successfully"
+            response.result.output_image.width = original_width
+            response.result.output_image.height = original_height
 
-                # Set timestamp
-                now = Timestamp()
-                now.FromDatetime(datetime.now(timezone.utc))
-                response.result.processed_at.CopyFrom(now)
-                response.result.processing_time_seconds = processing_time
+            # Set timestamp
+            now = Timestamp()
+            now.FromDatetime(datetime.now(timezone.utc))
+            response.result.processed_at.CopyFrom(now)
+            response.result.processing_time_seconds = processing_time
 
-                # Set metadata
-                response.metadata.filter_type = request.filter_type
+            # Set metadata
+            response.metadata.filter_type = request.filter_type
             response.metadata.intensity = request.intensity
             for key, value in request.parameters.items():
                 response.metadata.applied_parameters[key] = value
@@ -256,47 +211,187 @@ class FilterServiceImplementation(filter_pb2_grpc.FilterServiceServicer):
 
             return response
 
-    def _apply_filter(self, image, filter_type, intensity, parameters):
-        """Apply the specified filter to the image"""
+    def ApplyFilterChain(self, request, context):
+        """Apply an ordered list of filters to one decoded image.
+
+        The image is decoded once, each step writes into the same buffer
+        where the OpenCV operation allows it, and the result is encoded and
+        stored once, instead of a decode/encode/upload round trip per filter.
+        """
+        start_time = time.time()
+        logger.info(
+            f"Processing filter chain of {len(request.steps)} steps for execution_id: {request.execution_id}"
+        )
+
+        try:
+            if not request.steps:
+                raise ValueError("Filter chain must have at least one step")
+
+            image = self._load_input(request)
+            if not image.flags.writeable:
+                # Raw input is a read-only view of the request bytes
+                image = image.copy()
+            original_height, original_width = image.shape[:2]
+            logger.info(f"Processing image size: {original_width}x{original_height}")
+
+            response = filter_pb2.FilterChainResponse()
+            for step in request.steps:
+                step_start = time.perf_counter()
+                # The decoded buffer is owned by this request, so steps may overwrite it
+                image = self._apply_filter(
+                    image, step.filter_type, step.intensity, step.parameters, dst=image
+                )
+                metadata = response.steps.add()
+                metadata.filter_type = step.filter_type
+                metadata.intensity = step.intensity
+                for key, value in step.parameters.items():
+                    metadata.applied_parameters[key] = value
+                metadata.processing_time_ms = (time.perf_counter() - step_start) * 1000
+
+            self._write_output(request, image, response.result)
+
+            processing_time = time.time() - start_time
+            applied = ", ".join(
+                filter_pb2.FilterType.Name(step.filter_type) for step in request.steps
+            )
+
+            response.result.status = common_pb2.PROCESSING_STATUS_COMPLETED
+            response.result.message = f"Filters {applied} applied successfully"
+            response.result.output_image.width = original_width
+            response.result.output_image.height = original_height
+
+            now = Timestamp()
+            now.FromDatetime(datetime.now(timezone.utc))
+            response.result.processed_at.CopyFrom(now)
+            response.result.processing_time_seconds = processing_time
+
+            logger.info(
+                f"Filter chain of {len(request.steps)} steps applied in {processing_time:.2f}s"
+            )
+            return response
+
+        except Exception as e:
+            logger.error(f"Error processing filter chain request: {str(e)}")
+
+            response = filter_pb2.FilterChainResponse()
+            response.result.status = common_pb2.PROCESSING_STATUS_FAILED
+            response.result.message = f"Filter chain failed: {str(e)}"
+            response.result.processing_time_seconds = time.time() - start_time
+
+            return response
+
+    def _load_input(self, request):
+        """Decode the input image of a filter or filter chain request"""
+        # Check if input is direct bytes or MinIO reference
+        if request.HasField("input_bytes"):
+            # Handle direct byte input (for real-time streaming)
+            logger.info(
+                f"Processing direct image bytes input ({len(request.input_bytes.data)} bytes)"
+            )
+            return decode_image_bytes(request.input_bytes)
+
+        elif request.HasField("input_image"):
+            # Handle MinIO reference input (for batch processing)
+            logger.info("Processing MinIO image reference input")
+
+            logger.info(
+                f"Downloading {request.input_image.object_key} from bucket {request.input_image.bucket}"
+            )
+            return load_object_image(
+                self.minio_client,
+                request.input_image.bucket,
+                request.input_image.object_key,
+            )
+        else:
+            raise ValueError("Request must have either input_bytes or input_image")
+
+    def _write_output(self, request, image, result):
+        """Encode the filtered image and return it inline or upload it to MinIO"""
+        # For real-time processing (input_bytes), return direct bytes
+        if request.HasField("input_bytes"):
+            # Raw pixels for the next stage skip the JPEG round trip
+            if request.output_format.upper() == RAW_BGR8:
+                img_bytes = raw_image_data(image)
+                result.output_image.content_type = RAW_BGR8_CONTENT_TYPE
+            else:
+                img_bytes = encode_image(image, ".jpg", 85)
+                result.output_image.content_type = "image/jpeg"
+            result.output_data = img_bytes  # Store the actual image bytes
+            logger.info(
+                f"Filter applied successfully, returning {len(img_bytes)} bytes"
+            )
+
+        # For MinIO-based processing (input_image), upload to MinIO
+        else:
+            # Save filtered image with workflow-expected naming
+            # ワークフローでは {execution_id}_final.jpg を期待している
+            execution_id = request.execution_id
+            output_path = f"{execution_id}_final.jpg"
+
+            img_bytes = encode_image(image, ".jpg", 85, optimize=True)
+
+            # Upload to MinIO
+            if not self.minio_client.bucket_exists(request.input_image.bucket):
+                self.minio_client.make_bucket(request.input_image.bucket)
+
+            put_bytes(
+                self.minio_client,
+                request.input_image.bucket,
+                output_path,
+                img_bytes,
+            )
+            logger.info(f"Uploaded filtered image to {output_path}")
+
+            # Set output image info
+            result.output_image.bucket = request.input_image.bucket
+            result.output_image.object_key = output_path
+            result.output_image.content_type = content_type_for(output_path)
+            result.output_image.size_bytes = len(img_bytes)
+
+    def ApplyFilterStream(self, request_iterator, context):
+        """Handle a bidirectional stream of filter requests (pipelined, in-order)"""
+        logger.info(f"ApplyFilterStream started from {context.peer()}")
+        yield from _pipelined_stream(
+            request_iterator, context, self.ApplyFilter, self.stream_max_in_flight
+        )
+        logger.info(f"ApplyFilterStream ended for {context.peer()}")
+
+    def _apply_filter(self, image, filter_type, intensity, parameters, dst=None):
+        """Apply the specified filter to the image
+
+        dst may be the input image itself, which every filter then
+        overwrites in place.
+        """
         logger.info(
             f"Applying filter type: {filter_pb2.FilterType.Name(filter_type)} with intensity: {intensity}"
         )
 
-        if filter_type == filter_pb2.FILTER_TYPE_BLUR:
-            kernel_size = int(intensity * 10) + 1
-            if kernel_size % 2 == 0:
-                kernel_size += 1
-            return cv2.blur(image, (kernel_size, kernel_size))
+        # Lookup tables and kernels depend only on these, so they are built once
+        key = (filter_type, intensity, tuple(sorted(parameters.items())))
 
-        elif filter_type == filter_pb2.FILTER_TYPE_GAUSSIAN:
-            # Replace GaussianBlur with simple box blur approximation
-            kernel_size = int(intensity * 10) + 1
-            if kernel_size % 2 == 0:
-                kernel_size += 1
-            return cv2.blur(image, (kernel_size, kernel_size))
+        if filter_type in (
+            filter_pb2.FILTER_TYPE_BLUR,
+            filter_pb2.FILTER_TYPE_GAUSSIAN,
+        ):
+            # GAUSSIAN uses the same box blur approximation
+            return cv2.blur(image, filter_kernel(*key), dst=dst)
 
         elif filter_type == filter_pb2.FILTER_TYPE_SHARPEN:
-            kernel = np.array([[-1, -1, -1], [-1, 9 + intensity, -1], [-1, -1, -1]])
-            return cv2.filter2D(image, -1, kernel)
+            return cv2.filter2D(image, -1, filter_kernel(*key), dst=dst)
 
-        elif filter_type == filter_pb2.FILTER_TYPE_BRIGHTNESS:
-            # Adjust brightness
-            brightness_value = int((intensity - 0.5) * 100)
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            hsv[:, :, 2] = cv2.add(hsv[:, :, 2], brightness_value)
-            return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+        elif filter_type in POINT_FILTERS:
+            return cv2.LUT(image, point_lut(*key), dst=dst)
 
         elif filter_type == filter_pb2.FILTER_TYPE_CONTRAST:
             # Adjust contrast
             alpha = intensity  # Contrast control (1.0-3.0)
-            return cv2.convertScaleAbs(image, alpha=alpha, beta=0)
+            return cv2.convertScaleAbs(image, dst=dst, alpha=alpha, beta=0)
 
         elif filter_type == filter_pb2.FILTER_TYPE_SATURATION:
-            # Adjust saturation
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV).astype(np.float32)
-            hsv[:, :, 1] = hsv[:, :, 1] * intensity
-            hsv[:, :, 1] = np.clip(hsv[:, :, 1], 0, 255)
-            return cv2.cvtColor(hsv.astype(np.uint8), cv2.COLOR_HSV2BGR)
+            # Scale the S channel only: H and V map through identity tables
+            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+            cv2.LUT(hsv, point_lut(*key), dst=hsv)
+            return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR, dst=dst)
 
         else:
             logger.warning(
@@ -305,49 +400,94 @@ class FilterServiceImplementation(filter_pb2_grpc.FilterServiceServicer):
             return image
 
     def Health(self, request, context):
-        """Health check endpoint with actual service verification"""
+        """Health check endpoint answered from the cached probe state"""
         response = common_pb2.HealthCheckResponse()
 
-        if self._health_check():
+        if self.health_monitor.serving:
             response.status = common_pb2.HealthCheckResponse.SERVING
-            logger.debug("Filter service health check passed")
         else:
             response.status = common_pb2.HealthCheckResponse.NOT_SERVING
-            logger.warning("Filter service health check failed")
 
         return response
 
 
+def _pipelined_stream(request_iterator, context, handler, max_in_flight):
+    """Run handler over a request stream with bounded concurrency.
+
+    A reader thread pulls requests and submits them to a per-stream pool, so
+    decoding frame N+1 overlaps processing of frame N. At most max_in_flight
+    requests are outstanding and responses are yielded in request order.
+    """
+    executor = futures.ThreadPoolExecutor(
+        max_workers=max_in_flight, thread_name_prefix="stream"
+    )
+    in_flight = threading.Semaphore(max_in_flight)
+    pending = queue.Queue()
+    stopped = threading.Event()
+    end_of_stream = object()
+
+    def read_requests():
+        try:
+            for request in request_iterator:
+                while not in_flight.acquire(timeout=0.5):
+                    if stopped.is_set():
+                        return
+                if stopped.is_set():
+                    return
+                pending.put(executor.submit(handler, request, context))
+        except Exception as e:
+            if not stopped.is_set():
+                logger.warning(f"Request stream ended with error: {e}")
+        finally:
+            pending.put(end_of_stream)
+
+    threading.Thread(target=read_requests, name="stream-reader", daemon=True).start()
+
+    try:
+        while True:
+            item = pending.get()
+            if item is end_of_stream:
+                break
+            response = item.result()
+            in_flight.release()
+            yield response
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 class HealthServiceImplementation(health_pb2_grpc.HealthServicer):
-    """Standard gRPC health check service implementation"""
+    """Standard gRPC health service answered from the cached probe state"""
 
     def __init__(self, filter_service):
         self.filter_service = filter_service
+        self.health_monitor = filter_service.health_monitor
+
+    @staticmethod
+    def _response(serving):
+        return health_pb2.HealthCheckResponse(
+            status=(
+                health_pb2.HealthCheckResponse.SERVING
+                if serving
+                else health_pb2.HealthCheckResponse.NOT_SERVING
+            )
+        )
 
     def Check(self, request, context):
-        """Standard gRPC health check implementation"""
-        response = health_pb2.HealthCheckResponse()
-
-        if self.filter_service._health_check():
-            response.status = health_pb2.HealthCheckResponse.SERVING
-            logger.debug("Filter service health check passed")
-        else:
-            response.status = health_pb2.HealthCheckResponse.NOT_SERVING
-            logger.warning("Filter service health check failed")
-
-        return response
+        """Return the last background probe result without probing"""
+        return self._response(self.health_monitor.serving)
 
     def Watch(self, request, context):
-        """Health check watch implementation (streaming)"""
-        # For simplicity, just return current status
-        response = health_pb2.HealthCheckResponse()
-
-        if self.filter_service._health_check():
-            response.status = health_pb2.HealthCheckResponse.SERVING
-        else:
-            response.status = health_pb2.HealthCheckResponse.NOT_SERVING
-
-        yield response
+        """Stream the current status, then every status transition"""
+        serving, version = self.health_monitor.snapshot()
+        yield self._response(serving)
+        while context.is_active():
+            serving, new_version = self.health_monitor.wait_for_change(
+                version, timeout=1.0
+            )
+            if new_version != version:
+                version = new_version
+                yield self._response(serving)
 
 
 def serve():
@@ -357,6 +497,8 @@ def serve():
     # Optimize thread pool for filter operations
     max_workers = int(os.getenv("GRPC_MAX_WORKERS", "20"))
 
+    max_message_bytes = int(os.getenv("GRPC_MAX_MESSAGE_MB", "32")) * 1024 * 1024
+
     # Configure server options for better performance
     server_options = [
         ("grpc.keepalive_time_ms", 30000),
@@ -367,6 +509,9 @@ def serve():
         ("grpc.http2.min_ping_interval_without_data_ms", 5000),
         ("grpc.max_connection_idle_ms", 300000),
         ("grpc.max_connection_age_ms", 600000),
+        # Raw pixel frames between stages exceed the 4MB default (1080p BGR is ~6MB)
+        ("grpc.max_send_message_length", max_message_bytes),
+        ("grpc.max_receive_message_length", max_message_bytes),
     ]
 
     server = grpc.server(
@@ -0,0 +1,236 @@
+import io
+import os
+import time
+import logging
+import tempfile
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Opt-in disk spill for oversized MinIO objects (disabled unless IMAGE_SPILL_DIR is set)
+IMAGE_SPILL_DIR = os.getenv("IMAGE_SPILL_DIR", "")
+IMAGE_SPILL_THRESHOLD_BYTES = int(
+    float(os.getenv("IMAGE_SPILL_THRESHOLD_MB", "64")) * 1024 * 1024
+)
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
+_CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".bmp": "image/bmp",
+    ".tiff": "image/tiff",
+    ".webp": "image/webp",
+}
+
+
+# ImageBytes format of undecoded 8-bit BGR pixels passed between pipeline
+# stages, and the content type of such inline results
+RAW_BGR8 = "RAW_BGR8"
+RAW_BGR8_CONTENT_TYPE = "image/x-raw-bgr8"
+
+# cv2.imdecode flags that scale JPEGs down in the DCT domain while decoding
+REDUCED_DECODE_FLAGS = {
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+# Start-of-frame markers carrying the image size (baseline, progressive, ...)
+_JPEG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF,
+}  # fmt: skip
+
+
+def content_type_for(path):
+    """Return the MIME type for an object key based on its extension"""
+    return _CONTENT_TYPES.get(os.path.splitext(path)[1].lower(), "image/jpeg")
+
+
+def decode_image(data, flags=cv2.IMREAD_COLOR):
+    """Decode encoded image bytes (JPEG/PNG/...) into a BGR ndarray"""
+    if not data:
+        raise ValueError("Empty image data")
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
+    if image is None:
+        raise ValueError(f"Could not decode image data ({len(data)} bytes)")
+    return image
+
+
+def decode_image_bytes(image_bytes, flags=cv2.IMREAD_COLOR):
+    """BGR ndarray of an ImageBytes message.
+
+    RAW_BGR8 pixels are wrapped without copying, so the array is read-only
+    and flags do not apply; any other format is decoded with decode_image.
+    """
+    if image_bytes.format.upper() != RAW_BGR8:
+        return decode_image(image_bytes.data, flags)
+    width, height = image_bytes.width, image_bytes.height
+    stride = image_bytes.stride or width * 3
+    data = image_bytes.data
+    if width <= 0 or height <= 0 or stride < width * 3:
+        raise ValueError(
+            f"Invalid raw image geometry {width}x{height}, stride {stride}"
+        )
+    if len(data) < stride * (height - 1) + width * 3:
+        raise ValueError(
+            f"Raw image data too short for {width}x{height} ({len(data)} bytes)"
+        )
+    return np.ndarray(
+        (height, width, 3), dtype=np.uint8, buffer=data, strides=(stride, 3, 1)
+    )
+
+
+def raw_image_data(image):
+    """Packed RAW_BGR8 bytes of a BGR ndarray (stride = width * 3)"""
+    return np.ascontiguousarray(image).tobytes()
+
+
+def _exif_orientation(segment):
+    """EXIF orientation tag (1-8) of an APP1 segment payload, or 1"""
+    if segment[:6] != b"Exif\x00\x00" or len(segment) < 14:
+        return 1
+    tiff = segment[6:]
+    order = "little" if tiff[:2] == b"II" else "big"
+    offset = int.from_bytes(tiff[4:8], order)
+    if offset + 2 > len(tiff):
+        return 1
+    count = int.from_bytes(tiff[offset : offset + 2], order)
+    for entry in range(offset + 2, min(offset + 2 + count * 12, len(tiff) - 11), 12):
+        if int.from_bytes(tiff[entry : entry + 2], order) == 0x0112:
+            return int.from_bytes(tiff[entry + 8 : entry + 10], order)
+    return 1
+
+
+def jpeg_dimensions(data):
+    """(width, height) of a JPEG as cv2.imdecode returns it, or None if not a JPEG.
+
+    Only the marker segments up to the start-of-frame are walked, so this is
+    cheap enough to run before deciding how to decode. The size is swapped
+    when the EXIF orientation rotates the image by 90 degrees, since
+    decoding applies that rotation.
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+    i, end = 2, len(data)
+    orientation = 1
+    while i + 9 <= end:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # segments without length
+            i += 2
+            continue
+        length = int.from_bytes(data[i + 2 : i + 4], "big")
+        if marker == 0xE1 and orientation == 1:
+            orientation = _exif_orientation(bytes(data[i + 4 : i + 2 + length]))
+        elif marker in _JPEG_SOF_MARKERS:
+            height = int.from_bytes(data[i + 5 : i + 7], "big")
+            width = int.from_bytes(data[i + 7 : i + 9], "big")
+            return (height, width) if orientation >= 5 else (width, height)
+        i += 2 + length
+    return None
+
+
+def reduced_decode_factor(source_size, target_size):
+    """Largest JPEG DCT scale-down (8, 4 or 2) whose result still covers target_size.
+
+    Returns 1 when the target is less than 2x smaller than the source.
+    """
+    width, height = source_size
+    target_width, target_height = target_size
+    for factor in (8, 4, 2):
+        if width // factor >= target_width and height // factor >= target_height:
+            return factor
+    return 1
+
+
+def load_object_image(
+    minio_client,
+    bucket,
+    object_key,
+    flags=cv2.IMREAD_COLOR,
+    flags_for=None,
+    timings=None,
+):
+    """Download and decode a MinIO image without touching the local disk.
+
+    When IMAGE_SPILL_DIR is set, objects larger than IMAGE_SPILL_THRESHOLD_MB
+    are streamed to a uniquely named file there and decoded from disk.
+    flags_for, if given, picks the decode flags from the encoded bytes (the
+    first chunk for spilled objects). timings, if given, receives the
+    "download" and "decode" durations in seconds.
+    """
+    start = time.perf_counter()
+    response = minio_client.get_object(bucket, object_key)
+    try:
+        size = int(response.headers.get("Content-Length", 0) or 0)
+        if IMAGE_SPILL_DIR and size > IMAGE_SPILL_THRESHOLD_BYTES:
+            return _decode_spilled(
+                response, flags, object_key, size, flags_for, timings, start
+            )
+        data = response.read()
+    finally:
+        response.close()
+        response.release_conn()
+
+    decode_start = time.perf_counter()
+    if flags_for is not None:
+        flags = flags_for(data)
+    image = decode_image(data, flags)
+    if timings is not None:
+        timings["download"] = decode_start - start
+        timings["decode"] = time.perf_counter() - decode_start
+    return image
+
+
+def _decode_spilled(response, flags, object_key, size, flags_for, timings, start):
+    logger.info(f"Spilling {object_key} ({size} bytes) to {IMAGE_SPILL_DIR}")
+    suffix = os.path.splitext(object_key)[1]
+    with tempfile.NamedTemporaryFile(dir=IMAGE_SPILL_DIR, suffix=suffix) as spill:
+        for chunk in response.stream(_STREAM_CHUNK_SIZE):
+            if flags_for is not None:
+                flags, flags_for = flags_for(chunk), None
+            spill.write(chunk)
+        spill.flush()
+        decode_start = time.perf_counter()
+        image = cv2.imread(spill.name, flags)
+    if image is None:
+        raise ValueError(f"Could not decode spilled image {object_key}")
+    if timings is not None:
+        timings["download"] = decode_start - start
+        timings["decode"] = time.perf_counter() - decode_start
+    return image
+
+
+def encode_image(image, ext=".jpg", quality=85, optimize=False):
+    """Encode a BGR ndarray into image bytes with cv2.imencode"""
+    params = []
+    if ext.lower() in (".jpg", ".jpeg"):
+        params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+        if optimize:
+            params += [cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+    elif ext.lower() == ".webp":
+        params = [cv2.IMWRITE_WEBP_QUALITY, int(quality)]
+    ok, buffer = cv2.imencode(ext, image, params)
+    if not ok:
+        raise ValueError(f"Could not encode image as {ext}")
+    return buffer.tobytes()
+
+
+def put_bytes(minio_client, bucket, object_key, data, content_type=None, metadata=None):
+    """Upload an in-memory buffer to MinIO with put_object"""
+    minio_client.put_object(
+        bucket,
+        object_key,
+        io.BytesIO(data),
+        length=len(data),
+        content_type=content_type or content_type_for(object_key),
+        metadata=metadata,
+    )
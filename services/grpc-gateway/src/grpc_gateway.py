@@ -249,6 +249,7 @@ async def apply_filter(request: FilterRequestModel):
             "FILTER_TYPE_BRIGHTNESS": filter_pb2.FILTER_TYPE_BRIGHTNESS,
             "FILTER_TYPE_CONTRAST": filter_pb2.FILTER_TYPE_CONTRAST,
             "FILTER_TYPE_SATURATION": filter_pb2.FILTER_TYPE_SATURATION,
+            "FILTER_TYPE_GAMMA": filter_pb2.FILTER_TYPE_GAMMA,
         }
         grpc_request.filter_type = filter_type_map.get(
             request.filter_type, filter_pb2.FILTER_TYPE_BLUR
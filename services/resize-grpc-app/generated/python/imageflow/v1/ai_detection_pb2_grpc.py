@@ -51,6 +51,16 @@ class AIDetectionServiceStub(object):
                 request_serializer=imageflow_dot_v1_dot_common__pb2.HealthCheckRequest.SerializeToString,
                 response_deserializer=imageflow_dot_v1_dot_common__pb2.HealthCheckResponse.FromString,
                 _registered_method=True)
+        self.RenderAnnotations = channel.unary_unary(
+                '/imageflow.v1.AIDetectionService/RenderAnnotations',
+                request_serializer=imageflow_dot_v1_dot_ai__detection__pb2.AnnotationRequest.SerializeToString,
+                response_deserializer=imageflow_dot_v1_dot_ai__detection__pb2.AnnotationResponse.FromString,
+                _registered_method=True)
+        self.InvalidateResultCache = channel.unary_unary(
+                '/imageflow.v1.AIDetectionService/InvalidateResultCache',
+                request_serializer=imageflow_dot_v1_dot_ai__detection__pb2.ResultCacheInvalidationRequest.SerializeToString,
+                response_deserializer=imageflow_dot_v1_dot_ai__detection__pb2.ResultCacheInvalidationResponse.FromString,
+                _registered_method=True)
 
 
 class AIDetectionServiceServicer(object):
@@ -75,6 +85,20 @@ class AIDetectionServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def RenderAnnotations(self, request, context):
+        """Render the annotated image of a detection run on first fetch (lazy annotation mode)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def InvalidateResultCache(self, request, context):
+        """Drop cached detection results of a model version after the model is updated
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_AIDetectionServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -93,6 +117,16 @@ def add_AIDetectionServiceServicer_to_server(servicer, server):
                     request_deserializer=imageflow_dot_v1_dot_common__pb2.HealthCheckRequest.FromString,
                     response_serializer=imageflow_dot_v1_dot_common__pb2.HealthCheckResponse.SerializeToString,
             ),
+            'RenderAnnotations': grpc.unary_unary_rpc_method_handler(
+                    servicer.RenderAnnotations,
+                    request_deserializer=imageflow_dot_v1_dot_ai__detection__pb2.AnnotationRequest.FromString,
+                    response_serializer=imageflow_dot_v1_dot_ai__detection__pb2.AnnotationResponse.SerializeToString,
+            ),
+            'InvalidateResultCache': grpc.unary_unary_rpc_method_handler(
+                    servicer.InvalidateResultCache,
+                    request_deserializer=imageflow_dot_v1_dot_ai__detection__pb2.ResultCacheInvalidationRequest.FromString,
+                    response_serializer=imageflow_dot_v1_dot_ai__detection__pb2.ResultCacheInvalidationResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'imageflow.v1.AIDetectionService', rpc_method_handlers)
@@ -185,3 +219,57 @@ class AIDetectionService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def RenderAnnotations(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/imageflow.v1.AIDetectionService/RenderAnnotations',
+            imageflow_dot_v1_dot_ai__detection__pb2.AnnotationRequest.SerializeToString,
+            imageflow_dot_v1_dot_ai__detection__pb2.AnnotationResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def InvalidateResultCache(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/imageflow.v1.AIDetectionService/InvalidateResultCache',
+            imageflow_dot_v1_dot_ai__detection__pb2.ResultCacheInvalidationRequest.SerializeToString,
+            imageflow_dot_v1_dot_ai__detection__pb2.ResultCacheInvalidationResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
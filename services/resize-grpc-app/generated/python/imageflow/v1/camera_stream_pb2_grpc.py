@@ -40,6 +40,11 @@ class CameraStreamProcessorStub(object):
                 request_serializer=imageflow_dot_v1_dot_camera__stream__pb2.VideoFrame.SerializeToString,
                 response_deserializer=imageflow_dot_v1_dot_camera__stream__pb2.ProcessedFrame.FromString,
                 _registered_method=True)
+        self.InvalidatePipelineCache = channel.unary_unary(
+                '/imageflow.v1.CameraStreamProcessor/InvalidatePipelineCache',
+                request_serializer=imageflow_dot_v1_dot_camera__stream__pb2.PipelineCacheInvalidationRequest.SerializeToString,
+                response_deserializer=imageflow_dot_v1_dot_camera__stream__pb2.PipelineCacheInvalidationResponse.FromString,
+                _registered_method=True)
 
 
 class CameraStreamProcessorServicer(object):
@@ -53,6 +58,13 @@ class CameraStreamProcessorServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def InvalidatePipelineCache(self, request, context):
+        """Refetch cached pipeline definitions after a pipeline is saved or deleted
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_CameraStreamProcessorServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -61,6 +73,11 @@ def add_CameraStreamProcessorServicer_to_server(servicer, server):
                     request_deserializer=imageflow_dot_v1_dot_camera__stream__pb2.VideoFrame.FromString,
                     response_serializer=imageflow_dot_v1_dot_camera__stream__pb2.ProcessedFrame.SerializeToString,
             ),
+            'InvalidatePipelineCache': grpc.unary_unary_rpc_method_handler(
+                    servicer.InvalidatePipelineCache,
+                    request_deserializer=imageflow_dot_v1_dot_camera__stream__pb2.PipelineCacheInvalidationRequest.FromString,
+                    response_serializer=imageflow_dot_v1_dot_camera__stream__pb2.PipelineCacheInvalidationResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'imageflow.v1.CameraStreamProcessor', rpc_method_handlers)
@@ -99,3 +116,30 @@ class CameraStreamProcessor(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def InvalidatePipelineCache(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/imageflow.v1.CameraStreamProcessor/InvalidatePipelineCache',
+            imageflow_dot_v1_dot_camera__stream__pb2.PipelineCacheInvalidationRequest.SerializeToString,
+            imageflow_dot_v1_dot_camera__stream__pb2.PipelineCacheInvalidationResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -25,21 +25,29 @@ _sym_db = _symbol_database.Default()
 from imageflow.v1 import common_pb2 as imageflow_dot_v1_dot_common__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x19imageflow/v1/resize.proto\x12\x0cimageflow.v1\x1a\x19imageflow/v1/common.proto\"\x89\x02\n\rResizeRequest\x12.\n\x0binput_image\x18\x01 \x01(\x0b\x32\x17.imageflow.v1.ImageDataH\x00\x12/\n\x0binput_bytes\x18\x07 \x01(\x0b\x32\x18.imageflow.v1.ImageBytesH\x00\x12\x14\n\x0ctarget_width\x18\x02 \x01(\x05\x12\x15\n\rtarget_height\x18\x03 \x01(\x05\x12\x1d\n\x15maintain_aspect_ratio\x18\x04 \x01(\x08\x12,\n\x07quality\x18\x05 \x01(\x0e\x32\x1b.imageflow.v1.ResizeQuality\x12\x14\n\x0c\x65xecution_id\x18\x06 \x01(\tB\x07\n\x05input\"p\n\x0eResizeResponse\x12.\n\x06result\x18\x01 \x01(\x0b\x32\x1e.imageflow.v1.ProcessingResult\x12.\n\x08metadata\x18\x02 \x01(\x0b\x32\x1c.imageflow.v1.ResizeMetadata\"\xd1\x01\n\x0eResizeMetadata\x12\x16\n\x0eoriginal_width\x18\x01 \x01(\x05\x12\x17\n\x0foriginal_height\x18\x02 \x01(\x05\x12\x14\n\x0coutput_width\x18\x03 \x01(\x05\x12\x15\n\routput_height\x18\x04 \x01(\x05\x12\x16\n\x0escale_factor_x\x18\x05 \x01(\x01\x12\x16\n\x0escale_factor_y\x18\x06 \x01(\x01\x12\x31\n\x0cquality_used\x18\x07 \x01(\x0e\x32\x1b.imageflow.v1.ResizeQuality*z\n\rResizeQuality\x12\x1e\n\x1aRESIZE_QUALITY_UNSPECIFIED\x10\x00\x12\x17\n\x13RESIZE_QUALITY_FAST\x10\x01\x12\x17\n\x13RESIZE_QUALITY_GOOD\x10\x02\x12\x17\n\x13RESIZE_QUALITY_BEST\x10\x03\x32\xfc\x01\n\rResizeService\x12H\n\x0bResizeImage\x12\x1b.imageflow.v1.ResizeRequest\x1a\x1c.imageflow.v1.ResizeResponse\x12R\n\x11ResizeImageStream\x12\x1b.imageflow.v1.ResizeRequest\x1a\x1c.imageflow.v1.ResizeResponse(\x01\x30\x01\x12M\n\x06Health\x12 .imageflow.v1.HealthCheckRequest\x1a!.imageflow.v1.HealthCheckResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x19imageflow/v1/resize.proto\x12\x0cimageflow.v1\x1a\x19imageflow/v1/common.proto\"\xa0\x02\n\rResizeRequest\x12.\n\x0binput_image\x18\x01 \x01(\x0b\x32\x17.imageflow.v1.ImageDataH\x00\x12/\n\x0binput_bytes\x18\x07 \x01(\x0b\x32\x18.imageflow.v1.ImageBytesH\x00\x12\x14\n\x0ctarget_width\x18\x02 \x01(\x05\x12\x15\n\rtarget_height\x18\x03 \x01(\x05\x12\x1d\n\x15maintain_aspect_ratio\x18\x04 \x01(\x08\x12,\n\x07quality\x18\x05 \x01(\x0e\x32\x1b.imageflow.v1.ResizeQuality\x12\x14\n\x0c\x65xecution_id\x18\x06 \x01(\t\x12\x15\n\routput_format\x18\x08 \x01(\tB\x07\n\x05input\"\x98\x01\n\x0cResizeTarget\x12\x14\n\x0ctarget_width\x18\x01 \x01(\x05\x12\x15\n\rtarget_height\x18\x02 \x01(\x05\x12\x1d\n\x15maintain_aspect_ratio\x18\x03 \x01(\x08\x12,\n\x07quality\x18\x04 \x01(\x0e\x32\x1b.imageflow.v1.ResizeQuality\x12\x0e\n\x06\x66ormat\x18\x05 \x01(\t\"\xc1\x01\n\x12ResizeMultiRequest\x12.\n\x0binput_image\x18\x01 \x01(\x0b\x32\x17.imageflow.v1.ImageDataH\x00\x12/\n\x0binput_bytes\x18\x02 \x01(\x0b\x32\x18.imageflow.v1.ImageBytesH\x00\x12+\n\x07targets\x18\x03 \x03(\x0b\x32\x1a.imageflow.v1.ResizeTarget\x12\x14\n\x0c\x65xecution_id\x18\x04 \x01(\tB\x07\n\x05input\"r\n\x13ResizeMultiResponse\x12.\n\x06result\x18\x01 \x01(\x0b\x32\x1e.imageflow.v1.ProcessingResult\x12+\n\x07outputs\x18\x02 \x03(\x0b\x32\x1a.imageflow.v1.ResizeOutput\"\x82\x01\n\x0cResizeOutput\x12-\n\x0coutput_image\x18\x01 \x01(\x0b\x32\x17.imageflow.v1.ImageData\x12\x13\n\x0boutput_data\x18\x02 \x01(\x0c\x12.\n\x08metadata\x18\x03 \x01(\x0b\x32\x1c.imageflow.v1.ResizeMetadata\"p\n\x0eResizeResponse\x12.\n\x06result\x18\x01 \x01(\x0b\x32\x1e.imageflow.v1.ProcessingResult\x12.\n\x08metadata\x18\x02 \x01(\x0b\x32\x1c.imageflow.v1.ResizeMetadata\"\xc6\x02\n\x0eResizeMetadata\x12\x16\n\x0eoriginal_width\x18\x01 \x01(\x05\x12\x17\n\x0foriginal_height\x18\x02 \x01(\x05\x12\x14\n\x0coutput_width\x18\x03 \x01(\x05\x12\x15\n\routput_height\x18\x04 \x01(\x05\x12\x16\n\x0escale_factor_x\x18\x05 \x01(\x01\x12\x16\n\x0escale_factor_y\x18\x06 \x01(\x01\x12\x31\n\x0cquality_used\x18\x07 \x01(\x0e\x32\x1b.imageflow.v1.ResizeQuality\x12\x16\n\x0e\x64\x65\x63ode_time_ms\x18\x08 \x01(\x01\x12\x16\n\x0eresize_time_ms\x18\t \x01(\x01\x12\x16\n\x0e\x65ncode_time_ms\x18\n \x01(\x01\x12\x18\n\x10\x64\x65\x63ode_reduction\x18\x0b \x01(\x05\x12\x11\n\tcache_hit\x18\x0c \x01(\x08*z\n\rResizeQuality\x12\x1e\n\x1aRESIZE_QUALITY_UNSPECIFIED\x10\x00\x12\x17\n\x13RESIZE_QUALITY_FAST\x10\x01\x12\x17\n\x13RESIZE_QUALITY_GOOD\x10\x02\x12\x17\n\x13RESIZE_QUALITY_BEST\x10\x03\x32\xd5\x02\n\rResizeService\x12H\n\x0bResizeImage\x12\x1b.imageflow.v1.ResizeRequest\x1a\x1c.imageflow.v1.ResizeResponse\x12R\n\x11ResizeImageStream\x12\x1b.imageflow.v1.ResizeRequest\x1a\x1c.imageflow.v1.ResizeResponse(\x01\x30\x01\x12W\n\x10ResizeImageMulti\x12 .imageflow.v1.ResizeMultiRequest\x1a!.imageflow.v1.ResizeMultiResponse\x12M\n\x06Health\x12 .imageflow.v1.HealthCheckRequest\x1a!.imageflow.v1.HealthCheckResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'imageflow.v1.resize_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_RESIZEQUALITY']._serialized_start=664
-  _globals['_RESIZEQUALITY']._serialized_end=786
+  _globals['_RESIZEQUALITY']._serialized_start=1404
+  _globals['_RESIZEQUALITY']._serialized_end=1526
   _globals['_RESIZEREQUEST']._serialized_start=71
-  _globals['_RESIZEREQUEST']._serialized_end=336
-  _globals['_RESIZERESPONSE']._serialized_start=338
-  _globals['_RESIZERESPONSE']._serialized_end=450
-  _globals['_RESIZEMETADATA']._serialized_start=453
-  _globals['_RESIZEMETADATA']._serialized_end=662
-  _globals['_RESIZESERVICE']._serialized_start=789
-  _globals['_RESIZESERVICE']._serialized_end=1041
+  _globals['_RESIZEREQUEST']._serialized_end=359
+  _globals['_RESIZETARGET']._serialized_start=362
+  _globals['_RESIZETARGET']._serialized_end=514
+  _globals['_RESIZEMULTIREQUEST']._serialized_start=517
+  _globals['_RESIZEMULTIREQUEST']._serialized_end=710
+  _globals['_RESIZEMULTIRESPONSE']._serialized_start=712
+  _globals['_RESIZEMULTIRESPONSE']._serialized_end=826
+  _globals['_RESIZEOUTPUT']._serialized_start=829
+  _globals['_RESIZEOUTPUT']._serialized_end=959
+  _globals['_RESIZERESPONSE']._serialized_start=961
+  _globals['_RESIZERESPONSE']._serialized_end=1073
+  _globals['_RESIZEMETADATA']._serialized_start=1076
+  _globals['_RESIZEMETADATA']._serialized_end=1402
+  _globals['_RESIZESERVICE']._serialized_start=1529
+  _globals['_RESIZESERVICE']._serialized_end=1870
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,263 @@
+import os
+import hashlib
+import logging
+import threading
+import time
+
+from minio.commonconfig import ENABLED, CopySource, Filter
+from minio.deleteobjects import DeleteObject
+from minio.error import S3Error
+from minio.lifecycleconfig import Expiration, LifecycleConfig, Rule
+
+from image_io import put_bytes
+
+logger = logging.getLogger(__name__)
+
+# Object metadata stored with each derivative, so hits need no decoding
+_META_PREFIX = "x-amz-meta-"
+_META_FIELDS = ("width", "height", "source-width", "source-height")
+
+
+class CachedDerivative:
+    __slots__ = ("bucket", "object_key", "size", "dimensions")
+
+    def __init__(self, bucket, object_key, size, dimensions):
+        self.bucket = bucket
+        self.object_key = object_key
+        self.size = size
+        # width, height, source-width, source-height (0 when unknown)
+        self.dimensions = dimensions
+
+
+class DerivativeCache:
+    """Content-addressed store of resized images in a dedicated MinIO bucket.
+
+    A derivative's key is derived from the source object's ETag and the
+    resize parameters (target size, aspect flag, quality), so any request
+    for an unchanged source and the same spec finds it with a single
+    stat_object, whichever execution produced it. Executions never point
+    at a derivative itself but at their own copy of it (copy_to, a
+    server-side copy), so derivatives can be removed at any time.
+
+    The cache bucket holds nothing but derivatives. Its size is bounded by
+    max_bytes: a background sweep lists the bucket every sweep_seconds and
+    removes the oldest derivatives beyond the bound (the bound can be
+    exceeded by what is written between two sweeps). Optionally a MinIO
+    lifecycle rule on the bucket also expires derivatives after
+    expiry_days.
+    """
+
+    # Lifecycle rule id of the expiry rule, so other rules are left alone
+    LIFECYCLE_RULE_ID = "imageflow-derivative-cache-expiry"
+
+    def __init__(
+        self,
+        minio_client,
+        bucket=None,
+        prefix="derivatives",
+        max_bytes=None,
+        expiry_days=None,
+        sweep_seconds=None,
+    ):
+        self.minio_client = minio_client
+        self.bucket = bucket or os.getenv(
+            "DERIVATIVE_CACHE_BUCKET", "imageflow-derivatives"
+        )
+        self.prefix = prefix
+        # 0 disables the size bound / the expiry rule
+        self.max_bytes = (
+            int(float(os.getenv("DERIVATIVE_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+            if max_bytes is None
+            else max_bytes
+        )
+        self.expiry_days = (
+            int(os.getenv("DERIVATIVE_CACHE_EXPIRY_DAYS", "7"))
+            if expiry_days is None
+            else expiry_days
+        )
+        self.sweep_seconds = (
+            float(os.getenv("DERIVATIVE_CACHE_SWEEP_SECONDS", "300"))
+            if sweep_seconds is None
+            else sweep_seconds
+        )
+
+        self._lock = threading.Lock()
+        self._bucket_ready = False
+
+        self._hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+        self._stores = 0
+        self._evictions = 0
+        # Exact after each sweep, plus what was stored since
+        self._stored_bytes = 0
+
+    def start(self):
+        """Create the cache bucket and start the size-bound sweeper"""
+        self.ensure_bucket()
+        if self.sweep_seconds > 0:
+            threading.Thread(
+                target=self._sweep_loop, name="derivative-cache-sweeper", daemon=True
+            ).start()
+        return self
+
+    def ensure_bucket(self):
+        """Create the cache bucket and its expiry rule if needed; True if ready"""
+        if self._bucket_ready:
+            return True
+        try:
+            if not self.minio_client.bucket_exists(self.bucket):
+                self.minio_client.make_bucket(self.bucket)
+                logger.info(f"Created derivative cache bucket {self.bucket}")
+            self._ensure_expiry()
+        except Exception as e:
+            logger.warning(f"Derivative cache bucket {self.bucket} not ready: {e}")
+            return False
+        self._bucket_ready = True
+        return True
+
+    def key_for(
+        self, etag, target_width, target_height, maintain_aspect_ratio, quality
+    ):
+        etag = etag.strip('"')
+        raw = f"{etag}|{target_width}x{target_height}|{int(maintain_aspect_ratio)}|{quality}"
+        digest = hashlib.blake2b(raw.encode("utf-8"), digest_size=20).hexdigest()
+        return f"{self.prefix}/{digest[:2]}/{digest}.jpg"
+
+    def lookup(self, object_key, source_size=0):
+        """Return the CachedDerivative if it exists (one stat_object), else None.
+
+        source_size is the size of the source object, counted as saved
+        transfer on a hit along with the derivative itself.
+        """
+        try:
+            stat = self.minio_client.stat_object(self.bucket, object_key)
+        except S3Error as e:
+            if e.code not in ("NoSuchKey", "NoSuchObject", "NoSuchBucket"):
+                logger.warning(f"Derivative cache lookup failed: {e}")
+            with self._lock:
+                self._misses += 1
+            return None
+
+        metadata = stat.metadata or {}
+        dimensions = tuple(
+            int(metadata.get(_META_PREFIX + field, 0) or 0) for field in _META_FIELDS
+        )
+        with self._lock:
+            self._hits += 1
+            self._bytes_saved += source_size + stat.size
+        return CachedDerivative(self.bucket, object_key, stat.size, dimensions)
+
+    def store(self, object_key, data, dimensions):
+        """Upload a derivative; returns it as a CachedDerivative"""
+        if not self.ensure_bucket():
+            raise RuntimeError(f"Derivative cache bucket {self.bucket} not ready")
+        put_bytes(
+            self.minio_client,
+            self.bucket,
+            object_key,
+            data,
+            metadata={
+                field: str(value) for field, value in zip(_META_FIELDS, dimensions)
+            },
+        )
+        with self._lock:
+            self._stores += 1
+            self._stored_bytes += len(data)
+        return CachedDerivative(self.bucket, object_key, len(data), dimensions)
+
+    def copy_to(self, cached, bucket, object_key):
+        """Server-side copy of a derivative to an execution's own output object"""
+        self.minio_client.copy_object(
+            bucket, object_key, CopySource(cached.bucket, cached.object_key)
+        )
+
+    def sweep(self):
+        """Measure the cache and remove the oldest derivatives beyond max_bytes"""
+        if not self.ensure_bucket():
+            return
+        objects = [
+            obj
+            for obj in self.minio_client.list_objects(
+                self.bucket, prefix=f"{self.prefix}/", recursive=True
+            )
+            if not obj.is_dir
+        ]
+        stored_bytes = sum(obj.size for obj in objects)
+
+        evicted = []
+        if self.max_bytes > 0 and stored_bytes > self.max_bytes:
+            objects.sort(key=lambda obj: obj.last_modified)
+            for obj in objects:
+                if stored_bytes <= self.max_bytes:
+                    break
+                evicted.append(obj.object_name)
+                stored_bytes -= obj.size
+            errors = list(
+                self.minio_client.remove_objects(
+                    self.bucket, (DeleteObject(name) for name in evicted)
+                )
+            )
+            for error in errors:
+                logger.warning(f"Failed to evict derivative: {error}")
+            evictions = len(evicted) - len(errors)
+            logger.info(f"Evicted {evictions} derivatives from {self.bucket}")
+        else:
+            evictions = 0
+
+        with self._lock:
+            self._stored_bytes = stored_bytes
+            self._evictions += evictions
+
+    def _sweep_loop(self):
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"Derivative cache sweep failed: {e}")
+            time.sleep(self.sweep_seconds)
+
+    def _ensure_expiry(self):
+        """Install the expiry rule on the cache bucket"""
+        if self.expiry_days <= 0:
+            return
+        config = self.minio_client.get_bucket_lifecycle(self.bucket)
+        existing = config.rules if config else []
+        current = next(
+            (rule for rule in existing if rule.rule_id == self.LIFECYCLE_RULE_ID),
+            None,
+        )
+        if (
+            current is not None
+            and current.expiration is not None
+            and current.expiration.days == self.expiry_days
+        ):
+            return
+        rules = [rule for rule in existing if rule.rule_id != self.LIFECYCLE_RULE_ID]
+        rules.append(
+            Rule(
+                ENABLED,
+                rule_filter=Filter(prefix=f"{self.prefix}/"),
+                rule_id=self.LIFECYCLE_RULE_ID,
+                expiration=Expiration(days=self.expiry_days),
+            )
+        )
+        self.minio_client.set_bucket_lifecycle(self.bucket, LifecycleConfig(rules))
+        logger.info(
+            f"Derivatives in {self.bucket}/{self.prefix}/ expire after {self.expiry_days} days"
+        )
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "bytes_saved": self._bytes_saved,
+                "stores": self._stores,
+                "stored_bytes": self._stored_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "expiry_days": self.expiry_days,
+            }
@@ -0,0 +1,108 @@
+import os
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Caches the result of a health probe refreshed by a background thread.
+
+    probe() returns True when the service is healthy (exceptions count as
+    unhealthy). Readers get the last result without running the probe, and
+    wait_for_change() lets streaming watchers block until the state flips.
+    """
+
+    def __init__(self, probe, interval_seconds=None, name="service"):
+        if interval_seconds is None:
+            interval_seconds = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "10"))
+        self.interval_seconds = interval_seconds
+        self.name = name
+        self._probe = probe
+
+        self._condition = threading.Condition()
+        self._serving = None  # None until the first probe completes
+        self._version = 0  # incremented on every state transition
+        self._last_probe_at = 0.0
+        self._last_probe_ms = 0.0
+        self._last_error = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Run the first probe synchronously, then keep refreshing in the background"""
+        self.refresh()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.name}-health-probe", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval_seconds):
+            self.refresh()
+
+    def refresh(self):
+        """Run the probe once and publish the result"""
+        start = time.time()
+        error = None
+        try:
+            serving = bool(self._probe())
+        except Exception as e:
+            serving = False
+            error = str(e)
+        probe_ms = (time.time() - start) * 1000
+
+        with self._condition:
+            changed = serving != self._serving
+            self._serving = serving
+            self._last_probe_at = time.time()
+            self._last_probe_ms = probe_ms
+            self._last_error = error
+            if changed:
+                self._version += 1
+                self._condition.notify_all()
+
+        if changed:
+            state = "SERVING" if serving else "NOT_SERVING"
+            detail = f": {error}" if error else ""
+            log = logger.info if serving else logger.warning
+            log(f"{self.name} health changed to {state} ({probe_ms:.1f}ms){detail}")
+        return serving
+
+    @property
+    def serving(self):
+        return bool(self._serving)
+
+    def snapshot(self):
+        """Return (serving, version) atomically"""
+        with self._condition:
+            return bool(self._serving), self._version
+
+    def wait_for_change(self, version, timeout=None):
+        """Block until the state version differs from version, the monitor
+        stops or timeout expires. Returns the current (serving, version)."""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._version != version or self._stopped.is_set(),
+                timeout=timeout,
+            )
+            return bool(self._serving), self._version
+
+    def stats(self):
+        with self._condition:
+            return {
+                "serving": bool(self._serving),
+                "transitions": self._version,
+                "last_probe_age_s": (
+                    time.time() - self._last_probe_at if self._last_probe_at else None
+                ),
+                "last_probe_ms": self._last_probe_ms,
+                "last_error": self._last_error,
+            }
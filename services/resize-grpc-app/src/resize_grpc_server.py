@@ -2,7 +2,10 @@ import sys
 import os
 import time
 import logging
+import queue
+import threading
 import asyncio
+import json
 from concurrent import futures
 from datetime import datetime, timezone
 
@@ -10,7 +13,6 @@ import grpc
 from minio import Minio
 import cv2
 import numpy as np
-from PIL import Image
 from google.protobuf.timestamp_pb2 import Timestamp
 
 # Add generated proto paths
@@ -22,6 +24,23 @@ from imageflow.v1 import resize_pb2_grpc
 from imageflow.v1 import common_pb2
 from grpc_health.v1 import health_pb2, health_pb2_grpc
 
+from derivative_cache import DerivativeCache
+from health_monitor import HealthMonitor
+from image_io import (
+    RAW_BGR8,
+    RAW_BGR8_CONTENT_TYPE,
+    REDUCED_DECODE_FLAGS,
+    content_type_for,
+    decode_image,
+    decode_image_bytes,
+    encode_image,
+    jpeg_dimensions,
+    load_object_image,
+    put_bytes,
+    raw_image_data,
+    reduced_decode_factor,
+)
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -41,9 +60,32 @@ class ResizeServiceImplementation(resize_pb2_grpc.ResizeServiceServicer):
         # Create MinIO client pool for connection reuse
         self._create_minio_client()
 
+        # Maximum requests processed concurrently per streaming RPC
+        self.stream_max_in_flight = int(os.getenv("STREAM_MAX_IN_FLIGHT", "4"))
+
+        # Encodes and uploads the derivatives of ResizeImageMulti concurrently,
+        # and writes derivative cache entries off the request path
+        self.output_executor = futures.ThreadPoolExecutor(
+            max_workers=int(os.getenv("RESIZE_OUTPUT_WORKERS", "4")),
+            thread_name_prefix="resize-output",
+        )
+
+        # Content-addressed store of derivatives keyed by source ETag + spec
+        if os.getenv("ENABLE_DERIVATIVE_CACHE", "false").lower() == "true":
+            self.derivative_cache = DerivativeCache(self.minio_client).start()
+        else:
+            self.derivative_cache = None
+
         # Performance optimization: pre-warm OpenCV
         self._warm_up()
 
+        # Health is probed in the background; health RPCs read the cached state
+        self.health_monitor = HealthMonitor(self._health_check, name="resize").start()
+
+        # Periodically log service statistics
+        self.stats_log_interval = float(os.getenv("STATS_LOG_INTERVAL_SECONDS", "60"))
+        self._start_stats_reporter()
+
         logger.info(f"Initialized optimized MinIO client for {self.minio_endpoint}")
 
     def _create_minio_client(self):
@@ -55,6 +97,28 @@ class ResizeServiceImplementation(resize_pb2_grpc.ResizeServiceServicer):
             secure=False,
         )
 
+    def _start_stats_reporter(self):
+        """Start a daemon thread that logs service statistics periodically"""
+        if self.stats_log_interval <= 0:
+            return
+
+        def report():
+            while True:
+                time.sleep(self.stats_log_interval)
+                try:
+                    logger.info(f"Resize stats: {json.dumps(self.get_stats())}")
+                except Exception as e:
+                    logger.warning(f"Failed to report stats: {e}")
+
+        threading.Thread(target=report, name="stats-reporter", daemon=True).start()
+
+    def get_stats(self):
+        """Collect statistics from the service components"""
+        stats = {"health": self.health_monitor.stats()}
+        if self.derivative_cache is not None:
+            stats["derivative_cache"] = self.derivative_cache.stats()
+        return stats
+
     def _warm_up(self):
         """Pre-warm OpenCV and other libraries for better performance"""
         try:
@@ -66,17 +130,13 @@ class ResizeServiceImplementation(resize_pb2_grpc.ResizeServiceServicer):
             logger.warning(f"Warm-up failed: {e}")
 
     def _health_check(self):
-        """Internal health check method"""
-        try:
-            # Test MinIO connection
-            self.minio_client.list_buckets()
-            # Test OpenCV functionality
-            test_img = np.zeros((10, 10, 3), dtype=np.uint8)
-            cv2.resize(test_img, (5, 5))
-            return True
-        except Exception as e:
-            logger.error(f"Health check failed: {e}")
-            return False
+        """Health probe run periodically by the health monitor"""
+        # Test MinIO connection
+        self.minio_client.list_buckets()
+        # Test OpenCV functionality
+        test_img = np.zeros((10, 10, 3), dtype=np.uint8)
+        cv2.resize(test_img, (5, 5))
+        return True
 
     def ResizeImage(self, request, context):
         """Handle single image resize request with performance optimization"""
@@ -90,21 +150,21 @@ class ResizeServiceImplementation(resize_pb2_grpc.ResizeServiceServicer):
         )
 
         try:
-            local_input = f"/tmp/input_{request.execution_id}_{int(time.time())}"
-            local_output = f"/tmp/output_{request.execution_id}_{int(time.time())}"
+            # JPEG sources far larger than the target are decoded at 1/2, 1/4
+            # or 1/8 scale straight from the DCT coefficients
+            decode_plan = ReducedDecodePlan(request)
+            timings = {}
 
             # Check if input is direct bytes or MinIO reference
             if request.HasField("input_bytes"):
                 # Handle direct byte input (for real-time streaming)
-                logger.info("Processing direct image bytes input")
-
-                # Write bytes directly to temporary file
-                with open(local_input, "wb") as f:
-                    f.write(request.input_bytes.data)
-
                 logger.info(
-                    f"Saved {len(request.input_bytes.data)} bytes to {local_input}"
+                    f"Processing direct image bytes input ({len(request.input_bytes.data)} bytes)"
                 )
+                processing_start = time.time()
+                decode_start = time.perf_counter()
+                image = decode_input_bytes(request.input_bytes, decode_plan)
+                timings["decode"] = time.perf_counter() - decode_start
 
             elif request.HasField("input_image"):
                 # Handle MinIO reference input (for batch processing)
@@ -123,72 +183,79 @@ class ResizeServiceImplementation(resize_pb2_grpc.ResizeServiceServicer):
                         f"Bucket {request.input_image.bucket} does not exist"
                     )
 
-                self.minio_client.fget_object(
+                # An existing derivative of the same source and spec is
+                # returned without downloading or decoding anything
+                if self.derivative_cache is not None:
+                    derivative_key, cached = self._lookup_derivative(request)
+                    if cached is not None:
+                        try:
+                            return self._cached_response(request, cached, start_time)
+                        except Exception as e:
+                            # e.g. expired between lookup and copy: resize instead
+                            logger.warning(
+                                f"Derivative cache hit {cached.object_key} unusable: {e}"
+                            )
+
+                image = load_object_image(
+                    self.minio_client,
                     request.input_image.bucket,
                     request.input_image.object_key,
-                    local_input,
+                    flags_for=decode_plan,
+                    timings=timings,
                 )
                 download_time = time.time() - download_start
                 logger.info(f"Download completed in {download_time:.2f}s")
+                processing_start = time.time()
             else:
                 raise ValueError("Request must have either input_bytes or input_image")
 
-            # Load and process image with timing
-            processing_start = time.time()
-            image = cv2.imread(local_input)
-            if image is None:
-                raise ValueError(f"Could not read input image from {local_input}")
-
-            original_height, original_width = image.shape[:2]
-            logger.info(f"Original image size: {original_width}x{original_height}")
+            original_width, original_height = decode_plan.original_size(image)
+            logger.info(
+                f"Original image size: {original_width}x{original_height}"
+                + (
+                    f" (decoded at 1/{decode_plan.factor})"
+                    if decode_plan.factor > 1
+                    else ""
+                )
+            )
 
             # Calculate target size with aspect ratio consideration
-            if request.maintain_aspect_ratio:
-                aspect_ratio = original_width / original_height
-                if request.target_width / request.target_height > aspect_ratio:
-                    new_width = int(request.target_height * aspect_ratio)
-                    new_height = request.target_height
-                else:
-                    new_width = request.target_width
-                    new_height = int(request.target_width / aspect_ratio)
-            else:
-                new_width = request.target_width
-                new_height = request.target_height
+            new_width, new_height = target_size(
+                request, original_width, original_height
+            )
 
-            # Optimize resize interpolation based on scaling factor
-            scale_factor = (new_width * new_height) / (original_width * original_height)
+            # Optimize resize interpolation based on the remaining scaling factor
+            decoded_height, decoded_width = image.shape[:2]
+            scale_factor = (new_width * new_height) / (decoded_width * decoded_height)
             if scale_factor < 0.5:
                 interpolation = cv2.INTER_AREA  # Better for downscaling
             else:
                 interpolation = cv2.INTER_LINEAR  # Faster for upscaling
 
             # Resize image
-            resized_image = cv2.resize(
-                image, (new_width, new_height), interpolation=interpolation
-            )
+            resize_start = time.perf_counter()
+            if (decoded_width, decoded_height) == (new_width, new_height):
+                resized_image = image
+            else:
+                resized_image = cv2.resize(
+                    image, (new_width, new_height), interpolation=interpolation
+                )
+            timings["resize"] = time.perf_counter() - resize_start
             logger.info(f"Resized image to {new_width}x{new_height}")
 
+            # Set quality based on request
+            jpeg_quality = jpeg_quality_for(request.quality)
+
             # For real-time processing (input_bytes), return direct bytes
             if request.HasField("input_bytes"):
-                # Convert resized image to JPEG bytes
-                # Convert BGR (OpenCV) to RGB (Pillow)
-                resized_rgb = cv2.cvtColor(resized_image, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(resized_rgb)
-
-                # Set quality based on request
-                if request.quality == resize_pb2.RESIZE_QUALITY_BEST:
-                    jpeg_quality = 95
-                elif request.quality == resize_pb2.RESIZE_QUALITY_GOOD:
-                    jpeg_quality = 85
-                else:  # RESIZE_QUALITY_FAST
-                    jpeg_quality = 75
-
-                # Save to bytes buffer
-                import io
-
-                img_buffer = io.BytesIO()
-                pil_image.save(img_buffer, format="JPEG", quality=jpeg_quality)
-                img_bytes = img_buffer.getvalue()
+                # Raw pixels for the next stage skip the JPEG round trip
+                raw_output = request.output_format.upper() == RAW_BGR8
+                encode_start = time.perf_counter()
+                if raw_output:
+                    img_bytes = raw_image_data(resized_image)
+                else:
+                    img_bytes = encode_image(resized_image, ".jpg", jpeg_quality)
+                timings["encode"] = time.perf_counter() - encode_start
 
                 # Create response with direct bytes
                 response = resize_pb2.ResizeResponse()
@@ -199,7 +266,9 @@ class ResizeServiceImplementation(resize_pb2_grpc.ResizeServiceServicer):
                 response.result.output_data = img_bytes  # Store the actual image bytes
 
                 # Set metadata
-                response.result.output_image.content_type = "image/jpeg"
+                response.result.output_image.content_type = (
+                    RAW_BGR8_CONTENT_TYPE if raw_output else "image/jpeg"
+                )
                 response.result.output_image.width = new_width
                 response.result.output_image.height = new_height
 
@@ -212,67 +281,49 @@ class ResizeServiceImplementation(resize_pb2_grpc.ResizeServiceServicer):
                 # Set metadata
                 response.metadata.original_width = original_width
                 response.metadata.original_height = original_height
-                response.metadata.target_width = new_width
-                response.metadata.target_height = new_height
-                response.metadata.scale_factor = scale_factor
-                response.metadata.processing_time_ms = (time.time() - start_time) * 1000
+                response.metadata.output_width = new_width
+                response.metadata.output_height = new_height
+                response.metadata.scale_factor_x = new_width / original_width
+                response.metadata.scale_factor_y = new_height / original_height
+                response.metadata.quality_used = request.quality
+                _set_phase_timings(response.metadata, timings, decode_plan.factor)
 
                 logger.info(
                     f"Resize completed successfully, returning {len(img_bytes)} bytes"
                 )
-
-                # Clean up
-                if os.path.exists(local_input):
-                    os.remove(local_input)
-
                 return response
 
             # For MinIO-based processing (input_image), upload to MinIO
-            else:
-                # Save resized image with workflow-expected naming
-                # ワークフローでは {execution_id}_resized.jpg を期待している
-                execution_id = request.execution_id
-                output_path = f"{execution_id}_resized.jpg"
-
-                # Use Pillow for reliable JPEG saving
-                # Convert BGR (OpenCV) to RGB (Pillow)
-                resized_rgb = cv2.cvtColor(resized_image, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(resized_rgb)
-
-                # Set quality based on request
-                if request.quality == resize_pb2.RESIZE_QUALITY_BEST:
-                    jpeg_quality = 95
-                elif request.quality == resize_pb2.RESIZE_QUALITY_GOOD:
-                    jpeg_quality = 85
-                else:  # RESIZE_QUALITY_FAST
-                    jpeg_quality = 75
-
-                pil_image.save(
-                    local_output, "JPEG", quality=jpeg_quality, optimize=True
-                )
-                processing_time = time.time() - processing_start
-                logger.info(f"Processing completed in {processing_time:.2f}s")
-
-                # Upload to MinIO with timing
-                upload_start = time.time()
-                if not self.minio_client.bucket_exists(request.input_image.bucket):
-                    self.minio_client.make_bucket(request.input_image.bucket)
-
-                self.minio_client.fput_object(
-                    request.input_image.bucket, output_path, local_output
+            # Save resized image with workflow-expected naming
+            # ワークフローでは {execution_id}_resized.jpg を期待している
+            execution_id = request.execution_id
+            output_bucket = request.input_image.bucket
+            output_path = f"{execution_id}_resized.jpg"
+
+            encode_start = time.perf_counter()
+            img_bytes = encode_image(resized_image, ".jpg", jpeg_quality, optimize=True)
+            timings["encode"] = time.perf_counter() - encode_start
+            processing_time = time.time() - processing_start
+            logger.info(f"Processing completed in {processing_time:.2f}s")
+
+            # Upload to MinIO with timing
+            upload_start = time.time()
+            if not self.minio_client.bucket_exists(output_bucket):
+                self.minio_client.make_bucket(output_bucket)
+
+            put_bytes(self.minio_client, output_bucket, output_path, img_bytes)
+            if self.derivative_cache is not None:
+                # Off the request path: a failed cache write only costs a
+                # future hit, never this execution's result
+                self.output_executor.submit(
+                    self._store_derivative,
+                    derivative_key,
+                    img_bytes,
+                    (new_width, new_height, original_width, original_height),
                 )
             upload_time = time.time() - upload_start
             logger.info(f"Upload completed in {upload_time:.2f}s")
 
-            # Cleanup local files
-            try:
-                if os.path.exists(local_input):
-                    os.remove(local_input)
-                if os.path.exists(local_output):
-                    os.remove(local_output)
-            except Exception as e:
-                logger.warning(f"Cleanup failed: {e}")
-
             total_time = time.time() - start_time
 
             # Create response with detailed timing
@@ -283,11 +334,10 @@ class ResizeServiceImplementation(resize_pb2_grpc.ResizeServiceServicer):
             response.result.message = f"Image resize completed successfully (total: {total_time:.2f}s, download: {download_time:.2f}s, processing: {processing_time:.2f}s, upload: {upload_time:.2f}s)"
 
             # Set output image info
-            response.result.output_image.bucket = request.input_image.bucket
+            response.result.output_image.bucket = output_bucket
             response.result.output_image.object_key = output_path
-            response.result.output_image.content_type = (
-                "image/jpeg" if output_path.endswith(".jpg") else "image/png"
-            )
+            response.result.output_image.content_type = content_type_for(output_path)
+            response.result.output_image.size_bytes = len(img_bytes)
             response.result.output_image.width = new_width
             response.result.output_image.height = new_height
 
@@ -305,6 +355,7 @@ class ResizeServiceImplementation(resize_pb2_grpc.ResizeServiceServicer):
             response.metadata.scale_factor_x = new_width / original_width
             response.metadata.scale_factor_y = new_height / original_height
             response.metadata.quality_used = request.quality
+            _set_phase_timings(response.metadata, timings, decode_plan.factor)
 
             logger.info(
                 f"Resize completed successfully - Total: {total_time:.2f}s (download: {download_time:.2f}s, processing: {processing_time:.2f}s, upload: {upload_time:.2f}s)"
@@ -317,15 +368,6 @@ class ResizeServiceImplementation(resize_pb2_grpc.ResizeServiceServicer):
                 f"Error processing resize request (after {total_time:.2f}s): {str(e)}"
             )
 
-            # Cleanup on error
-            try:
-                if "local_input" in locals() and os.path.exists(local_input):
-                    os.remove(local_input)
-                if "local_output" in locals() and os.path.exists(local_output):
-                    os.remove(local_output)
-            except Exception:
-                pass
-
             # Return error response
             response = resize_pb2.ResizeResponse()
             response.result.status = common_pb2.PROCESSING_STATUS_FAILED
@@ -334,37 +376,416 @@ class ResizeServiceImplementation(resize_pb2_grpc.ResizeServiceServicer):
 
             return response
 
+    def _lookup_derivative(self, request):
+        """Return (cache key of the request's derivative, cached entry or None)"""
+        source = self.minio_client.stat_object(
+            request.input_image.bucket, request.input_image.object_key
+        )
+        object_key = self.derivative_cache.key_for(
+            source.etag,
+            request.target_width,
+            request.target_height,
+            request.maintain_aspect_ratio,
+            jpeg_quality_for(request.quality),
+        )
+        return object_key, self.derivative_cache.lookup(object_key, source.size)
+
+    def _store_derivative(self, derivative_key, img_bytes, dimensions):
+        """Add a derivative to the cache; failures are logged, not raised"""
+        try:
+            self.derivative_cache.store(derivative_key, img_bytes, dimensions)
+        except Exception as e:
+            logger.warning(f"Failed to cache derivative {derivative_key}: {e}")
+
+    def _cached_response(self, request, cached, start_time):
+        """Response for an existing derivative, copied to the execution's output"""
+        output_bucket = request.input_image.bucket
+        output_path = f"{request.execution_id}_resized.jpg"
+        self.derivative_cache.copy_to(cached, output_bucket, output_path)
+        width, height, original_width, original_height = cached.dimensions
+        total_time = time.time() - start_time
+
+        response = resize_pb2.ResizeResponse()
+        response.result.status = common_pb2.PROCESSING_STATUS_COMPLETED
+        response.result.message = (
+            f"Image resize served from derivative cache (total: {total_time:.2f}s)"
+        )
+        response.result.output_image.bucket = output_bucket
+        response.result.output_image.object_key = output_path
+        response.result.output_image.content_type = content_type_for(output_path)
+        response.result.output_image.size_bytes = cached.size
+        response.result.output_image.width = width
+        response.result.output_image.height = height
+
+        now = Timestamp()
+        now.FromDatetime(datetime.now(timezone.utc))
+        response.result.processed_at.CopyFrom(now)
+        response.result.processing_time_seconds = total_time
+
+        response.metadata.original_width = original_width
+        response.metadata.original_height = original_height
+        response.metadata.output_width = width
+        response.metadata.output_height = height
+        if original_width and original_height:
+            response.metadata.scale_factor_x = width / original_width
+            response.metadata.scale_factor_y = height / original_height
+        response.metadata.quality_used = request.quality
+        response.metadata.cache_hit = True
+
+        logger.info(
+            f"Resize served from derivative cache: {cached.object_key} -> {output_path} ({total_time:.3f}s)"
+        )
+        return response
+
+    def ResizeImageMulti(self, request, context):
+        """Resize one image to several targets, decoding it only once"""
+        start_time = time.time()
+        logger.info(
+            f"Processing multi-resize request for execution_id: {request.execution_id} ({len(request.targets)} targets)"
+        )
+
+        response = resize_pb2.ResizeMultiResponse()
+        try:
+            if not request.targets:
+                raise ValueError("Request must have at least one target")
+            for target in request.targets:
+                if target.target_width <= 0 or target.target_height <= 0:
+                    raise ValueError(
+                        f"Invalid target size {target.target_width}x{target.target_height}"
+                    )
+
+            decode_plan = ReducedDecodePlan(*request.targets)
+            timings = {}
+            bucket = None
+            if request.HasField("input_bytes"):
+                decode_start = time.perf_counter()
+                image = decode_input_bytes(request.input_bytes, decode_plan)
+                timings["decode"] = time.perf_counter() - decode_start
+            elif request.HasField("input_image"):
+                bucket = request.input_image.bucket
+                if not self.minio_client.bucket_exists(bucket):
+                    raise ValueError(f"Bucket {bucket} does not exist")
+                image = load_object_image(
+                    self.minio_client,
+                    bucket,
+                    request.input_image.object_key,
+                    flags_for=decode_plan,
+                    timings=timings,
+                )
+            else:
+                raise ValueError("Request must have either input_bytes or input_image")
+
+            original_width, original_height = decode_plan.original_size(image)
+            specs = [
+                target_size(target, original_width, original_height)
+                + (
+                    jpeg_quality_for(target.quality),
+                    output_extension(target.format),
+                )
+                for target in request.targets
+            ]
+
+            # Largest first, so each pyramid level is built once; identical
+            # specs are produced once. Encoding and upload overlap the
+            # resizing of the next (smaller) output.
+            pyramid = HalvingPyramid(image)
+            jobs = {}
+            for spec in sorted(set(specs), key=lambda s: s[0] * s[1], reverse=True):
+                resize_start = time.perf_counter()
+                resized = pyramid.resize(spec[0], spec[1])
+                resize_seconds = time.perf_counter() - resize_start
+                jobs[spec] = (
+                    self.output_executor.submit(
+                        self._write_output, bucket, request.execution_id, resized, spec
+                    ),
+                    resize_seconds,
+                )
+
+            total_bytes = 0
+            for target, spec in zip(request.targets, specs):
+                future, resize_seconds = jobs[spec]
+                img_bytes, object_key, encode_seconds = future.result()
+                width, height, _, extension = spec
+
+                output = response.outputs.add()
+                output.output_image.content_type = content_type_for(
+                    f"output{extension}"
+                )
+                output.output_image.width = width
+                output.output_image.height = height
+                output.output_image.size_bytes = len(img_bytes)
+                if bucket is None:
+                    output.output_data = img_bytes
+                else:
+                    output.output_image.bucket = bucket
+                    output.output_image.object_key = object_key
+                total_bytes += len(img_bytes)
+
+                metadata = output.metadata
+                metadata.original_width = original_width
+                metadata.original_height = original_height
+                metadata.output_width = width
+                metadata.output_height = height
+                metadata.scale_factor_x = width / original_width
+                metadata.scale_factor_y = height / original_height
+                metadata.quality_used = target.quality
+                _set_phase_timings(
+                    metadata,
+                    {
+                        "decode": timings.get("decode", 0.0),
+                        "resize": resize_seconds,
+                        "encode": encode_seconds,
+                    },
+                    decode_plan.factor,
+                )
+
+            total_time = time.time() - start_time
+            response.result.status = common_pb2.PROCESSING_STATUS_COMPLETED
+            response.result.message = f"Created {len(jobs)} derivatives from {original_width}x{original_height} ({total_bytes} bytes, total: {total_time:.2f}s)"
+            now = Timestamp()
+            now.FromDatetime(datetime.now(timezone.utc))
+            response.result.processed_at.CopyFrom(now)
+            response.result.processing_time_seconds = total_time
+
+            logger.info(
+                f"Multi-resize completed - {len(jobs)} derivatives in {total_time:.2f}s"
+            )
+            return response
+
+        except Exception as e:
+            total_time = time.time() - start_time
+            logger.error(
+                f"Error processing multi-resize request (after {total_time:.2f}s): {str(e)}"
+            )
+            response = resize_pb2.ResizeMultiResponse()
+            response.result.status = common_pb2.PROCESSING_STATUS_FAILED
+            response.result.message = f"Resize failed: {str(e)}"
+            response.result.processing_time_seconds = total_time
+            return response
+
+    def _write_output(self, bucket, execution_id, image, spec):
+        """Encode one derivative and upload it under its deterministic key"""
+        width, height, quality, extension = spec
+        encode_start = time.perf_counter()
+        img_bytes = encode_image(image, extension, quality, optimize=bucket is not None)
+        encode_seconds = time.perf_counter() - encode_start
+
+        object_key = ""
+        if bucket is not None:
+            object_key = (
+                f"{execution_id}_resized_{width}x{height}_q{quality}{extension}"
+            )
+            put_bytes(self.minio_client, bucket, object_key, img_bytes)
+        return img_bytes, object_key, encode_seconds
+
+    def ResizeImageStream(self, request_iterator, context):
+        """Handle a bidirectional stream of resize requests (pipelined, in-order)"""
+        logger.info(f"ResizeImageStream started from {context.peer()}")
+        yield from _pipelined_stream(
+            request_iterator, context, self.ResizeImage, self.stream_max_in_flight
+        )
+        logger.info(f"ResizeImageStream ended for {context.peer()}")
+
+
+def target_size(request, width, height):
+    """Output size of a resize request for a source of width x height"""
+    if request.maintain_aspect_ratio:
+        aspect_ratio = width / height
+        if request.target_width / request.target_height > aspect_ratio:
+            return int(request.target_height * aspect_ratio), request.target_height
+        return request.target_width, int(request.target_width / aspect_ratio)
+    return request.target_width, request.target_height
+
+
+# Output formats of ResizeTarget.format
+OUTPUT_EXTENSIONS = {
+    "": ".jpg",
+    "jpeg": ".jpg",
+    "jpg": ".jpg",
+    "png": ".png",
+    "webp": ".webp",
+}
+
+
+def jpeg_quality_for(quality):
+    """Encoder quality for a ResizeQuality value"""
+    if quality == resize_pb2.RESIZE_QUALITY_BEST:
+        return 95
+    if quality == resize_pb2.RESIZE_QUALITY_GOOD:
+        return 85
+    return 75  # RESIZE_QUALITY_FAST
+
+
+def output_extension(output_format):
+    extension = OUTPUT_EXTENSIONS.get(output_format.lower())
+    if extension is None:
+        raise ValueError(f"Unsupported output format '{output_format}'")
+    return extension
+
+
+def decode_input_bytes(image_bytes, decode_plan):
+    """Decode inline input with the flags of decode_plan; raw pixels are used as is"""
+    if image_bytes.format.upper() == RAW_BGR8:
+        return decode_image_bytes(image_bytes)
+    return decode_image(image_bytes.data, decode_plan(image_bytes.data))
+
+
+class ReducedDecodePlan:
+    """Chooses the cv2.imdecode flags for resize targets from the JPEG header.
+
+    targets are ResizeRequest/ResizeTarget messages. Called with the encoded
+    bytes, it returns IMREAD_REDUCED_COLOR_2/4/8 when every target is at
+    least 2x smaller than the source (and still covered by the reduced
+    image), otherwise IMREAD_COLOR. Non-JPEG input is always decoded at full
+    size.
+    """
+
+    def __init__(self, *targets):
+        self.targets = targets
+        self.source_size = None  # (width, height) from the JPEG header
+        self.factor = 1
+
+    def __call__(self, data):
+        self.source_size = jpeg_dimensions(data)
+        if self.source_size is not None:
+            self.factor = min(
+                reduced_decode_factor(
+                    self.source_size, target_size(target, *self.source_size)
+                )
+                for target in self.targets
+            )
+        return REDUCED_DECODE_FLAGS.get(self.factor, cv2.IMREAD_COLOR)
+
+    def original_size(self, image):
+        """(width, height) of the source before any reduced decoding"""
+        if self.factor == 1 or self.source_size is None:
+            height, width = image.shape[:2]
+            return width, height
+        return self.source_size
+
+
+class HalvingPyramid:
+    """Successive 2x INTER_AREA downscales of one decoded image.
+
+    Each output is resized from the smallest level that still covers it, so
+    the final step is a less-than-2x bilinear resize (INTER_AREA is only
+    used for the exact halvings, where it is fast). Levels are built on
+    demand and shared by all outputs of a request.
+    """
+
+    def __init__(self, image):
+        self.levels = [image]
+
+    def resize(self, width, height):
+        level = self._covering_level(width, height)
+        level_height, level_width = level.shape[:2]
+        if (level_width, level_height) == (width, height):
+            return level
+        return cv2.resize(level, (width, height), interpolation=cv2.INTER_LINEAR)
+
+    def _covering_level(self, width, height):
+        while True:
+            level_height, level_width = self.levels[-1].shape[:2]
+            if level_width // 2 < width or level_height // 2 < height:
+                break
+            self.levels.append(
+                cv2.resize(
+                    self.levels[-1],
+                    (level_width // 2, level_height // 2),
+                    interpolation=cv2.INTER_AREA,
+                )
+            )
+        for level in reversed(self.levels):
+            level_height, level_width = level.shape[:2]
+            if level_width >= width and level_height >= height:
+                return level
+        return self.levels[0]  # upscale from the full image
+
+
+def _set_phase_timings(metadata, timings, decode_factor):
+    metadata.decode_time_ms = timings.get("decode", 0.0) * 1000
+    metadata.resize_time_ms = timings.get("resize", 0.0) * 1000
+    metadata.encode_time_ms = timings.get("encode", 0.0) * 1000
+    metadata.decode_reduction = decode_factor
+
+
+def _pipelined_stream(request_iterator, context, handler, max_in_flight):
+    """Run handler over a request stream with bounded concurrency.
+
+    A reader thread pulls requests and submits them to a per-stream pool, so
+    decoding frame N+1 overlaps processing of frame N. At most max_in_flight
+    requests are outstanding and responses are yielded in request order.
+    """
+    executor = futures.ThreadPoolExecutor(
+        max_workers=max_in_flight, thread_name_prefix="stream"
+    )
+    in_flight = threading.Semaphore(max_in_flight)
+    pending = queue.Queue()
+    stopped = threading.Event()
+    end_of_stream = object()
+
+    def read_requests():
+        try:
+            for request in request_iterator:
+                while not in_flight.acquire(timeout=0.5):
+                    if stopped.is_set():
+                        return
+                if stopped.is_set():
+                    return
+                pending.put(executor.submit(handler, request, context))
+        except Exception as e:
+            if not stopped.is_set():
+                logger.warning(f"Request stream ended with error: {e}")
+        finally:
+            pending.put(end_of_stream)
+
+    threading.Thread(target=read_requests, name="stream-reader", daemon=True).start()
+
+    try:
+        while True:
+            item = pending.get()
+            if item is end_of_stream:
+                break
+            response = item.result()
+            in_flight.release()
+            yield response
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
 
 class HealthServiceImplementation(health_pb2_grpc.HealthServicer):
-    """Standard gRPC health check service implementation"""
+    """Standard gRPC health service answered from the cached probe state"""
 
     def __init__(self, resize_service):
         self.resize_service = resize_service
+        self.health_monitor = resize_service.health_monitor
+
+    @staticmethod
+    def _response(serving):
+        return health_pb2.HealthCheckResponse(
+            status=(
+                health_pb2.HealthCheckResponse.SERVING
+                if serving
+                else health_pb2.HealthCheckResponse.NOT_SERVING
+            )
+        )
 
     def Check(self, request, context):
-        """Standard gRPC health check implementation"""
-        response = health_pb2.HealthCheckResponse()
-
-        if self.resize_service._health_check():
-            response.status = health_pb2.HealthCheckResponse.SERVING
-            logger.debug("Health check passed")
-        else:
-            response.status = health_pb2.HealthCheckResponse.NOT_SERVING
-            logger.warning("Health check failed")
-
-        return response
+        """Return the last background probe result without probing"""
+        return self._response(self.health_monitor.serving)
 
     def Watch(self, request, context):
-        """Health check watch implementation (streaming)"""
-        # For simplicity, just return current status
-        response = health_pb2.HealthCheckResponse()
-
-        if self.resize_service._health_check():
-            response.status = health_pb2.HealthCheckResponse.SERVING
-        else:
-            response.status = health_pb2.HealthCheckResponse.NOT_SERVING
-
-        yield response
+        """Stream the current status, then every status transition"""
+        serving, version = self.health_monitor.snapshot()
+        yield self._response(serving)
+        while context.is_active():
+            serving, new_version = self.health_monitor.wait_for_change(
+                version, timeout=1.0
+            )
+            if new_version != version:
+                version = new_version
+                yield self._response(serving)
 
 
 def serve():
@@ -374,6 +795,8 @@ def serve():
     # Optimize thread pool for better concurrency
     max_workers = int(os.getenv("GRPC_MAX_WORKERS", "20"))
 
+    max_message_bytes = int(os.getenv("GRPC_MAX_MESSAGE_MB", "32")) * 1024 * 1024
+
     # Configure server options for better performance
     server_options = [
         ("grpc.keepalive_time_ms", 30000),
@@ -384,6 +807,9 @@ def serve():
         ("grpc.http2.min_ping_interval_without_data_ms", 5000),
         ("grpc.max_connection_idle_ms", 300000),
         ("grpc.max_connection_age_ms", 600000),
+        # Raw pixel frames between stages exceed the 4MB default (1080p BGR is ~6MB)
+        ("grpc.max_send_message_length", max_message_bytes),
+        ("grpc.max_receive_message_length", max_message_bytes),
     ]
 
     server = grpc.server(